@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     # ChromaDB
     CHROMA_HOST: str = "chromadb"  # matches service name in docker-compose.yaml
     CHROMA_PORT: int = 8001
+    # "chroma" queries skills/job titles on the ChromaDB server; "memory" uses
+    # in-process exact-search indexes (ChromaDB then only holds courses)
+    VECTOR_BACKEND: str = "chroma"
 
     # OpenAI (for mock interview)
     OPENAI_API_KEY: str = ""
@@ -24,6 +27,48 @@ class Settings(BaseSettings):
 
     # ML
     EMBEDDING_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # "torch", "onnx" or "onnx-int8" (ONNX Runtime, dynamically quantized);
+    # check with `python -m scripts.check_embedding_parity` before switching
+    EMBEDDING_BACKEND: str = "torch"
+    ML_INIT_WORKERS: int = 4  # thread pool size for parallel startup steps
+    EMBEDDING_CACHE_SIZE: int = 50_000  # in-process embedding cache entries
+    EMBEDDING_BATCH_WINDOW_MS: float = 5.0  # collect concurrent encodes this long
+    EMBEDDING_MAX_BATCH_SIZE: int = 64  # texts per batched forward pass
+    JOB_TITLE_CACHE_SIZE: int = 10_000  # cached job-title -> required-skills resolutions
+    # Courses re-ranked by learning style per roadmap skill; 0 = twice the
+    # courses returned (max 20). Larger pools let the style boosts reach further.
+    ROADMAP_RERANK_CANDIDATES: int = 0
+
+    # Concurrency: blocking work (inference, ChromaDB, sync LLM calls) runs on
+    # a bounded thread pool, with a per-stage limit on in-flight calls
+    BLOCKING_EXECUTOR_WORKERS: int = 8
+    EXTRACT_CONCURRENCY: int = 4
+    GAP_ANALYSIS_CONCURRENCY: int = 4
+    ROADMAP_CONCURRENCY: int = 2
+    INTERVIEW_CONCURRENCY: int = 8
+
+    # Batch extraction: streamed batches are processed (and flushed) in
+    # chunks of this many documents, each with one encode + one vector search
+    EXTRACT_BATCH_CHUNK_SIZE: int = 32
+
+    # Streaming extraction of long documents: chunk size in characters, chunks
+    # in flight per request, and the largest document accepted
+    EXTRACT_STREAM_CHUNK_CHARS: int = 4_000
+    EXTRACT_STREAM_PARALLELISM: int = 4
+    EXTRACT_STREAM_MAX_CHARS: int = 2_000_000
+
+    # Cohort gap analysis: cohorts up to this many learners x titles are
+    # answered inline, larger ones run as a background job to poll
+    COHORT_SYNC_MAX_ANALYSES: int = 200
+
+    # Maintenance endpoints (course catalog sync) need this token in the
+    # X-Admin-Token header; empty disables them (use the CLI scripts instead)
+    ADMIN_TOKEN: str = ""
+
+    # Background jobs (in memory): max jobs kept, and how long a finished
+    # job's result stays available
+    BACKGROUND_JOB_MAX: int = 100
+    BACKGROUND_JOB_TTL_S: float = 3600.0
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -0,0 +1,90 @@
+"""Offloading blocking work from the event loop.
+
+Model inference, matrix work, ChromaDB HTTP calls and synchronous LLM calls
+run on one bounded thread pool. Each stage (extraction, gap analysis, ...)
+also has its own concurrency limit, so a burst on one endpoint cannot take
+every worker and starve the others, and the event loop stays free for
+``/health`` and streaming responses.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STAGE_EXTRACT = "extract"
+STAGE_GAP_ANALYSIS = "gap_analysis"
+STAGE_ROADMAP = "roadmap"
+STAGE_INTERVIEW = "interview"
+STAGE_CATALOG_SYNC = "catalog_sync"
+
+
+class BlockingExecutor:
+    """Bounded thread pool with per-stage ``asyncio.Semaphore`` limits.
+
+    Args:
+        max_workers: Threads shared by all stages.
+        stage_limits: Max in-flight calls per stage; unknown stages are only
+            bounded by ``max_workers``.
+    """
+
+    def __init__(self, max_workers: int, stage_limits: dict[str, int]) -> None:
+        self.max_workers = max_workers
+        self.stage_limits = stage_limits
+        self._pool: ThreadPoolExecutor | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(self, stage: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run ``fn(*args, **kwargs)`` on the pool within the stage's limit."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="blocking")
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        async with self._semaphore(stage, loop):
+            return await loop.run_in_executor(self._pool, call)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _semaphore(self, stage: str, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        if loop is not self._loop:
+            # Semaphores belong to one event loop (e.g. a fresh loop per test client)
+            self._semaphores = {}
+            self._loop = loop
+        sem = self._semaphores.get(stage)
+        if sem is None:
+            limit = self.stage_limits.get(stage, self.max_workers)
+            sem = self._semaphores[stage] = asyncio.Semaphore(limit)
+        return sem
+
+
+def _build_executor() -> BlockingExecutor:
+    settings = get_settings()
+    return BlockingExecutor(
+        max_workers=settings.BLOCKING_EXECUTOR_WORKERS,
+        stage_limits={
+            STAGE_EXTRACT: settings.EXTRACT_CONCURRENCY,
+            STAGE_GAP_ANALYSIS: settings.GAP_ANALYSIS_CONCURRENCY,
+            STAGE_ROADMAP: settings.ROADMAP_CONCURRENCY,
+            STAGE_INTERVIEW: settings.INTERVIEW_CONCURRENCY,
+            STAGE_CATALOG_SYNC: 1,  # syncs are serialized by the service; don't park waiters on the pool
+        },
+    )
+
+
+blocking_executor = _build_executor()
+
+
+async def run_blocking(stage: str, fn: Callable[..., T], *args, **kwargs) -> T:
+    """Shortcut for ``blocking_executor.run``."""
+    return await blocking_executor.run(stage, fn, *args, **kwargs)
@@ -0,0 +1,135 @@
+"""In-process background jobs with pollable status.
+
+Requests too large to answer within one HTTP call (e.g. cohort gap analysis)
+are submitted as a job: the coroutine runs as an ``asyncio`` task on the
+serving loop (its blocking work still goes through ``run_blocking``) and the
+client polls the job id until it is ``completed`` or ``failed``. Jobs live in
+memory only; finished ones are evicted after ``ttl_s`` seconds, and the
+oldest finished ones first once ``max_jobs`` is reached.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from app.config import get_settings
+from app.exceptions import AppException, BackgroundJobLimitError, BackgroundJobNotFoundError
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass
+class BackgroundJob:
+    """State of one submitted job."""
+
+    job_id: str
+    kind: str
+    status: str = JOB_PENDING
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+
+class JobStore:
+    """Registry of background jobs.
+
+    Args:
+        max_jobs: Jobs kept at once; submitting beyond it evicts the oldest
+            finished job, or fails if every job is still running.
+        ttl_s: Seconds a finished job stays pollable.
+    """
+
+    def __init__(self, max_jobs: int, ttl_s: float) -> None:
+        self.max_jobs = max_jobs
+        self.ttl_s = ttl_s
+        self._jobs: dict[str, BackgroundJob] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def submit(self, kind: str, fn: Callable[[], Awaitable[Any]]) -> BackgroundJob:
+        """Start ``fn()`` as a background task and return its job.
+
+        Raises:
+            BackgroundJobLimitError: If ``max_jobs`` unfinished jobs already exist.
+        """
+        self._evict()
+        if len(self._jobs) >= self.max_jobs:
+            raise BackgroundJobLimitError(self.max_jobs)
+
+        job = BackgroundJob(job_id=uuid.uuid4().hex, kind=kind)
+        self._jobs[job.job_id] = job
+        task = asyncio.create_task(self._run(job, fn))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+        return job
+
+    def get(self, job_id: str, kind: Optional[str] = None) -> BackgroundJob:
+        """Look up a job, optionally requiring its kind.
+
+        Raises:
+            BackgroundJobNotFoundError: If no such job exists (or it expired).
+        """
+        self._evict()
+        job = self._jobs.get(job_id)
+        if job is None or (kind is not None and job.kind != kind):
+            raise BackgroundJobNotFoundError(job_id)
+        return job
+
+    def cancel_all(self) -> None:
+        """Cancel unfinished jobs (on shutdown)."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _run(job: BackgroundJob, fn: Callable[[], Awaitable[Any]]) -> None:
+        job.status = JOB_RUNNING
+        try:
+            job.result = await fn()
+        except asyncio.CancelledError:
+            job.status, job.error = JOB_FAILED, "cancelled"
+            raise
+        except AppException as exc:
+            # Expected failures (bad input, model not ready) carry their message
+            job.status, job.error = JOB_FAILED, exc.message
+        except Exception as exc:
+            logger.exception("Background job %s (%s) failed.", job.job_id, job.kind)
+            job.status, job.error = JOB_FAILED, str(exc) or type(exc).__name__
+        else:
+            job.status = JOB_COMPLETED
+        finally:
+            job.finished_at = time.time()
+
+    def _evict(self) -> None:
+        now = time.time()
+        finished = sorted(
+            (j for j in self._jobs.values() if j.done),
+            key=lambda j: j.finished_at,
+        )
+        for job in finished:
+            if now - job.finished_at > self.ttl_s or len(self._jobs) >= self.max_jobs:
+                del self._jobs[job.job_id]
+
+
+def _build_job_store() -> JobStore:
+    settings = get_settings()
+    return JobStore(max_jobs=settings.BACKGROUND_JOB_MAX, ttl_s=settings.BACKGROUND_JOB_TTL_S)
+
+
+job_store = _build_job_store()
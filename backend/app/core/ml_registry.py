@@ -1,20 +1,74 @@
-"""Singleton registry for loaded ML models. Initialized once at startup."""
+"""Singleton registry for loaded ML models. Initialized once at startup.
 
+Initialization is split into steps with explicit dependencies. Independent
+steps (model load, ChromaDB connect, demand predictions, course CSV parsing)
+run concurrently on a thread pool, and each component reports its own status
+so routers can serve as soon as the pieces they need are ready.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
 
 import chromadb
 from sentence_transformers import SentenceTransformer
 
 from ml.src.chromadb_manager import (
+    build_memory_job_title_index,
+    build_memory_skill_index,
     get_chroma_client,
+    get_ephemeral_client,
     populate_job_title_collection,
     populate_skill_collection,
 )
+from ml.src.config import (
+    COURSE_CATALOG_DIR,
+    EMBEDDING_STORE_DIR,
+    JOB_SKILL_COUNTS_DIR,
+    JOB_SKILL_MAPPING_PATH,
+    SERVING_BUNDLE_DIR,
+    SKILL_COURSE_INDEX_DIR,
+    SKILL_EMBEDDINGS_PATH,
+    SKILL_TAXONOMY_CATEGORIZED_PATH,
+)
+from ml.src.course_catalog import CourseCatalog
+from ml.src.embedding_backend import (
+    EMBEDDING_BACKEND_TORCH,
+    EMBEDDING_BACKENDS,
+    embedding_model_id,
+    load_embedding_model,
+)
+from ml.src.embedding_batcher import DEFAULT_MAX_BATCH_SIZE, DEFAULT_WINDOW_MS, EmbeddingBatcher
+from ml.src.embedding_cache import DEFAULT_MAX_ENTRIES, EmbeddingCache
+from ml.src.embedding_store import EmbeddingStore
+from ml.src.job_skill_counts import load_or_build_job_skill_counts
+from ml.src.job_title_resolver import DEFAULT_CACHE_SIZE as DEFAULT_TITLE_CACHE_SIZE
+from ml.src.serving_bundle import ServingBundle, load_or_build_serving_bundle
 from ml.src.skill_extractor import SkillExtractor
 from ml.src.skill_gap_analyzer import SkillGapAnalyzer
+from ml.src.source_digests import source_digests
+from ml.src.timeline import timeline
+from ml.src.vector_index import VECTOR_BACKEND_CHROMA, VECTOR_BACKEND_MEMORY, VECTOR_BACKENDS, VectorIndex
 from app.services.skill_demand_service import SkillDemandService
 from app.services.learning_roadmap_service import LearningRoadmapService
 
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_LOADING = "loading"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+@dataclass
+class _Step:
+    """One initialization step and the steps it waits for."""
+
+    run: Callable[[], None]
+    depends_on: tuple[str, ...] = ()
+
 
 @dataclass
 class MLRegistry:
@@ -22,40 +76,283 @@ class MLRegistry:
 
     chroma_client: chromadb.ClientAPI | None = None
     embedding_model: SentenceTransformer | None = None
+    embedding_store: EmbeddingStore | None = None
+    embedding_batcher: EmbeddingBatcher | None = None
+    embedding_cache: EmbeddingCache | None = None
+    source_digests: dict[str, str] | None = None  # source parquet digests, hashed once per boot
+    serving_bundle: ServingBundle | None = None
+    job_title_skills: dict[str, dict] | None = None
+    skill_index: VectorIndex | None = None
+    job_title_index: VectorIndex | None = None
     skill_extractor: SkillExtractor | None = None
     skill_gap_analyzer: SkillGapAnalyzer | None = None
     skill_demand_service: SkillDemandService | None = None
     learning_roadmap_service: LearningRoadmapService | None = None
+    component_status: dict[str, str] = field(default_factory=dict)
+
+    def initialize(
+        self,
+        chroma_host: str,
+        chroma_port: int,
+        model_name: str,
+        max_workers: int = 4,
+        chroma_client: chromadb.ClientAPI | None = None,
+        embedding_cache_size: int = DEFAULT_MAX_ENTRIES,
+        embedding_batch_window_ms: float = DEFAULT_WINDOW_MS,
+        embedding_max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        vector_backend: str = VECTOR_BACKEND_CHROMA,
+        embedding_backend: str = EMBEDDING_BACKEND_TORCH,
+        job_title_cache_size: int = DEFAULT_TITLE_CACHE_SIZE,
+        roadmap_rerank_candidates: int = 0,
+        artifact_dir: Path | None = None,
+    ) -> None:
+        """Load all models and initialize ChromaDB collections.
+
+        A failing step is logged and marked ``failed``; steps depending on it
+        are marked ``failed`` too, while unrelated steps still complete.
+        Every step is recorded on the startup ``timeline``.
+
+        Args:
+            chroma_client: Use this client instead of connecting over HTTP
+                (e.g. an ephemeral client for benchmarks).
+            embedding_cache_size: Capacity of the in-process tier of the
+                embedding cache shared by all services.
+            embedding_batch_window_ms: How long cache misses from concurrent
+                requests are collected into one forward pass.
+            embedding_max_batch_size: Texts per batched forward pass.
+            vector_backend: ``"chroma"`` serves skill and job-title search
+                from the ChromaDB server; ``"memory"`` builds in-process
+                indexes instead and keeps ChromaDB (ephemeral) only for the
+                course catalog.
+            embedding_backend: Runtime for the embedding model (``"torch"``,
+                ``"onnx"`` or ``"onnx-int8"``); see ``ml.src.embedding_backend``.
+            job_title_cache_size: Max job-title resolutions cached by the
+                skill gap analyzer.
+            roadmap_rerank_candidates: Courses re-ranked per roadmap skill
+                (0: twice the courses returned, at most 20).
+            artifact_dir: Keep the derived artifacts (embedding store,
+                serving bundle, job-skill counts, course catalog cache and
+                skill-course table) here instead of ``ml/data/process``,
+                e.g. an empty directory to measure a cold start.
+        """
+        if vector_backend not in VECTOR_BACKENDS:
+            raise ValueError(f"Unknown vector backend {vector_backend!r}; expected one of {VECTOR_BACKENDS}")
+        if embedding_backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend {embedding_backend!r}; expected one of {EMBEDDING_BACKENDS}")
+        in_memory = vector_backend == VECTOR_BACKEND_MEMORY
+        # Stored vectors and the job-title collection are tied to the backend
+        model_id = embedding_model_id(model_name, embedding_backend)
+        if in_memory:
+            logger.info("Initializing MLRegistry (in-process vector indexes)...")
+        else:
+            logger.info("Initializing MLRegistry (ChromaDB at %s:%s)...", chroma_host, chroma_port)
+        course_catalog: list[CourseCatalog] = []  # filled by its step
+
+        def artifact_path(default: Path) -> Path | None:
+            return Path(artifact_dir) / default.name if artifact_dir is not None else None
+
+        def connect_chroma() -> None:
+            if chroma_client is not None:
+                self.chroma_client = chroma_client
+            elif in_memory:
+                self.chroma_client = get_ephemeral_client()
+            else:
+                self.chroma_client = get_chroma_client(host=chroma_host, port=chroma_port)
+
+        def load_model() -> None:
+            with timeline.phase("sentence_transformer_load", model=model_name, backend=embedding_backend):
+                self.embedding_model = load_embedding_model(model_name, embedding_backend)
+            self.embedding_store = EmbeddingStore(model_id, artifact_path(EMBEDDING_STORE_DIR))
+            # services -> cache -> micro-batcher -> model
+            self.embedding_batcher = EmbeddingBatcher(
+                self.embedding_model,
+                window_ms=embedding_batch_window_ms,
+                max_batch_size=embedding_max_batch_size,
+            )
+            self.embedding_cache = EmbeddingCache(
+                self.embedding_batcher,
+                store=self.embedding_store,
+                max_entries=embedding_cache_size,
+            )
+
+        def hash_sources() -> None:
+            # Shared by every loader that fingerprints these files
+            try:
+                self.source_digests = source_digests([
+                    str(SKILL_TAXONOMY_CATEGORIZED_PATH),
+                    str(SKILL_EMBEDDINGS_PATH),
+                    str(JOB_SKILL_MAPPING_PATH),
+                ])
+            except OSError:
+                logger.exception("Could not hash the source files; each loader hashes them itself.")
+                self.source_digests = {}
+
+        def load_course_catalog() -> None:
+            course_catalog.append(LearningRoadmapService.load_catalog(artifact_path(COURSE_CATALOG_DIR)))
+
+        def load_serving_bundle() -> None:
+            try:
+                self.serving_bundle = load_or_build_serving_bundle(
+                    artifact_path(SERVING_BUNDLE_DIR),
+                    digests=self.source_digests,
+                    job_skill_counts_dir=artifact_path(JOB_SKILL_COUNTS_DIR),
+                )
+            except Exception:
+                logger.exception("Serving bundle unavailable, falling back to parquet sources.")
+
+        def load_job_title_skills() -> None:
+            self.job_title_skills = load_or_build_job_skill_counts(
+                directory=artifact_path(JOB_SKILL_COUNTS_DIR), digests=self.source_digests
+            ).title_skills()
+
+        def build_skill_index() -> None:
+            if in_memory:
+                self.skill_index = build_memory_skill_index()
+            else:
+                self.skill_index = populate_skill_collection(self.chroma_client, digests=self.source_digests)
+
+        def build_job_title_index() -> None:
+            if in_memory:
+                self.job_title_index = build_memory_job_title_index(
+                    self.job_title_skills,
+                    model=self.embedding_model,
+                    model_name=model_id,
+                    embedding_store=self.embedding_store,
+                )
+            else:
+                self.job_title_index, _ = populate_job_title_collection(
+                    self.chroma_client,
+                    model=self.embedding_model,
+                    model_name=model_id,
+                    embedding_store=self.embedding_store,
+                    title_skills=self.job_title_skills,
+                    digests=self.source_digests,
+                )
+
+        def load_skill_demand() -> None:
+            service = SkillDemandService()
+            service.load()
+            self.skill_demand_service = service
+
+        def build_skill_extractor() -> None:
+            self.skill_extractor = SkillExtractor(
+                chroma_client=self.chroma_client,
+                model=self.embedding_cache,
+                bundle=self.serving_bundle,
+                index=self.skill_index,
+            )
+
+        def build_skill_gap_analyzer() -> None:
+            self.skill_gap_analyzer = SkillGapAnalyzer(
+                chroma_client=self.chroma_client,
+                model=self.embedding_cache,
+                bundle=self.serving_bundle,
+                title_skills=self.job_title_skills,
+                index=self.job_title_index,
+                title_cache_size=job_title_cache_size,
+            )
+
+        def build_learning_roadmap() -> None:
+            service = LearningRoadmapService(
+                chroma_client=self.chroma_client,
+                model=self.embedding_cache,
+                embedding_store=self.embedding_store,
+                model_id=model_id,
+                rerank_candidates=roadmap_rerank_candidates,
+                catalog_dir=artifact_path(COURSE_CATALOG_DIR),
+                skill_index_dir=artifact_path(SKILL_COURSE_INDEX_DIR),
+            )
+            service.initialize(course_catalog[0])
+            self.learning_roadmap_service = service
+
+        steps = {
+            "chroma_client": _Step(connect_chroma),
+            "embedding_model": _Step(load_model),
+            "source_digests": _Step(hash_sources),
+            "course_catalog": _Step(load_course_catalog),
+            "serving_bundle": _Step(load_serving_bundle, depends_on=("source_digests",)),
+            "job_title_skills": _Step(load_job_title_skills, depends_on=("source_digests",)),
+            "skill_demand_service": _Step(load_skill_demand),
+            "skill_collection": _Step(build_skill_index, depends_on=("chroma_client", "source_digests")),
+            "job_title_collection": _Step(
+                build_job_title_index,
+                depends_on=("chroma_client", "embedding_model", "job_title_skills"),
+            ),
+            "skill_extractor": _Step(
+                build_skill_extractor,
+                depends_on=("skill_collection", "embedding_model", "serving_bundle"),
+            ),
+            "skill_gap_analyzer": _Step(
+                build_skill_gap_analyzer,
+                depends_on=("job_title_collection", "embedding_model", "serving_bundle"),
+            ),
+            "learning_roadmap_service": _Step(
+                build_learning_roadmap,
+                depends_on=("chroma_client", "embedding_model", "course_catalog"),
+            ),
+        }
+        self._run_steps(steps, max_workers)
+        logger.info("MLRegistry initialization finished: %s", self.component_status)
+
+    def is_ready(self, component: str) -> bool:
+        """Whether the named initialization step has completed successfully."""
+        return self.component_status.get(component) == STATUS_READY
+
+    def close(self) -> None:
+        """Stop the embedding batcher and persist pending embedding-store vectors."""
+        if self.embedding_batcher is not None:
+            self.embedding_batcher.close()
+        if self.embedding_store is not None:
+            try:
+                self.embedding_store.flush()
+            except OSError:
+                logger.exception("Could not flush the embedding store.")
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _run_steps(self, steps: dict[str, _Step], max_workers: int) -> None:
+        """Run steps on a thread pool as soon as their dependencies are ready."""
+        for name in steps:
+            self.component_status[name] = STATUS_PENDING
+
+        running: dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ml-init") as pool:
+            while True:
+                changed = True
+                while changed:
+                    changed = False
+                    for name, step in steps.items():
+                        if self.component_status[name] != STATUS_PENDING:
+                            continue
+                        dep_status = [self.component_status[d] for d in step.depends_on]
+                        if STATUS_FAILED in dep_status:
+                            self.component_status[name] = STATUS_FAILED
+                            logger.error("Skipping %s: a dependency failed.", name)
+                            changed = True
+                        elif all(s == STATUS_READY for s in dep_status):
+                            self.component_status[name] = STATUS_LOADING
+                            running[pool.submit(self._run_step, name, step)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        logger.exception("Failed to initialize %s.", name)
+                        self.component_status[name] = STATUS_FAILED
+                    else:
+                        self.component_status[name] = STATUS_READY
 
-    def initialize(self, chroma_host: str, chroma_port: int, model_name: str) -> None:
-        """Load all models and initialize ChromaDB collections."""
-        print("Initializing MLRegistry...")
-        print(f"Connecting to ChromaDB at {chroma_host}:{chroma_port}...")
-        self.chroma_client = get_chroma_client(host=chroma_host, port=chroma_port)
-        self.embedding_model = SentenceTransformer(model_name)
-
-        populate_skill_collection(self.chroma_client)
-        populate_job_title_collection(self.chroma_client, model=self.embedding_model)
-
-        self.skill_extractor = SkillExtractor(
-            chroma_client=self.chroma_client,
-            model=self.embedding_model,
-        )
-        self.skill_gap_analyzer = SkillGapAnalyzer(
-            chroma_client=self.chroma_client,
-            model=self.embedding_model,
-        )
-
-        # Load skill demand predictions (SkillPulse)
-        self.skill_demand_service = SkillDemandService()
-        self.skill_demand_service.load()
-
-        # Initialize learning roadmap service (course catalog)
-        self.learning_roadmap_service = LearningRoadmapService(
-            chroma_client=self.chroma_client,
-            model=self.embedding_model,
-        )
-        self.learning_roadmap_service.initialize()
+    @staticmethod
+    def _run_step(name: str, step: _Step) -> None:
+        with timeline.phase(f"step:{name}"):
+            step.run()
 
 
 ml_registry = MLRegistry()
@@ -1,13 +1,24 @@
-"""FastAPI dependency injection providers."""
+"""FastAPI dependency injection providers.
+
+Services are singletons: each wraps a long-lived registry component and is
+built once, instead of on every request.
+"""
+
+import secrets
+from functools import lru_cache
+
+from fastapi import Header
 
 from app.config import Settings, get_settings
 from app.core.ml_registry import ml_registry
-from app.exceptions import ModelNotReadyError
+from app.exceptions import AdminAccessDeniedError, ModelNotReadyError
 from app.services.interview_service import InterviewService
 from app.services.learning_roadmap_service import LearningRoadmapService
 from app.services.skill_demand_service import SkillDemandService
 from app.services.skill_extraction_service import SkillExtractionService
 from app.services.skill_gap_service import SkillGapService
+from ml.src.skill_extractor import SkillExtractor
+from ml.src.skill_gap_analyzer import SkillGapAnalyzer
 
 
 def get_config() -> Settings:
@@ -16,32 +27,61 @@ def get_config() -> Settings:
 
 def get_skill_extraction_service() -> SkillExtractionService:
     if ml_registry.skill_extractor is None:
-        raise ModelNotReadyError()
-    return SkillExtractionService(ml_registry.skill_extractor)
+        raise ModelNotReadyError("skill_extractor")
+    return _skill_extraction_service(ml_registry.skill_extractor)
 
 
 def get_skill_gap_service() -> SkillGapService:
     if ml_registry.skill_gap_analyzer is None:
-        raise ModelNotReadyError()
-    return SkillGapService(ml_registry.skill_gap_analyzer)
+        raise ModelNotReadyError("skill_gap_analyzer")
+    return _skill_gap_service(ml_registry.skill_gap_analyzer)
 
 
 def get_skill_demand_service() -> SkillDemandService:
     if ml_registry.skill_demand_service is None:
-        raise ModelNotReadyError()
+        raise ModelNotReadyError("skill_demand_service")
     return ml_registry.skill_demand_service
 
 
 def get_learning_roadmap_service() -> LearningRoadmapService:
     if ml_registry.learning_roadmap_service is None or not ml_registry.learning_roadmap_service.is_ready:
-        raise ModelNotReadyError()
+        raise ModelNotReadyError("learning_roadmap_service")
+    return ml_registry.learning_roadmap_service
+
+
+def get_learning_roadmap_service_for_sync() -> LearningRoadmapService:
+    """The roadmap service even before it serves, so a sync can install the first catalog."""
+    if ml_registry.learning_roadmap_service is None:
+        raise ModelNotReadyError("learning_roadmap_service")
     return ml_registry.learning_roadmap_service
 
 
+def require_admin_token(x_admin_token: str | None = Header(default=None)) -> None:
+    """Gate maintenance endpoints on ``ADMIN_TOKEN``; they are disabled while it is empty."""
+    expected = get_settings().ADMIN_TOKEN
+    if not expected:
+        raise AdminAccessDeniedError("Maintenance endpoints are disabled (ADMIN_TOKEN is not set)")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, expected):
+        raise AdminAccessDeniedError()
+
+
+@lru_cache
 def get_interview_service() -> InterviewService:
+    # One instance for the whole app: sessions live in its memory
     settings = get_settings()
     return InterviewService(
         api_key=settings.OPENAI_API_KEY,
         model_name=settings.OPENAI_MODEL,
         temperature=settings.OPENAI_TEMPERATURE,
     )
+
+
+# Keyed by the wrapped component, so a re-initialized registry gets new services
+@lru_cache
+def _skill_extraction_service(extractor: SkillExtractor) -> SkillExtractionService:
+    return SkillExtractionService(extractor)
+
+
+@lru_cache
+def _skill_gap_service(analyzer: SkillGapAnalyzer) -> SkillGapService:
+    return SkillGapService(analyzer)
@@ -11,8 +11,9 @@ class AppException(Exception):
 
 
 class ModelNotReadyError(AppException):
-    def __init__(self):
-        super().__init__("ML models are not loaded yet", status_code=503)
+    def __init__(self, component: str | None = None):
+        detail = f"{component} is not loaded yet" if component else "ML models are not loaded yet"
+        super().__init__(detail, status_code=503)
 
 
 class SkillExtractionError(AppException):
@@ -30,6 +31,26 @@ class InterviewSessionNotFoundError(AppException):
         super().__init__(f"Interview session not found: {session_id}", status_code=404)
 
 
+class BackgroundJobNotFoundError(AppException):
+    def __init__(self, job_id: str):
+        super().__init__(f"Background job not found: {job_id}", status_code=404)
+
+
+class BackgroundJobLimitError(AppException):
+    def __init__(self, max_jobs: int):
+        super().__init__(f"Too many background jobs in progress (max {max_jobs}); retry later", status_code=503)
+
+
+class AdminAccessDeniedError(AppException):
+    def __init__(self, detail: str = "A valid X-Admin-Token header is required"):
+        super().__init__(detail, status_code=403)
+
+
+class EmptyCourseCatalogError(AppException):
+    def __init__(self):
+        super().__init__("Course catalog snapshot has no courses; refusing to remove every course", status_code=422)
+
+
 class OpenAIError(AppException):
     def __init__(self, detail: str = "OpenAI API error"):
         super().__init__(detail, status_code=502)
@@ -1,5 +1,6 @@
 """FastAPI application factory with lifespan for ML model loading."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -7,9 +8,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
+from app.core.concurrency import blocking_executor
+from app.core.jobs import job_store
 from app.core.ml_registry import ml_registry
 from app.exceptions import register_exception_handlers
-from app.routers import health, interview, roadmap, skill_extraction, skill_gap
+from app.routers import diagnostics, health, interview, roadmap, skill_extraction, skill_gap
 
 logger = logging.getLogger(__name__)
 
@@ -19,14 +22,29 @@ API_V1_PREFIX = "/api/v1"
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = get_settings()
-    logger.info("Loading ML models...")
-    ml_registry.initialize(
+    logger.info("Loading ML models in the background...")
+    # Serve requests while models load; each router is gated on the
+    # components it needs and /ready reports per-component status.
+    init_task = asyncio.create_task(asyncio.to_thread(
+        ml_registry.initialize,
         chroma_host=settings.CHROMA_HOST,
         chroma_port=settings.CHROMA_PORT,
         model_name=settings.EMBEDDING_MODEL_NAME,
-    )
-    logger.info("ML models loaded successfully.")
+        embedding_backend=settings.EMBEDDING_BACKEND,
+        max_workers=settings.ML_INIT_WORKERS,
+        embedding_cache_size=settings.EMBEDDING_CACHE_SIZE,
+        embedding_batch_window_ms=settings.EMBEDDING_BATCH_WINDOW_MS,
+        embedding_max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+        vector_backend=settings.VECTOR_BACKEND,
+        job_title_cache_size=settings.JOB_TITLE_CACHE_SIZE,
+        roadmap_rerank_candidates=settings.ROADMAP_RERANK_CANDIDATES,
+    ))
     yield
+    if not init_task.done():
+        logger.warning("Shutting down before ML initialization finished.")
+    job_store.cancel_all()
+    ml_registry.close()
+    blocking_executor.shutdown()
     logger.info("Shutting down.")
 
 
@@ -49,6 +67,7 @@ def create_app() -> FastAPI:
     register_exception_handlers(app)
 
     app.include_router(health.router)
+    app.include_router(diagnostics.router)
     app.include_router(skill_extraction.router, prefix=API_V1_PREFIX, tags=["Skills"])
     app.include_router(skill_gap.router, prefix=API_V1_PREFIX, tags=["Skills"])
     app.include_router(interview.router, prefix=API_V1_PREFIX, tags=["Interview"])
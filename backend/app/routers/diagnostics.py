@@ -0,0 +1,38 @@
+"""Diagnostics endpoints for startup and runtime introspection."""
+
+from fastapi import APIRouter
+
+from app.core.ml_registry import ml_registry
+from ml.src.timeline import peak_rss_mb, timeline
+
+router = APIRouter(tags=["Diagnostics"])
+
+
+@router.get("/diagnostics/startup")
+async def startup_timeline():
+    phases = timeline.records()
+    total_wall = max((p["start_s"] + p["wall_s"] for p in phases), default=0.0)
+    return {
+        "components": dict(ml_registry.component_status),
+        "total_wall_s": round(total_wall, 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "phases": phases,
+    }
+
+
+@router.get("/diagnostics/embedding-cache")
+async def embedding_cache_stats():
+    cache = ml_registry.embedding_cache
+    return {"enabled": cache is not None, **(cache.stats() if cache is not None else {})}
+
+
+@router.get("/diagnostics/job-title-cache")
+async def job_title_cache_stats():
+    analyzer = ml_registry.skill_gap_analyzer
+    return {"enabled": analyzer is not None, **(analyzer.title_resolver.stats() if analyzer is not None else {})}
+
+
+@router.get("/diagnostics/embedding-batcher")
+async def embedding_batcher_stats():
+    batcher = ml_registry.embedding_batcher
+    return {"enabled": batcher is not None, **(batcher.stats() if batcher is not None else {})}
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.core.ml_registry import ml_registry
+from app.core.ml_registry import STATUS_FAILED, STATUS_READY, ml_registry
 
 router = APIRouter(tags=["Health"])
 
@@ -14,5 +14,12 @@ async def health():
 
 @router.get("/ready")
 async def readiness():
-    ready = ml_registry.skill_extractor is not None
-    return {"ready": ready, "status": "ok" if ready else "loading"}
+    components = dict(ml_registry.component_status)
+    ready = ml_registry.is_ready("skill_extractor")
+    if components and all(s == STATUS_READY for s in components.values()):
+        status = "ok"
+    elif STATUS_FAILED in components.values():
+        status = "degraded"
+    else:
+        status = "loading"
+    return {"ready": ready, "status": status, "components": components}
@@ -22,7 +22,7 @@ async def start_interview(
     request: InterviewStartRequest,
     service: InterviewService = Depends(get_interview_service),
 ):
-    session_id, first_question = service.start_session(
+    session_id, first_question = await service.start_session(
         job_role=request.job_role,
         user_skills=request.user_skills,
         language=request.language,
@@ -67,7 +67,7 @@ async def get_interview_feedback(
 ):
     try:
         session = service.get_session_info(session_id)
-        feedback = service.get_feedback(session_id)
+        feedback = await service.get_feedback(session_id)
     except KeyError:
         raise InterviewSessionNotFoundError(session_id)
 
@@ -1,22 +1,86 @@
 """Learning roadmap generation endpoints."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 
-from app.dependencies import get_learning_roadmap_service
+from app.core.jobs import job_store
+from app.dependencies import (
+    get_learning_roadmap_service,
+    get_learning_roadmap_service_for_sync,
+    require_admin_token,
+)
 from app.schemas.common import APIResponse
-from app.schemas.roadmap import RoadmapRequest, RoadmapResponse
+from app.schemas.roadmap import (
+    CourseCatalogSyncJobResponse,
+    CourseCatalogSyncResult,
+    RoadmapRequest,
+    RoadmapResponse,
+)
 from app.services.learning_roadmap_service import LearningRoadmapService
 
 router = APIRouter()
 
+CATALOG_SYNC_JOB_KIND = "course_catalog_sync"
+
 
 @router.post("/roadmap/generate", response_model=APIResponse[RoadmapResponse])
 async def generate_roadmap(
     request: RoadmapRequest,
     service: LearningRoadmapService = Depends(get_learning_roadmap_service),
 ):
-    result = service.generate_roadmap(
+    result = await service.agenerate_roadmap(
         missing_skills=request.missing_skills,
         vak_style=request.vak_style,
     )
     return APIResponse(data=RoadmapResponse(**result))
+
+
+@router.post(
+    "/roadmap/catalog/sync",
+    response_model=APIResponse[CourseCatalogSyncJobResponse],
+    dependencies=[Depends(require_admin_token)],
+)
+async def sync_course_catalog(
+    response: Response,
+    service: LearningRoadmapService = Depends(get_learning_roadmap_service_for_sync),
+):
+    """Apply the course CSVs currently on disk without a restart.
+
+    Only new or edited courses are embedded; roadmaps keep being served from
+    the previous catalog meanwhile. Returns 202 with a job id to poll at
+    ``GET /roadmap/catalog/sync/{job_id}``.
+
+    Requires the ``ADMIN_TOKEN`` in the ``X-Admin-Token`` header (403 while
+    it is unset). Works while the roadmap service has no catalog yet, e.g.
+    to install the first one; if the service itself failed to start (503),
+    run ``scripts/sync_course_catalog.py`` without ``--api`` and restart.
+    """
+
+    async def run() -> CourseCatalogSyncResult:
+        sync = await service.async_sync_catalog()
+        return CourseCatalogSyncResult(
+            courses=sync.courses,
+            embedded=sync.embedded,
+            removed=sync.removed,
+            skill_rows_rescored=sync.skill_index.rescored_rows if sync.skill_index else 0,
+            skill_rows_recomputed=sync.skill_index.recomputed_rows if sync.skill_index else 0,
+            duration_s=sync.duration_s,
+        )
+
+    job = job_store.submit(CATALOG_SYNC_JOB_KIND, run)
+    response.status_code = status.HTTP_202_ACCEPTED
+    return APIResponse(data=CourseCatalogSyncJobResponse(job_id=job.job_id, status=job.status))
+
+
+@router.get(
+    "/roadmap/catalog/sync/{job_id}",
+    response_model=APIResponse[CourseCatalogSyncJobResponse],
+    dependencies=[Depends(require_admin_token)],
+)
+async def get_course_catalog_sync_job(job_id: str):
+    job = job_store.get(job_id, kind=CATALOG_SYNC_JOB_KIND)
+    return APIResponse(data=CourseCatalogSyncJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        error=job.error,
+        result=job.result,
+    ))
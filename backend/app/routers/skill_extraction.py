@@ -1,37 +1,206 @@
-"""Skill extraction endpoint."""
+"""Skill extraction endpoints."""
 
-from fastapi import APIRouter, Depends
+import codecs
+import json
+import logging
+from collections.abc import AsyncIterator
 
-from app.dependencies import get_skill_extraction_service
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+from app.config import Settings
+from app.dependencies import get_config, get_skill_extraction_service
+from app.exceptions import AppException
 from app.schemas.common import APIResponse
 from app.schemas.skill_extraction import (
+    BatchDocument,
+    BatchDocumentResult,
+    BatchSkillExtractionRequest,
+    BatchSkillExtractionResponse,
     ExtractedSkillResponse,
     SkillExtractionRequest,
     SkillExtractionResponse,
 )
 from app.services.skill_extraction_service import SkillExtractionService
+from ml.src.skill_extractor import SkillMatch
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _skill_responses(matches: list[SkillMatch]) -> list[ExtractedSkillResponse]:
+    return [
+        ExtractedSkillResponse(
+            skill_name=m.skill_name,
+            skill_id=m.skill_id,
+            category=m.category,
+            confidence=round(m.confidence, 4),
+            matched_from=m.matched_from,
+        )
+        for m in matches
+    ]
+
+
+def _batch_result(index: int, document: BatchDocument, result: list[SkillMatch] | Exception) -> BatchDocumentResult:
+    if isinstance(result, Exception):
+        return BatchDocumentResult(
+            index=index,
+            id=document.id,
+            skills=[],
+            total_found=0,
+            input_mode=document.mode.value,
+            error="Skill extraction failed",
+        )
+    return BatchDocumentResult(
+        index=index,
+        id=document.id,
+        skills=_skill_responses(result),
+        total_found=len(result),
+        input_mode=document.mode.value,
+    )
+
 
 @router.post("/skills/extract", response_model=APIResponse[SkillExtractionResponse])
 async def extract_skills(
     request: SkillExtractionRequest,
     service: SkillExtractionService = Depends(get_skill_extraction_service),
 ):
-    matches = service.extract_skills(request.text, request.mode)
+    matches = await service.extract_skills(request.text, request.mode)
     response = SkillExtractionResponse(
-        skills=[
-            ExtractedSkillResponse(
-                skill_name=m.skill_name,
-                skill_id=m.skill_id,
-                category=m.category,
-                confidence=round(m.confidence, 4),
-                matched_from=m.matched_from,
-            )
-            for m in matches
-        ],
+        skills=_skill_responses(matches),
         total_found=len(matches),
         input_mode=request.mode.value,
     )
     return APIResponse(data=response)
+
+
+@router.post("/skills/extract/batch", response_model=APIResponse[BatchSkillExtractionResponse])
+async def extract_skills_batch(
+    request: BatchSkillExtractionRequest,
+    stream: bool = Query(False, description="Stream one NDJSON result line per document"),
+    service: SkillExtractionService = Depends(get_skill_extraction_service),
+    settings: Settings = Depends(get_config),
+):
+    """Extract skills from many CVs in one request.
+
+    Without ``stream`` the whole batch shares one encode call and one vector
+    search. With ``stream=true`` documents are processed in chunks of
+    ``EXTRACT_BATCH_CHUNK_SIZE`` and each result is written as an NDJSON
+    line as soon as its chunk finishes.
+    """
+    documents = [(d.text, d.mode) for d in request.documents]
+
+    if stream:
+        async def lines() -> AsyncIterator[str]:
+            async for index, result in service.stream_batch(documents, settings.EXTRACT_BATCH_CHUNK_SIZE):
+                yield _batch_result(index, request.documents[index], result).model_dump_json() + "\n"
+
+        return StreamingResponse(
+            lines(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    results = await service.extract_batch(documents)
+    response = BatchSkillExtractionResponse(
+        results=[_batch_result(i, doc, matches) for i, (doc, matches) in enumerate(zip(request.documents, results))],
+        total_documents=len(results),
+    )
+    return APIResponse(data=response)
+
+
+@router.post(
+    "/skills/extract/stream",
+    # The body is read as a stream, not parsed up front; declared here for the docs
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/plain": {"schema": {"type": "string", "description": "Free-text document (UTF-8)"}}},
+        }
+    },
+)
+async def extract_skills_stream(
+    request: Request,
+    service: SkillExtractionService = Depends(get_skill_extraction_service),
+    settings: Settings = Depends(get_config),
+):
+    """Extract skills from a long free-text document as SSE events.
+
+    The body is read incrementally and cut into sentence-aligned chunks that
+    are extracted in parallel. Each finished chunk emits
+    ``{"chunk", "skills", "total_found"}`` with the skills it added or
+    improved; the last event is ``{"done": true, "skills", "total_found",
+    "chunks"}`` with the deduplicated result. Errors end the stream with
+    ``{"error": ...}``.
+    """
+
+    async def body_text() -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        async for data in request.stream():
+            yield decoder.decode(data)
+        yield decoder.decode(b"", final=True)
+
+    async def events() -> AsyncIterator[str]:
+        best: dict[str, SkillMatch] = {}
+        chunks = 0
+        try:
+            async for index, changed in service.stream_text(
+                body_text(),
+                chunk_chars=settings.EXTRACT_STREAM_CHUNK_CHARS,
+                parallelism=settings.EXTRACT_STREAM_PARALLELISM,
+                max_chars=settings.EXTRACT_STREAM_MAX_CHARS,
+            ):
+                chunks += 1
+                best.update((m.skill_name, m) for m in changed)
+                yield _sse({
+                    "chunk": index,
+                    "skills": [s.model_dump() for s in _skill_responses(changed)],
+                    "total_found": len(best),
+                })
+        except ClientDisconnect:
+            return
+        except AppException as exc:
+            yield _sse({"error": exc.message})
+            return
+        except Exception:
+            logger.exception("Streaming skill extraction failed.")
+            yield _sse({"error": "Skill extraction failed"})
+            return
+
+        matches = sorted(best.values(), key=lambda m: m.confidence, reverse=True)
+        yield _sse({
+            "done": True,
+            "skills": [s.model_dump() for s in _skill_responses(matches)],
+            "total_found": len(matches),
+            "chunks": chunks,
+        })
+
+    return _BodyStreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+class _BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse whose content still reads the request body.
+
+    The stock class watches ``receive`` for a client disconnect while it
+    streams, which would swallow the body chunks the generator is waiting
+    for; here ``request.stream()`` is the only reader and reports the
+    disconnect itself.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
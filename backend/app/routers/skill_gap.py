@@ -1,11 +1,22 @@
 """Skill gap analysis endpoints."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response, status
 
-from app.dependencies import get_skill_demand_service, get_skill_gap_service
+from app.config import Settings
+from app.core.jobs import JOB_COMPLETED, job_store
+from app.dependencies import get_config, get_skill_demand_service, get_skill_gap_service
 from app.schemas.common import APIResponse
 from app.schemas.skill_gap import (
     CategoryScoreResponse,
+    CohortGapAnalysisRequest,
+    CohortGapAnalysisResponse,
+    CohortJobResponse,
+    CohortLearnerResult,
+    CohortSummary,
+    CohortTitleResponse,
+    JobRecommendationItem,
+    JobRecommendationRequest,
+    JobRecommendationResponse,
     JobTitleListResponse,
     MatchedSkillResponse,
     MissingSkillResponse,
@@ -15,10 +26,13 @@ from app.schemas.skill_gap import (
 )
 from app.services.skill_demand_service import SkillDemandService
 from app.services.skill_gap_service import SkillGapService
+from ml.src.skill_gap_analyzer import CohortTitleResult
 from ml.src.skill_normalizer import parse_skills_csv
 
 router = APIRouter()
 
+COHORT_JOB_KIND = "cohort_gap_analysis"
+
 
 def _build_trend(trend_data: dict | None) -> SkillDemandTrend | None:
     if trend_data is None:
@@ -38,7 +52,7 @@ async def analyze_skill_gap(
     demand_service: SkillDemandService = Depends(get_skill_demand_service),
 ):
     user_skill_names = parse_skills_csv(request.user_skills)
-    result = service.analyze_gap(user_skill_names, request.job_title)
+    result = await service.analyze_gap(user_skill_names, request.job_title)
 
     # Enrich matched skills with demand trends
     matched_skills = []
@@ -86,3 +100,77 @@ async def list_job_titles(
 ):
     titles = service.get_available_titles()
     return APIResponse(data=JobTitleListResponse(job_titles=titles, total=len(titles)))
+
+
+@router.post("/jobs/recommend", response_model=APIResponse[JobRecommendationResponse])
+async def recommend_jobs(
+    request: JobRecommendationRequest,
+    service: SkillGapService = Depends(get_skill_gap_service),
+):
+    user_skill_names = parse_skills_csv(request.user_skills)
+    recommendations = await service.recommend_jobs(user_skill_names, request.top_k)
+    return APIResponse(data=JobRecommendationResponse(
+        recommendations=[JobRecommendationItem(**r.to_dict()) for r in recommendations],
+        total_titles=service.get_title_count(),
+    ))
+
+
+def _cohort_response(learner_ids: list[str], results: list[CohortTitleResult]) -> CohortGapAnalysisResponse:
+    return CohortGapAnalysisResponse(results=[
+        CohortTitleResponse(
+            job_title=r.job_title,
+            job_title_matched=r.job_title_matched,
+            job_title_confidence=r.job_title_confidence,
+            required_count=len(r.required_skills),
+            summary=CohortSummary(**r.summary()),
+            learners=[
+                CohortLearnerResult(
+                    id=learner_id,
+                    overall_readiness_score=g.overall_readiness_score,
+                    matched_skills=[m.required_skill for m in g.matched_skills],
+                    missing_skills=[m.skill_name for m in g.missing_skills],
+                )
+                for learner_id, g in zip(learner_ids, r.learners)
+            ],
+        )
+        for r in results
+    ])
+
+
+@router.post("/skills/gap-analysis/cohort", response_model=APIResponse[CohortJobResponse])
+async def analyze_cohort_gap(
+    request: CohortGapAnalysisRequest,
+    response: Response,
+    service: SkillGapService = Depends(get_skill_gap_service),
+    settings: Settings = Depends(get_config),
+):
+    """Gap analysis of many learners against one or more job titles.
+
+    Small cohorts are answered inline. Larger ones (more than
+    ``COHORT_SYNC_MAX_ANALYSES`` learner x title pairs) return 202 with a job
+    id to poll at ``GET /skills/gap-analysis/cohort/{job_id}``.
+    """
+    learner_ids = [learner.id for learner in request.learners]
+    learners = [parse_skills_csv(learner.user_skills) for learner in request.learners]
+
+    async def run() -> CohortGapAnalysisResponse:
+        results = await service.analyze_cohort(learners, request.job_titles)
+        return _cohort_response(learner_ids, results)
+
+    if len(learners) * len(set(request.job_titles)) <= settings.COHORT_SYNC_MAX_ANALYSES:
+        return APIResponse(data=CohortJobResponse(status=JOB_COMPLETED, result=await run()))
+
+    job = job_store.submit(COHORT_JOB_KIND, run)
+    response.status_code = status.HTTP_202_ACCEPTED
+    return APIResponse(data=CohortJobResponse(job_id=job.job_id, status=job.status))
+
+
+@router.get("/skills/gap-analysis/cohort/{job_id}", response_model=APIResponse[CohortJobResponse])
+async def get_cohort_gap_job(job_id: str):
+    job = job_store.get(job_id, kind=COHORT_JOB_KIND)
+    return APIResponse(data=CohortJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        error=job.error,
+        result=job.result,
+    ))
@@ -54,3 +54,19 @@ class RoadmapResponse(BaseModel):
     total_skills: int
     total_courses: int
     vak_style: Optional[str] = None
+
+
+class CourseCatalogSyncResult(BaseModel):
+    courses: int
+    embedded: int  # new or edited courses embedded and upserted
+    removed: int
+    skill_rows_rescored: int = 0  # skill-course table rows merged with new courses
+    skill_rows_recomputed: int = 0  # rows rebuilt against the whole catalog
+    duration_s: float
+
+
+class CourseCatalogSyncJobResponse(BaseModel):
+    job_id: str
+    status: str  # "pending" | "running" | "completed" | "failed"
+    error: Optional[str] = None
+    result: Optional[CourseCatalogSyncResult] = None
@@ -1,6 +1,7 @@
 """Request/response schemas for skill extraction."""
 
 from enum import Enum
+from typing import Optional
 
 from pydantic import BaseModel, Field
 
@@ -23,6 +24,16 @@ class SkillExtractionRequest(BaseModel):
     )
 
 
+class BatchDocument(BaseModel):
+    id: Optional[str] = Field(None, max_length=200, description="Client reference, echoed back")
+    text: str = Field(..., min_length=3, max_length=10_000)
+    mode: InputMode = InputMode.SKILL_LIST
+
+
+class BatchSkillExtractionRequest(BaseModel):
+    documents: list[BatchDocument] = Field(..., min_length=1, max_length=500)
+
+
 class ExtractedSkillResponse(BaseModel):
     skill_name: str
     skill_id: int
@@ -35,3 +46,14 @@ class SkillExtractionResponse(BaseModel):
     skills: list[ExtractedSkillResponse]
     total_found: int
     input_mode: str
+
+
+class BatchDocumentResult(SkillExtractionResponse):
+    index: int  # position in the request
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchSkillExtractionResponse(BaseModel):
+    results: list[BatchDocumentResult]
+    total_documents: int
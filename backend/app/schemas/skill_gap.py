@@ -64,3 +64,98 @@ class SkillGapResponse(BaseModel):
 class JobTitleListResponse(BaseModel):
     job_titles: list[str]
     total: int
+
+
+class JobRecommendationRequest(BaseModel):
+    user_skills: str = Field(
+        ...,
+        min_length=3,
+        description="Comma-separated user skills",
+    )
+    top_k: int = Field(10, ge=1, le=100, description="Number of job titles to return")
+
+
+class JobRecommendationItem(BaseModel):
+    job_title: str
+    match_score: float
+    readiness_score: float
+    matched_count: int
+    required_count: int
+    job_count: int
+    missing_skills: list[str]
+
+
+class JobRecommendationResponse(BaseModel):
+    recommendations: list[JobRecommendationItem]
+    total_titles: int
+
+
+class CohortLearner(BaseModel):
+    id: str = Field(..., min_length=1, max_length=100, description="Caller's learner id")
+    user_skills: str = Field(
+        ...,
+        min_length=3,
+        description="Comma-separated user skills",
+    )
+
+
+class CohortGapAnalysisRequest(BaseModel):
+    learners: list[CohortLearner] = Field(..., min_length=1, max_length=1000)
+    job_titles: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=10,
+        description="Target job titles; every learner is analyzed against each",
+    )
+
+
+class CohortLearnerResult(BaseModel):
+    id: str
+    overall_readiness_score: float
+    matched_skills: list[str]  # required skills the learner covers
+    missing_skills: list[str]  # by importance
+
+
+class ReadinessBin(BaseModel):
+    min: float
+    max: float
+    count: int
+
+
+class CohortMissingSkill(BaseModel):
+    skill_name: str
+    category: str
+    frequency: float
+    learners_missing: int
+    share: float  # of the cohort
+
+
+class CohortSummary(BaseModel):
+    n_learners: int
+    readiness_mean: float
+    readiness_median: float
+    readiness_p25: float
+    readiness_p75: float
+    fully_ready: int
+    readiness_histogram: list[ReadinessBin]
+    most_common_missing: list[CohortMissingSkill]
+
+
+class CohortTitleResponse(BaseModel):
+    job_title: str
+    job_title_matched: str
+    job_title_confidence: float
+    required_count: int
+    summary: CohortSummary
+    learners: list[CohortLearnerResult]
+
+
+class CohortGapAnalysisResponse(BaseModel):
+    results: list[CohortTitleResponse]
+
+
+class CohortJobResponse(BaseModel):
+    job_id: Optional[str] = None  # None when answered inline
+    status: str  # "pending" | "running" | "completed" | "failed"
+    error: Optional[str] = None
+    result: Optional[CohortGapAnalysisResponse] = None
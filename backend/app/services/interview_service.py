@@ -310,7 +310,7 @@ class InterviewService:
         else:
             return "Mulai interview dengan pertanyaan 1."
 
-    def start_session(
+    async def start_session(
         self,
         job_role: str,
         user_skills: list[str],
@@ -335,7 +335,7 @@ class InterviewService:
 
         chain = self._build_chain(session)
         initial_msg = self._get_initial_message(mode)
-        response = chain.invoke(
+        response = await chain.ainvoke(
             {"input": initial_msg},
             config={"configurable": {"session_id": session_id}},
         )
@@ -385,14 +385,14 @@ class InterviewService:
     def get_session_info(self, session_id: str) -> InterviewSession:
         return self._get_session(session_id)
 
-    def get_feedback(self, session_id: str) -> dict:
+    async def get_feedback(self, session_id: str) -> dict:
         """Generate structured feedback for a completed interview."""
         session = self._get_session(session_id)
 
         if not session.is_complete:
-            # Force completion via sync call
+            # Force completion before asking for feedback
             chain = self._build_chain(session)
-            chain.invoke(
+            await chain.ainvoke(
                 {"input": "Akhiri interview dan berikan feedback akhir."},
                 config={"configurable": {"session_id": session_id}},
             )
@@ -411,7 +411,7 @@ class InterviewService:
             job_role=session.job_role,
             conversation=conversation_text,
         )
-        result = llm.invoke(prompt)
+        result = await llm.ainvoke(prompt)
 
         try:
             return json.loads(result.content)
@@ -1,16 +1,31 @@
 """Service for AI-powered personalized learning roadmap generation."""
 
-import hashlib
 import logging
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import chromadb
 import numpy as np
-import pandas as pd
 from sentence_transformers import SentenceTransformer
 
-from ml.src.config import DATA_DIR
+from app.core.concurrency import STAGE_CATALOG_SYNC, STAGE_ROADMAP, run_blocking
+from app.exceptions import EmptyCourseCatalogError
+from ml.src.chromadb_manager import open_collection, row_hash, sync_collection
+from ml.src.config import DATA_DIR, EMBEDDING_MODEL_NAME
+from ml.src.course_catalog import CourseCatalog, load_or_build_course_catalog
+from ml.src.embedding_store import EmbeddingStore
+from ml.src.skill_course_index import (
+    DEFAULT_TOP_N,
+    SkillCourseIndex,
+    SkillCourseUpdate,
+    course_content_hash,
+    load_or_build_skill_course_index,
+    taxonomy_skill_names,
+)
+from ml.src.timeline import timeline
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +33,28 @@ RAW_DIR = Path(__file__).resolve().parent.parent.parent / "ml" / "data" / "raw"
 COURSERA_PATH = RAW_DIR / "courses_en.csv"
 UDEMY_PATH = RAW_DIR / "udemy_online_education_courses_dataset.csv"
 COURSE_COLLECTION_NAME = "course_catalog"
+_GET_BATCH_SIZE = 5000  # ids per ChromaDB get when reading stored vectors back
+_UPSERT_BATCH_SIZE = 500  # courses per re-embedded ChromaDB upsert
+
+
+@dataclass
+class CourseCatalogSync:
+    """What bringing the served courses in line with a catalog snapshot took."""
+
+    courses: int = 0
+    embedded: int = 0  # new or edited courses embedded and upserted
+    removed: int = 0
+    skill_index: Optional[SkillCourseUpdate] = None  # None when the table was loaded or built
+    duration_s: float = 0.0
+
+
+@dataclass(frozen=True)
+class _ServedCourses:
+    """Catalog and skill-course table that belong together; swapped as one on a sync."""
+
+    catalog: CourseCatalog
+    skill_index: Optional[SkillCourseIndex]
+    rows: dict[str, int]  # ChromaDB row id -> catalog position, for rows of this snapshot only
 
 
 class LearningRoadmapService:
@@ -27,141 +64,260 @@ class LearningRoadmapService:
         self,
         chroma_client: chromadb.ClientAPI,
         model: SentenceTransformer,
+        embedding_store: Optional[EmbeddingStore] = None,
+        model_id: str = EMBEDDING_MODEL_NAME,
+        rerank_candidates: int = 0,
+        catalog_dir: Optional[Path] = None,
+        skill_index_dir: Optional[Path] = None,
     ) -> None:
+        """
+        Args:
+            rerank_candidates: Courses re-ranked per skill; 0 keeps
+                ``min(2 * n_results, 20)``.
+            catalog_dir: Where the ingested catalog is cached; the default
+                directory when None.
+            skill_index_dir: Where the skill-course table is saved; the
+                default directory when None.
+        """
         self._client = chroma_client
         self._model = model
+        self._embedding_store = embedding_store
+        self._model_id = model_id
+        self._rerank_candidates = rerank_candidates
+        self._catalog_dir = catalog_dir
+        self._skill_index_dir = skill_index_dir
         self._collection: Optional[chromadb.Collection] = None
-        self._course_metadata: dict[str, dict] = {}
+        self._served: Optional[_ServedCourses] = None
+        self._sync_lock = threading.Lock()
+
+    def initialize(
+        self,
+        catalog: Optional[CourseCatalog] = None,
+        skill_names: Optional[list[str]] = None,
+    ) -> None:
+        """Load course data, embed, and populate ChromaDB collection.
 
-    def initialize(self) -> None:
-        """Load course data, embed, and populate ChromaDB collection."""
-        courses = self._load_courses()
-        if not courses:
+        Args:
+            catalog: Already loaded courses from ``load_catalog``; loaded here if None.
+            skill_names: Skills to precompute course rankings for; the
+                taxonomy when None.
+        """
+        if catalog is None:
+            catalog = self.load_catalog(self._catalog_dir)
+        if not len(catalog):
             logger.warning("No courses loaded. Roadmap service will be unavailable.")
             return
-        self._populate_collection(courses)
-        logger.info("LearningRoadmapService initialized with %d courses.", len(courses))
+        self.sync_catalog(catalog, skill_names)
+        logger.info(
+            "LearningRoadmapService initialized with %d courses (%.1f MB of metadata).",
+            len(catalog), catalog.nbytes / 1e6,
+        )
 
-    def _load_courses(self) -> list[dict]:
-        """Load and normalize courses from Coursera and Udemy datasets."""
-        courses: list[dict] = []
+    @staticmethod
+    def load_catalog(directory: Optional[Path] = None) -> CourseCatalog:
+        """Load the Coursera and Udemy courses, re-ingesting the CSVs only when they changed."""
+        return load_or_build_course_catalog(COURSERA_PATH, UDEMY_PATH, directory)
 
-        # Load Coursera courses
-        if COURSERA_PATH.exists():
-            try:
-                df = pd.read_csv(COURSERA_PATH, on_bad_lines="skip")
-                for _, row in df.iterrows():
-                    skills_raw = row.get("skills", "")
-                    if not isinstance(skills_raw, str) or not skills_raw.strip():
-                        continue
-                    skills = [s.strip() for s in skills_raw.split(",") if s.strip()]
-                    if not skills:
-                        continue
-                    name = str(row.get("name", "")).strip()
-                    if not name:
-                        continue
-                    courses.append({
-                        "id": f"coursera_{hashlib.md5(name.encode()).hexdigest()[:10]}",
-                        "title": name,
-                        "platform": "Coursera",
-                        "url": str(row.get("url", "")),
-                        "category": str(row.get("category", "")),
-                        "skills": skills,
-                        "skill_text": ", ".join(skills[:10]),
-                        "level": "All Levels",
-                        "subscribers": 0,
-                        "reviews": 0,
-                        "content_hours": 0,
-                    })
-                logger.info("Loaded %d Coursera courses.", len(courses))
-            except Exception as e:
-                logger.error("Failed to load Coursera courses: %s", e)
-
-        # Load Udemy courses
-        udemy_start = len(courses)
-        if UDEMY_PATH.exists():
-            try:
-                df = pd.read_csv(UDEMY_PATH, on_bad_lines="skip")
-                for _, row in df.iterrows():
-                    title = str(row.get("course_title", "")).strip()
-                    if not title:
-                        continue
-                    subject = str(row.get("subject", ""))
-                    # Use title + subject as skill proxy for Udemy
-                    skill_text = f"{title} {subject}"
-                    courses.append({
-                        "id": f"udemy_{row.get('course_id', hashlib.md5(title.encode()).hexdigest()[:10])}",
-                        "title": title,
-                        "platform": "Udemy",
-                        "url": str(row.get("url", "")),
-                        "category": subject,
-                        "skills": [],  # Udemy doesn't have structured skills
-                        "skill_text": skill_text,
-                        "level": str(row.get("level", "All Levels")),
-                        "subscribers": int(row.get("num_subscribers", 0)),
-                        "reviews": int(row.get("num_reviews", 0)),
-                        "content_hours": float(row.get("content_duration", 0)),
-                    })
-                logger.info("Loaded %d Udemy courses.", len(courses) - udemy_start)
-            except Exception as e:
-                logger.error("Failed to load Udemy courses: %s", e)
-
-        return courses
-
-    def _populate_collection(self, courses: list[dict]) -> None:
-        """Embed course skill texts and populate ChromaDB."""
-        # Deduplicate by ID (duplicate names produce the same hash-based ID)
-        seen_ids: set[str] = set()
-        unique_courses: list[dict] = []
-        for c in courses:
-            if c["id"] not in seen_ids:
-                seen_ids.add(c["id"])
-                unique_courses.append(c)
-        courses = unique_courses
-
-        # Delete and recreate for idempotency
-        try:
-            self._client.delete_collection(COURSE_COLLECTION_NAME)
-        except Exception:
-            pass
-        self._collection = self._client.create_collection(
-            name=COURSE_COLLECTION_NAME,
-            metadata={"hnsw:space": "cosine"},
+    def sync_catalog(
+        self,
+        catalog: Optional[CourseCatalog] = None,
+        skill_names: Optional[list[str]] = None,
+    ) -> CourseCatalogSync:
+        """Bring the served courses in line with a catalog snapshot.
+
+        Courses are diffed against the collection by id and content hash:
+        only new or edited courses are embedded and upserted, and the
+        skill-course table is updated for the changed courses only. Rows are
+        versioned by content hash, so an edit adds a row rather than
+        overwriting one: requests keep being answered from the previous
+        catalog, table and rows until the new ones are swapped in together,
+        and only then are the rows of removed or edited courses deleted.
+
+        Args:
+            catalog: The new snapshot; the raw CSVs are loaded (re-ingested
+                if they changed) when None.
+            skill_names: Skills of the skill-course table; its current skills,
+                or the taxonomy, when None.
+
+        Raises:
+            EmptyCourseCatalogError: If the snapshot has no courses.
+        """
+        start = time.perf_counter()
+        if catalog is None:
+            catalog = self.load_catalog(self._catalog_dir)
+        if not len(catalog):
+            raise EmptyCourseCatalogError()
+
+        with self._sync_lock:
+            hashes = [course_content_hash(text) for text in catalog.skill_texts.tolist()]
+            result = CourseCatalogSync(courses=len(catalog))
+
+            def publish(row_ids: list[str], embeddings: np.ndarray) -> None:
+                skill_index = None
+                try:
+                    skill_index, result.skill_index = self._refresh_skill_index(
+                        catalog, hashes, embeddings, skill_names
+                    )
+                except Exception:
+                    logger.exception("Skill-course index unavailable, serving every skill by live search.")
+                self._served = _ServedCourses(catalog, skill_index, dict(zip(row_ids, range(len(row_ids)))))
+
+            result.embedded, result.removed = self._sync_course_collection(catalog, hashes, publish)
+
+        result.duration_s = round(time.perf_counter() - start, 3)
+        logger.info("Course catalog synced: %s", result)
+        return result
+
+    async def async_sync_catalog(self, catalog: Optional[CourseCatalog] = None) -> CourseCatalogSync:
+        """``sync_catalog`` run off the event loop."""
+        return await run_blocking(STAGE_CATALOG_SYNC, self.sync_catalog, catalog)
+
+    def _sync_course_collection(
+        self,
+        catalog: CourseCatalog,
+        hashes: list[bytes],
+        publish: Callable[[list[str], np.ndarray], None],
+    ) -> tuple[int, int]:
+        """Upsert new or edited courses into ChromaDB and delete stale rows.
+
+        Course metadata is kept in the columnar catalog only; the collection
+        holds skill texts, vectors and a row hash of the skill text and
+        embedding model, under ``{course_id}@{content hash}`` row ids.
+        ``publish`` is called with the row ids and course embeddings in
+        catalog order once the new rows are in and before any stale row is
+        deleted.
+
+        Returns:
+            The number of courses upserted and removed.
+        """
+        course_ids = catalog.ids.tolist()
+        ids = [f"{cid}@{h.decode()}" for cid, h in zip(course_ids, hashes)]
+        texts = catalog.skill_texts.tolist()
+        metadatas = [{"row_hash": row_hash(self._model_id, h.decode())} for h in hashes]
+        with timeline.phase("fingerprint_sources", collection=COURSE_COLLECTION_NAME):
+            fingerprint = row_hash(ids, [m["row_hash"] for m in metadatas])
+        collection, up_to_date = open_collection(self._client, COURSE_COLLECTION_NAME, fingerprint)
+        self._collection = collection
+
+        vectors: dict[int, np.ndarray] = {}
+        removed = 0
+
+        def swap_in(stale: list[str]) -> None:
+            nonlocal removed
+            removed = len({_course_id(rid) for rid in stale} - set(course_ids))
+            # Vectors of unchanged courses are looked up instead of re-embedded
+            unchanged = [i for i in range(len(ids)) if i not in vectors]
+            self._read_course_vectors(collection, ids, texts, metadatas, unchanged, vectors)
+            publish(ids, np.asarray([vectors[i] for i in range(len(ids))], dtype=np.float32))
+
+        if up_to_date:
+            swap_in([])
+            return 0, 0
+
+        def embed(positions: list[int]) -> list[list[float]]:
+            batch = self._encode_courses([texts[i] for i in positions])
+            vectors.update(zip(positions, batch))
+            return batch.tolist()
+
+        upserted, _ = sync_collection(
+            collection, fingerprint, ids, texts, metadatas, embed, before_delete=swap_in
         )
+        return upserted, removed
 
-        # Embed skill texts
-        texts = [c["skill_text"] for c in courses]
-        embeddings = self._model.encode(texts, show_progress_bar=True, batch_size=128)
-
-        # Store metadata for later retrieval
-        for c in courses:
-            self._course_metadata[c["id"]] = c
-
-        # Batch upsert
-        batch_size = 500
-        ids, docs, embs, metas = [], [], [], []
-
-        for i, course in enumerate(courses):
-            ids.append(course["id"])
-            docs.append(course["skill_text"])
-            embs.append(embeddings[i].tolist())
-            metas.append({
-                "title": course["title"],
-                "platform": course["platform"],
-                "url": course["url"],
-                "category": course["category"],
-                "level": course["level"],
-                "subscribers": course["subscribers"],
-                "reviews": course["reviews"],
-                "content_hours": course["content_hours"],
-            })
+    def _read_course_vectors(
+        self,
+        collection: chromadb.Collection,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict],
+        positions: list[int],
+        vectors: dict[int, np.ndarray],
+    ) -> None:
+        """Fill ``vectors`` for ``positions`` without running the model where possible.
 
-            if len(ids) >= batch_size:
-                self._collection.add(ids=ids, documents=docs, embeddings=embs, metadatas=metas)
-                ids, docs, embs, metas = [], [], [], []
+        Vectors come from the embedding store first and are read back from
+        the collection only for texts it lacks. Courses missing from both
+        are re-embedded and upserted again.
+        """
+        if self._embedding_store is not None and positions:
+            found, stored = self._embedding_store.lookup([texts[i] for i in positions])
+            vectors.update((i, vec) for i, vec, hit in zip(positions, stored, found) if hit)
+            positions = [i for i, hit in zip(positions, found) if not hit]
+
+        for start in range(0, len(positions), _GET_BATCH_SIZE):
+            batch = positions[start:start + _GET_BATCH_SIZE]
+            with timeline.phase("chroma_get", collection=COURSE_COLLECTION_NAME, rows=len(batch)):
+                got = collection.get(ids=[ids[i] for i in batch], include=["embeddings"])
+            by_id = dict(zip(got["ids"], got["embeddings"]))
+            vectors.update((i, by_id[ids[i]]) for i in batch if ids[i] in by_id)
+
+        lost = [i for i in positions if i not in vectors]
+        if lost:
+            logger.warning(
+                "%d courses missing from the %s collection; re-embedding them.", len(lost), COURSE_COLLECTION_NAME
+            )
+            for start in range(0, len(lost), _UPSERT_BATCH_SIZE):
+                batch = lost[start:start + _UPSERT_BATCH_SIZE]
+                embeddings = self._encode_courses([texts[i] for i in batch])
+                with timeline.phase("chroma_upsert", collection=COURSE_COLLECTION_NAME, rows=len(batch)):
+                    collection.upsert(
+                        ids=[ids[i] for i in batch],
+                        documents=[texts[i] for i in batch],
+                        embeddings=embeddings.tolist(),
+                        metadatas=[metadatas[i] for i in batch],
+                    )
+                vectors.update(zip(batch, embeddings))
+
+    def _encode_courses(self, texts: list[str]) -> np.ndarray:
+        """Embed course skill texts (only those missing from the on-disk store)."""
+        with timeline.phase("encode", target=COURSE_COLLECTION_NAME, texts=len(texts)):
+            if self._embedding_store is not None:
+                embeddings = self._embedding_store.encode(
+                    self._model, texts, batch_size=128, show_progress_bar=True
+                )
+            else:
+                embeddings = self._model.encode(texts, show_progress_bar=True, batch_size=128)
+        return np.asarray(embeddings, dtype=np.float32)
 
-        if ids:
-            self._collection.add(ids=ids, documents=docs, embeddings=embs, metadatas=metas)
+    def _refresh_skill_index(
+        self,
+        catalog: CourseCatalog,
+        hashes: list[bytes],
+        embeddings: np.ndarray,
+        skill_names: Optional[list[str]],
+    ) -> tuple[SkillCourseIndex, Optional[SkillCourseUpdate]]:
+        """Precompute (or incrementally refresh) the top courses of every skill.
+
+        The served table is updated in memory when there is one; otherwise the
+        saved table is brought up to date (or built). Table course positions
+        are catalog positions.
+        """
+        current = self._served.skill_index if self._served is not None else None
+        top_n = max(DEFAULT_TOP_N, self._rerank_candidates)
+        encode_skills = lambda names: self._model.encode(names, batch_size=128)  # noqa: E731
+        course_ids = catalog.ids.tolist()
+
+        if current is not None and current.top_n == top_n:
+            index, stats = current.update(
+                skill_names or current.skill_names, encode_skills, course_ids, hashes, embeddings
+            )
+            try:
+                index.save(self._skill_index_dir)
+            except OSError:
+                logger.exception("Could not save the skill-course index.")
+            return index, stats
+
+        index = load_or_build_skill_course_index(
+            skill_names or taxonomy_skill_names(),
+            encode_skills=encode_skills,
+            course_ids=course_ids,
+            course_hashes=hashes,
+            course_vectors=embeddings,
+            model_id=self._model_id,
+            top_n=top_n,
+            directory=self._skill_index_dir,
+        )
+        return index, None
 
     def find_courses_for_skill(
         self,
@@ -170,82 +326,71 @@ class LearningRoadmapService:
         vak_style: Optional[str] = None,
     ) -> list[dict]:
         """Find top courses matching a given skill."""
-        if self._collection is None:
-            return []
-
-        embedding = self._model.encode([skill_name])[0].tolist()
-        results = self._collection.query(
-            query_embeddings=[embedding],
-            n_results=min(n_results * 2, 20),  # fetch extra for re-ranking
-            include=["metadatas", "distances"],
-        )
+        return self.find_courses_for_skills([skill_name], n_results, vak_style)[0]
 
-        courses = []
-        for j in range(len(results["ids"][0])):
-            meta = results["metadatas"][0][j]
-            dist = results["distances"][0][j]
-            similarity = 1.0 - dist
+    def find_courses_for_skills(
+        self,
+        skill_names: list[str],
+        n_results: int = 5,
+        vak_style: Optional[str] = None,
+    ) -> list[list[dict]]:
+        """Find top courses for each skill.
 
-            if similarity < 0.25:
-                continue
+        Skills in the precomputed skill-course index are served from it; the
+        rest are encoded in one batch and searched with one vector query,
+        keeping only rows of the served snapshot (during a sync, rows of the
+        other snapshot may take a few of the candidate slots).
 
-            course = {
-                "title": meta["title"],
-                "platform": meta["platform"],
-                "url": meta["url"],
-                "category": meta["category"],
-                "level": meta["level"],
-                "match_score": round(similarity, 3),
-                "subscribers": meta.get("subscribers", 0),
-                "reviews": meta.get("reviews", 0),
-                "content_hours": meta.get("content_hours", 0),
-            }
-
-            # VAK-aware boosting
-            if vak_style:
-                course["match_score"] = self._apply_vak_boost(
-                    course, vak_style, similarity
-                )
+        Returns:
+            Course lists in ``skill_names`` order, each as ``find_courses_for_skill``.
+        """
+        served = self._served  # one snapshot for the whole call, even if a sync swaps it
+        if served is None or self._collection is None or not skill_names:
+            return [[] for _ in skill_names]
+        catalog, skill_index = served.catalog, served.skill_index
+
+        # Fetch extra candidates for re-ranking
+        if self._rerank_candidates:
+            n_candidates = max(self._rerank_candidates, n_results)
+        else:
+            n_candidates = min(n_results * 2, 20)
+        hits: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        unindexed = []
+        for name in dict.fromkeys(skill_names):
+            found = skill_index.lookup(name, n_candidates) if skill_index is not None else None
+            if found is None:
+                unindexed.append(name)
+            else:
+                hits[name] = found
+
+        if unindexed:
+            embeddings = self._model.encode(unindexed)
+            results = self._collection.query(
+                query_embeddings=[e.tolist() for e in embeddings],
+                n_results=n_candidates,
+                include=["distances"],
+            )
+            for i, name in enumerate(unindexed):
+                positions = np.array([served.rows.get(rid, -1) for rid in results["ids"][i]], dtype=np.int64)
+                sims = 1.0 - np.asarray(results["distances"][i], dtype=np.float64)
+                hits[name] = (positions[positions >= 0], sims[positions >= 0])
+
+        ranked = {
+            name: catalog.rank(positions, sims, n_results, vak_style)
+            for name, (positions, sims) in hits.items()
+        }
+        return [[dict(c) for c in ranked[name]] for name in skill_names]
 
-            courses.append(course)
-
-        # Sort by boosted match score and return top N
-        courses.sort(key=lambda c: c["match_score"], reverse=True)
-        return courses[:n_results]
-
-    def _apply_vak_boost(
-        self, course: dict, vak_style: str, base_score: float
-    ) -> float:
-        """Apply VAK learning style boost to course relevance score."""
-        boost = 0.0
-        content_hours = course.get("content_hours", 0)
-
-        if vak_style == "visual":
-            # Prefer Udemy (video-heavy) and longer video content
-            if course["platform"] == "Udemy":
-                boost += 0.03
-            if content_hours > 5:
-                boost += 0.02
-        elif vak_style == "auditory":
-            # Prefer Coursera (lecture-format, structured)
-            if course["platform"] == "Coursera":
-                boost += 0.03
-        elif vak_style == "kinesthetic":
-            # Prefer project-based, hands-on (longer courses, higher engagement)
-            if content_hours > 10:
-                boost += 0.03
-            subscribers = course.get("subscribers", 0)
-            if subscribers > 10000:
-                boost += 0.02
-
-        # Social proof boost (normalized)
-        subscribers = course.get("subscribers", 0)
-        if subscribers > 50000:
-            boost += 0.02
-        elif subscribers > 10000:
-            boost += 0.01
-
-        return round(base_score + boost, 3)
+    async def agenerate_roadmap(
+        self,
+        missing_skills: list[dict],
+        vak_style: Optional[str] = None,
+        courses_per_skill: int = 3,
+    ) -> dict:
+        """``generate_roadmap`` run off the event loop (encode + ChromaDB query)."""
+        return await run_blocking(
+            STAGE_ROADMAP, self.generate_roadmap, missing_skills, vak_style, courses_per_skill
+        )
 
     def generate_roadmap(
         self,
@@ -284,6 +429,13 @@ class LearningRoadmapService:
             {"name": "Pendalaman", "description": "Skill lanjutan dan spesialisasi", "weeks": "Minggu 9-12"},
         ]
 
+        # Courses for every skill in one batched lookup
+        skill_courses = self.find_courses_for_skills(
+            [s.get("skill_name", "") for s in sorted_skills],
+            n_results=courses_per_skill,
+            vak_style=vak_style,
+        )
+
         total_courses = 0
         for phase_idx, config in enumerate(phase_configs):
             start = phase_idx * phase_size
@@ -298,13 +450,8 @@ class LearningRoadmapService:
                 continue
 
             skill_items = []
-            for skill_data in phase_skills:
+            for skill_data, courses in zip(phase_skills, skill_courses[start:end]):
                 skill_name = skill_data.get("skill_name", "")
-                courses = self.find_courses_for_skill(
-                    skill_name,
-                    n_results=courses_per_skill,
-                    vak_style=vak_style,
-                )
                 total_courses += len(courses)
                 skill_items.append({
                     "skill_name": skill_name,
@@ -331,4 +478,10 @@ class LearningRoadmapService:
 
     @property
     def is_ready(self) -> bool:
-        return self._collection is not None
+        return self._served is not None and self._collection is not None
+
+
+def _course_id(row_id: str) -> str:
+    """Course id of a collection row id; rows written before ids were versioned are the bare course id."""
+    course_id, versioned, _ = row_id.rpartition("@")
+    return course_id if versioned else row_id
@@ -7,6 +7,7 @@ from pathlib import Path
 import pandas as pd
 
 from ml.src.config import DATA_DIR
+from ml.src.timeline import timeline
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +25,18 @@ class SkillDemandService:
         """Load skill demand predictions from parquet or JSON fallback."""
         path = SKILL_DEMAND_PREDICTIONS_PATH
         if path.exists():
-            df = pd.read_parquet(path)
-            for _, row in df.iterrows():
-                name = str(row["skill_name"]).lower().strip()
-                self._predictions[name] = {
-                    "predicted_trend": row["predicted_trend"],
-                    "confidence": float(row["confidence"]),
-                    "growth_rate": float(row["growth_rate_pred"]),
-                    "current_demand": int(row["current_demand"]),
-                    "method": row.get("method", "unknown"),
-                }
+            with timeline.phase("read_parquet", path=str(path)):
+                df = pd.read_parquet(path)
+            with timeline.phase("iterrows_demand_predictions", rows=len(df)):
+                for _, row in df.iterrows():
+                    name = str(row["skill_name"]).lower().strip()
+                    self._predictions[name] = {
+                        "predicted_trend": row["predicted_trend"],
+                        "confidence": float(row["confidence"]),
+                        "growth_rate": float(row["growth_rate_pred"]),
+                        "current_demand": int(row["current_demand"]),
+                        "method": row.get("method", "unknown"),
+                    }
             logger.info("Loaded %d skill demand predictions.", len(self._predictions))
         elif SKILL_DEMAND_JSON_PATH.exists():
             with open(SKILL_DEMAND_JSON_PATH) as f:
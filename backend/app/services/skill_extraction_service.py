@@ -1,15 +1,116 @@
 """Service layer wrapping SkillExtractor ML model."""
 
+import asyncio
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+
 from ml.src.skill_extractor import SkillExtractor, SkillMatch
+from ml.src.text_chunker import TextChunker
 
+from app.core.concurrency import STAGE_EXTRACT, run_blocking
+from app.exceptions import SkillExtractionError
 from app.schemas.skill_extraction import InputMode
 
+logger = logging.getLogger(__name__)
+
 
 class SkillExtractionService:
     def __init__(self, extractor: SkillExtractor):
         self._extractor = extractor
 
-    def extract_skills(self, text: str, mode: InputMode) -> list[SkillMatch]:
+    async def extract_skills(self, text: str, mode: InputMode) -> list[SkillMatch]:
+        """Extract skills off the event loop (encode + ChromaDB query)."""
+        return await run_blocking(STAGE_EXTRACT, self._extract_skills, text, mode)
+
+    async def extract_batch(self, documents: Sequence[tuple[str, InputMode]]) -> list[list[SkillMatch]]:
+        """Extract skills from many documents with one encode + one vector search."""
+        items = [(text, mode.value) for text, mode in documents]
+        return await run_blocking(STAGE_EXTRACT, self._extractor.extract_batch, items)
+
+    async def stream_batch(
+        self,
+        documents: Sequence[tuple[str, InputMode]],
+        chunk_size: int,
+    ) -> AsyncIterator[tuple[int, list[SkillMatch] | Exception]]:
+        """Yield ``(index, matches)`` chunk by chunk as each chunk finishes.
+
+        A failing chunk yields the exception for each of its documents and
+        the remaining chunks still run.
+        """
+        for start in range(0, len(documents), chunk_size):
+            chunk = documents[start : start + chunk_size]
+            try:
+                results: list = await self.extract_batch(chunk)
+            except Exception as exc:
+                logger.exception("Batch extraction failed for documents %d-%d.", start, start + len(chunk) - 1)
+                results = [exc] * len(chunk)
+            for offset, result in enumerate(results):
+                yield start + offset, result
+
+    async def stream_text(
+        self,
+        pieces: AsyncIterable[str],
+        chunk_chars: int,
+        parallelism: int,
+        max_chars: int,
+    ) -> AsyncIterator[tuple[int, list[SkillMatch]]]:
+        """Extract skills from a long free-text document as it arrives.
+
+        The text is cut into sentence-aligned chunks of ``chunk_chars``;
+        up to ``parallelism`` chunks are extracted at once and, as each one
+        finishes, ``(chunk_index, changed)`` is yielded where ``changed``
+        are the skills it added or improved in the running deduplication.
+        Memory holds the unfinished tail of the text, the chunks in flight
+        and one best match per skill, whatever the document length.
+
+        Raises:
+            SkillExtractionError: If the document exceeds ``max_chars``.
+        """
+        chunker = TextChunker(chunk_chars)
+        best: dict[str, SkillMatch] = {}
+        pending: set[asyncio.Task] = set()
+        received = 0
+        n_chunks = 0
+
+        async def chunks() -> AsyncIterator[str]:
+            nonlocal received
+            async for piece in pieces:
+                received += len(piece)
+                if received > max_chars:
+                    raise SkillExtractionError(f"Document exceeds {max_chars} characters")
+                for chunk in chunker.feed(piece):
+                    yield chunk
+            for chunk in chunker.close():
+                yield chunk
+
+        async def extract(index: int, chunk: str) -> tuple[int, list[SkillMatch]]:
+            return index, await run_blocking(STAGE_EXTRACT, self._extractor.extract_from_text, chunk)
+
+        def merge(done: set[asyncio.Task]) -> list[tuple[int, list[SkillMatch]]]:
+            pending.difference_update(done)
+            merged = []
+            for task in sorted(done, key=lambda t: t.result()[0]):
+                index, matches = task.result()
+                merged.append((index, self._extractor.merge_matches(best, matches)))
+            return merged
+
+        try:
+            async for chunk in chunks():
+                if len(pending) >= parallelism:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for event in merge(done):
+                        yield event
+                pending.add(asyncio.create_task(extract(n_chunks, chunk)))
+                n_chunks += 1
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for event in merge(done):
+                    yield event
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _extract_skills(self, text: str, mode: InputMode) -> list[SkillMatch]:
         if mode == InputMode.SKILL_LIST:
             return self._extractor.extract_from_skill_list(text)
         return self._extractor.extract_from_text(text)
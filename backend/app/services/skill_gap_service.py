@@ -1,7 +1,9 @@
 """Service layer wrapping SkillGapAnalyzer ML model."""
 
-from ml.src.skill_gap_analyzer import GapAnalysisResult, SkillGapAnalyzer
+from ml.src.job_recommender import JobRecommendation
+from ml.src.skill_gap_analyzer import CohortTitleResult, GapAnalysisResult, SkillGapAnalyzer
 
+from app.core.concurrency import STAGE_GAP_ANALYSIS, run_blocking
 from app.exceptions import JobTitleNotFoundError
 
 
@@ -9,11 +11,46 @@ class SkillGapService:
     def __init__(self, analyzer: SkillGapAnalyzer):
         self._analyzer = analyzer
 
-    def analyze_gap(self, user_skill_names: list[str], job_title: str) -> GapAnalysisResult:
-        result = self._analyzer.analyze(user_skills=user_skill_names, job_title=job_title)
+    async def analyze_gap(self, user_skill_names: list[str], job_title: str) -> GapAnalysisResult:
+        """Run the gap analysis off the event loop (encode + ChromaDB query)."""
+        result = await run_blocking(
+            STAGE_GAP_ANALYSIS,
+            self._analyzer.analyze,
+            user_skills=user_skill_names,
+            job_title=job_title,
+        )
         if result.job_title_confidence == 0.0 and not result.matched_skills:
             raise JobTitleNotFoundError(job_title)
         return result
 
+    async def recommend_jobs(self, user_skill_names: list[str], top_k: int) -> list[JobRecommendation]:
+        """Score the user against every job title off the event loop."""
+        return await run_blocking(
+            STAGE_GAP_ANALYSIS,
+            self._analyzer.recommend_jobs,
+            user_skills=user_skill_names,
+            top_k=top_k,
+        )
+
+    async def analyze_cohort(
+        self,
+        learners: list[list[str]],
+        job_titles: list[str],
+    ) -> list[CohortTitleResult]:
+        """Analyze every learner against every title off the event loop."""
+        results = await run_blocking(
+            STAGE_GAP_ANALYSIS,
+            self._analyzer.analyze_cohort,
+            learners=learners,
+            job_titles=job_titles,
+        )
+        for result in results:
+            if not result.resolved:
+                raise JobTitleNotFoundError(result.job_title)
+        return results
+
     def get_available_titles(self) -> list[str]:
         return self._analyzer.get_available_job_titles()
+
+    def get_title_count(self) -> int:
+        return self._analyzer.n_job_titles
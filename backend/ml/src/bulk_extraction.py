@@ -0,0 +1,333 @@
+"""Offline skill extraction over job-posting parquet files.
+
+Postings are read in fixed-size shards and fanned out to a process pool.
+Each worker loads its own embedding model and in-process skill index once,
+runs ``SkillExtractor.extract_batch`` on a shard and writes the resulting
+``job_skill_mapping`` rows as one part file. ``progress.json`` records the
+finished shards, so an interrupted run resumes where it stopped. At most
+``2 * workers`` shards are in flight, which keeps memory bounded by the
+shard size rather than by the dataset.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ml.src.config import EMBEDDING_MODEL_NAME
+from ml.src.embedding_backend import EMBEDDING_BACKEND_TORCH
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FILE = "progress.json"
+PROGRESS_VERSION = 1
+
+# Output columns, in job_skill_mapping.parquet order
+JOB_SKILL_MAPPING_SCHEMA = pa.schema([
+    ("job_id", pa.string()),
+    ("job_title", pa.string()),
+    ("skill", pa.string()),
+    ("source", pa.string()),
+    ("posting_date", pa.timestamp("ns")),
+    ("industry", pa.string()),
+    ("location", pa.string()),
+    ("salary", pa.float64()),
+])
+_PASSTHROUGH_COLUMNS = ("source", "posting_date", "industry", "location", "salary")
+
+
+@dataclass
+class BulkExtractionConfig:
+    """Settings of one bulk extraction run.
+
+    Attributes:
+        input_path: Parquet file of postings.
+        output_dir: Directory for part files and ``progress.json``.
+        text_column: Column holding the posting text.
+        mode: ``"free_text"`` or ``"skill_list"`` (see ``SkillExtractor``).
+        id_column: Posting id column (written as ``job_id``).
+        title_column: Job title column (written as ``job_title``).
+        shard_size: Postings per shard.
+        workers: Worker processes.
+        threads_per_worker: Intra-op threads per worker's model.
+        model_name: Embedding model name.
+        embedding_backend: Embedding runtime (see ``ml.src.embedding_backend``).
+    """
+
+    input_path: str
+    output_dir: str
+    text_column: str = "job_description"
+    mode: str = "free_text"
+    id_column: str = "job_id"
+    title_column: str = "job_title"
+    shard_size: int = 512
+    workers: int = max(1, (os.cpu_count() or 2) - 1)
+    threads_per_worker: int = 1
+    model_name: str = EMBEDDING_MODEL_NAME
+    embedding_backend: str = EMBEDDING_BACKEND_TORCH
+
+    def fingerprint(self) -> dict:
+        """What a resumed run must share with the checkpoint."""
+        stat = os.stat(self.input_path)
+        return {
+            "version": PROGRESS_VERSION,
+            "input": os.path.abspath(self.input_path),
+            "input_size": stat.st_size,
+            "input_mtime_ns": stat.st_mtime_ns,
+            "text_column": self.text_column,
+            "mode": self.mode,
+            "id_column": self.id_column,
+            "title_column": self.title_column,
+            "shard_size": self.shard_size,
+            "model": self.model_name,
+            "embedding_backend": self.embedding_backend,
+        }
+
+
+@dataclass
+class BulkExtractionStats:
+    """Throughput of a run (resumed shards excluded)."""
+
+    postings: int = 0
+    rows: int = 0
+    shards: int = 0
+    skipped_shards: int = 0
+    elapsed_s: float = 0.0
+    parts: list[Path] = field(default_factory=list)
+
+    @property
+    def postings_per_s(self) -> float:
+        return self.postings / self.elapsed_s if self.elapsed_s else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def run_bulk_extraction(
+    config: BulkExtractionConfig,
+    on_progress: Optional[Callable[[BulkExtractionStats, int], None]] = None,
+) -> BulkExtractionStats:
+    """Extract skills from every posting in ``config.input_path``.
+
+    Args:
+        config: Run settings.
+        on_progress: Called with the running stats and the total shard
+            count after each finished shard.
+
+    Returns:
+        Run statistics; ``parts`` lists every part file, resumed ones included.
+
+    Raises:
+        ValueError: If a required column is missing or a pass-through column
+            cannot be cast to its ``JOB_SKILL_MAPPING_SCHEMA`` type.
+    """
+    out_dir = Path(config.output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    progress = _load_progress(out_dir, config.fingerprint())
+    done: set[int] = set(progress["done"])
+
+    source = pq.ParquetFile(config.input_path)
+    n_shards = -(-source.metadata.num_rows // config.shard_size)
+    columns = [c for c in (config.id_column, config.title_column, config.text_column, *_PASSTHROUGH_COLUMNS)
+               if c in source.schema_arrow.names]
+    missing = {config.id_column, config.title_column, config.text_column} - set(columns)
+    if missing:
+        raise ValueError(f"Input is missing columns: {sorted(missing)}")
+    _check_passthrough_types(source.schema_arrow)
+
+    stats = BulkExtractionStats(skipped_shards=len(done))
+    start = time.perf_counter()
+    pending: dict[Future, int] = {}
+    max_pending = 2 * config.workers
+
+    def collect(futures: set[Future]) -> None:
+        for future in futures:
+            shard = pending.pop(future)
+            n_postings, n_rows = future.result()
+            done.add(shard)
+            _save_progress(out_dir, progress, done)
+            stats.postings += n_postings
+            stats.rows += n_rows
+            stats.shards += 1
+            stats.elapsed_s = time.perf_counter() - start
+            if on_progress is not None:
+                on_progress(stats, n_shards)
+
+    context = multiprocessing.get_context("spawn")  # fresh interpreter per worker, no forked model state
+    with ProcessPoolExecutor(
+        max_workers=config.workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(config.model_name, config.embedding_backend, config.threads_per_worker),
+    ) as pool:
+        batches = source.iter_batches(batch_size=config.shard_size, columns=columns)
+        for shard, batch in enumerate(batches):
+            if shard in done:
+                continue
+            if len(pending) >= max_pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+            future = pool.submit(
+                _extract_shard,
+                shard,
+                _cast_passthrough(batch, shard).to_pydict(),
+                config.id_column,
+                config.title_column,
+                config.text_column,
+                config.mode,
+                str(_part_path(out_dir, shard)),
+            )
+            pending[future] = shard
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(finished)
+
+    stats.elapsed_s = time.perf_counter() - start
+    stats.parts = [_part_path(out_dir, shard) for shard in sorted(done)]
+    return stats
+
+
+def merge_parts(parts: list[Path], output_path: str) -> int:
+    """Concatenate part files into one parquet, one part in memory at a time.
+
+    Returns:
+        Number of rows written.
+    """
+    tmp = Path(output_path).with_suffix(".tmp")
+    rows = 0
+    with pq.ParquetWriter(tmp, JOB_SKILL_MAPPING_SCHEMA) as writer:
+        for part in parts:
+            table = pq.read_table(part, schema=JOB_SKILL_MAPPING_SCHEMA)
+            writer.write_table(table)
+            rows += table.num_rows
+    os.replace(tmp, output_path)
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+_extractor = None
+
+
+def _init_worker(model_name: str, embedding_backend: str, threads: int) -> None:
+    """Load one model and one in-process skill index for this worker."""
+    global _extractor
+
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    from ml.src.chromadb_manager import build_memory_skill_index
+    from ml.src.embedding_backend import load_embedding_model
+    from ml.src.skill_extractor import SkillExtractor
+
+    model = load_embedding_model(model_name, embedding_backend)
+    _extractor = SkillExtractor(None, model=model, index=build_memory_skill_index())
+
+
+def _extract_shard(
+    shard: int,
+    columns: dict[str, list],
+    id_column: str,
+    title_column: str,
+    text_column: str,
+    mode: str,
+    part_path: str,
+) -> tuple[int, int]:
+    """Extract one shard and write its part file; returns (postings, rows)."""
+    texts = columns[text_column]
+    n = len(texts)
+    keep = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
+    results = _extractor.extract_batch([(texts[i], mode) for i in keep])
+
+    rows: dict[str, list] = {name: [] for name in JOB_SKILL_MAPPING_SCHEMA.names}
+    for i, matches in zip(keep, results):
+        for match in matches:
+            rows["job_id"].append(str(columns[id_column][i]))
+            rows["job_title"].append(columns[title_column][i])
+            rows["skill"].append(match.skill_name)
+            for name in _PASSTHROUGH_COLUMNS:
+                rows[name].append(columns[name][i] if name in columns else None)
+
+    table = pa.Table.from_pydict(rows, schema=JOB_SKILL_MAPPING_SCHEMA)
+    tmp = Path(part_path).with_suffix(".tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, part_path)
+    return n, table.num_rows
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+def _check_passthrough_types(schema: pa.Schema) -> None:
+    """Fail before any shard runs if a pass-through column has no cast to its output type."""
+    for name in _PASSTHROUGH_COLUMNS:
+        if name not in schema.names:
+            continue
+        source_type = schema.field(name).type
+        target_type = JOB_SKILL_MAPPING_SCHEMA.field(name).type
+        try:
+            pa.array([], type=source_type).cast(target_type)
+        except pa.ArrowException as e:
+            raise ValueError(f"Column {name!r} of type {source_type} cannot be cast to {target_type}") from e
+
+
+def _cast_passthrough(batch: pa.RecordBatch, shard: int) -> pa.RecordBatch:
+    """Cast the pass-through columns of ``batch`` to their output types."""
+    arrays = []
+    for name, array in zip(batch.schema.names, batch.columns):
+        if name in _PASSTHROUGH_COLUMNS:
+            target_type = JOB_SKILL_MAPPING_SCHEMA.field(name).type
+            try:
+                array = array.cast(target_type)
+            except pa.ArrowException as e:
+                raise ValueError(f"Shard {shard}: column {name!r} cannot be cast to {target_type}: {e}") from e
+        arrays.append(array)
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def _part_path(out_dir: Path, shard: int) -> Path:
+    return out_dir / f"part-{shard:06d}.parquet"
+
+
+def _load_progress(out_dir: Path, fingerprint: dict) -> dict:
+    """Checkpoint of a previous run with the same settings, or a fresh one."""
+    path = out_dir / PROGRESS_FILE
+    try:
+        with open(path) as f:
+            progress = json.load(f)
+    except (OSError, ValueError):
+        progress = None
+    if progress is not None and progress.get("fingerprint") == fingerprint:
+        done = [s for s in progress["done"] if _part_path(out_dir, s).exists()]
+        logger.info("Resuming: %d shards already extracted.", len(done))
+        return {"fingerprint": fingerprint, "done": done}
+    if progress is not None:
+        logger.warning("Checkpoint in %s is for different inputs or settings; starting over.", out_dir)
+        for part in out_dir.glob("part-*.parquet"):
+            part.unlink()
+    return {"fingerprint": fingerprint, "done": []}
+
+
+def _save_progress(out_dir: Path, progress: dict, done: set[int]) -> None:
+    progress["done"] = sorted(done)
+    path = out_dir / PROGRESS_FILE
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(progress, f)
+    os.replace(tmp, path)
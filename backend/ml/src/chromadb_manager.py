@@ -2,7 +2,9 @@
 
 import hashlib
 import json
-from typing import Optional
+import logging
+from collections.abc import Mapping
+from typing import Callable, Optional
 
 import chromadb
 import numpy as np
@@ -12,6 +14,7 @@ from sentence_transformers import SentenceTransformer
 from ml.src.config import (
     CHROMA_HOST,
     CHROMA_PORT,
+    COLLECTION_SCHEMA_VERSION,
     EMBEDDING_MODEL_NAME,
     JOB_SKILL_MAPPING_PATH,
     JOB_TITLE_COLLECTION_NAME,
@@ -21,6 +24,13 @@ from ml.src.config import (
     SKILL_FREQUENCY_MIN_RATIO,
     SKILL_TAXONOMY_CATEGORIZED_PATH,
 )
+from ml.src.embedding_store import EmbeddingStore
+from ml.src.job_skill_counts import load_or_build_job_skill_counts
+from ml.src.source_digests import lookup_digest
+from ml.src.timeline import timeline
+from ml.src.vector_index import InMemoryVectorIndex, VectorIndex
+
+logger = logging.getLogger(__name__)
 
 
 def get_chroma_client(
@@ -36,6 +46,119 @@ def get_ephemeral_client() -> chromadb.EphemeralClient:
     return chromadb.EphemeralClient()
 
 
+# ---------------------------------------------------------------------------
+# Incremental Collection Sync
+# ---------------------------------------------------------------------------
+
+def fingerprint_sources(
+    paths: list[str],
+    params: dict,
+    digests: Optional[Mapping[str, str]] = None,
+) -> str:
+    """Content fingerprint of the source files plus the build parameters.
+
+    Args:
+        digests: Already computed file digests (see ``ml.src.source_digests``);
+            files missing from it are hashed here.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps({"schema": COLLECTION_SCHEMA_VERSION, **params}, sort_keys=True).encode())
+    for path in paths:
+        h.update(lookup_digest(path, digests).encode())
+    return h.hexdigest()
+
+
+def row_hash(*parts) -> str:
+    """Short content hash of a single collection row."""
+    h = hashlib.md5()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+def open_collection(
+    client: chromadb.ClientAPI,
+    collection_name: str,
+    fingerprint: str,
+) -> tuple[chromadb.Collection, bool]:
+    """Get or create a collection and report whether its fingerprint is current."""
+    try:
+        collection = client.get_collection(collection_name)
+    except Exception:
+        collection = client.create_collection(
+            name=collection_name,
+            metadata={"hnsw:space": "cosine"},
+        )
+        return collection, False
+    stored = (collection.metadata or {}).get("source_fingerprint")
+    return collection, stored == fingerprint
+
+
+def sync_collection(
+    collection: chromadb.Collection,
+    fingerprint: str,
+    ids: list[str],
+    documents: list[str],
+    metadatas: list[dict],
+    embed: Callable[[list[int]], list[list[float]]],
+    batch_size: int = 500,
+    before_delete: Optional[Callable[[list[str]], None]] = None,
+) -> tuple[int, int]:
+    """Bring a collection in line with the given rows, touching only the diff.
+
+    Every metadata dict must carry a ``row_hash``. Rows whose id is missing
+    from the collection or whose hash changed are embedded (via ``embed``,
+    called with their positions) and upserted; ids no longer present are
+    then deleted. The fingerprint is stored last so an interrupted sync is
+    retried on the next boot.
+
+    Args:
+        before_delete: Called with the ids about to be deleted once every
+            upsert is done, e.g. to move readers off the old rows first.
+
+    Returns:
+        Number of rows upserted and deleted.
+    """
+    with timeline.phase("chroma_get", collection=collection.name):
+        existing = collection.get(include=["metadatas"])
+    existing_hashes = {
+        id_: (meta or {}).get("row_hash")
+        for id_, meta in zip(existing["ids"], existing["metadatas"])
+    }
+
+    wanted = set(ids)
+    stale = [id_ for id_ in existing_hashes if id_ not in wanted]
+    changed = [
+        i for i, id_ in enumerate(ids)
+        if existing_hashes.get(id_) != metadatas[i]["row_hash"]
+    ]
+
+    for start in range(0, len(changed), batch_size):
+        positions = changed[start : start + batch_size]
+        embeddings = embed(positions)
+        with timeline.phase("chroma_upsert", collection=collection.name, rows=len(positions)):
+            collection.upsert(
+                ids=[ids[i] for i in positions],
+                documents=[documents[i] for i in positions],
+                embeddings=embeddings,
+                metadatas=[metadatas[i] for i in positions],
+            )
+
+    if before_delete is not None:
+        before_delete(stale)
+    for start in range(0, len(stale), batch_size):
+        batch = stale[start : start + batch_size]
+        with timeline.phase("chroma_delete", collection=collection.name, rows=len(batch)):
+            collection.delete(ids=batch)
+
+    collection.modify(metadata={"source_fingerprint": fingerprint})
+    logger.info(
+        "Synced collection %s: %d upserted, %d deleted, %d unchanged.",
+        collection.name, len(changed), len(stale), len(ids) - len(changed),
+    )
+    return len(changed), len(stale)
+
+
 # ---------------------------------------------------------------------------
 # Skill Taxonomy Collection
 # ---------------------------------------------------------------------------
@@ -45,17 +168,21 @@ def populate_skill_collection(
     taxonomy_path: Optional[str] = None,
     embeddings_path: Optional[str] = None,
     collection_name: str = SKILL_COLLECTION_NAME,
+    digests: Optional[Mapping[str, str]] = None,
 ) -> chromadb.Collection:
     """Create and populate the skill_taxonomy collection.
 
     Uses pre-computed embeddings from skill_embeddings.parquet so no model
-    inference is needed.
+    inference is needed. The collection is reused as-is when its stored
+    fingerprint matches the source parquet files; otherwise only added,
+    changed or removed skills are synced.
 
     Args:
         client: ChromaDB client.
         taxonomy_path: Path to categorized taxonomy parquet.
         embeddings_path: Path to skill embeddings parquet.
         collection_name: Name for the collection.
+        digests: Source file digests already computed at startup.
 
     Returns:
         The populated ChromaDB collection.
@@ -63,198 +190,201 @@ def populate_skill_collection(
     tax_path = taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH)
     emb_path = embeddings_path or str(SKILL_EMBEDDINGS_PATH)
 
-    taxonomy_df = pd.read_parquet(tax_path)
-    embeddings_df = pd.read_parquet(emb_path)
-
-    # Ensure embeddings have a skill name column (aligned by index with taxonomy)
-    if "skill" not in embeddings_df.columns:
-        embeddings_df.insert(0, "skill", taxonomy_df["skill_name"].values)
-
-    # Build embedding lookup
-    skill_col = "skill"
-    emb_cols = [c for c in embeddings_df.columns if c != skill_col]
-    skill_to_vec = {
-        row[skill_col]: row[emb_cols].values.astype(np.float32).tolist()
-        for _, row in embeddings_df.iterrows()
-    }
-
-    # Delete and recreate collection for idempotency
-    try:
-        client.delete_collection(collection_name)
-    except Exception:
-        pass
-    collection = client.create_collection(
-        name=collection_name,
-        metadata={"hnsw:space": "cosine"},
+    with timeline.phase("fingerprint_sources", collection=collection_name):
+        fingerprint = fingerprint_sources([tax_path, emb_path], {"collection": collection_name}, digests)
+    collection, up_to_date = open_collection(client, collection_name, fingerprint)
+    if up_to_date:
+        logger.info("Collection %s is up to date, skipping rebuild.", collection_name)
+        return collection
+
+    ids, documents, vectors, metadatas = _skill_rows(tax_path, emb_path)
+    sync_collection(
+        collection,
+        fingerprint,
+        ids,
+        documents,
+        metadatas,
+        embed=lambda positions: [vectors[i].tolist() for i in positions],
     )
+    return collection
 
-    # Batch upsert (ChromaDB recommends batches <= 5000)
-    batch_size = 500
-    ids, documents, embeddings, metadatas = [], [], [], []
-
-    for _, row in taxonomy_df.iterrows():
-        skill_name = row["skill_name"]
-        vec = skill_to_vec.get(skill_name)
-        if vec is None:
-            continue
-
-        ids.append(f"skill_{row['skill_id']}")
-        documents.append(skill_name)
-        embeddings.append(vec)
-        metadatas.append({
-            "skill_id": int(row["skill_id"]),
-            "skill_name": skill_name,
-            "category": row.get("category", "tech_skills"),
-            "total_count": int(row.get("total_count", 0)),
-        })
-
-        if len(ids) >= batch_size:
-            collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
-            ids, documents, embeddings, metadatas = [], [], [], []
-
-    if ids:
-        collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
 
-    return collection
+def _skill_rows(
+    tax_path: str,
+    emb_path: str,
+) -> tuple[list[str], list[str], np.ndarray, list[dict]]:
+    """Ids, documents, vectors and metadata of the taxonomy skills with an embedding."""
+    with timeline.phase("read_parquet", path=tax_path):
+        taxonomy_df = pd.read_parquet(tax_path)
+    with timeline.phase("read_parquet", path=emb_path):
+        embeddings_df = pd.read_parquet(emb_path)
+
+    # Embeddings are aligned by index with the taxonomy unless they carry a skill column
+    if "skill" in embeddings_df.columns:
+        emb_names = embeddings_df["skill"].tolist()
+        embeddings_df = embeddings_df.drop(columns=["skill"])
+    else:
+        emb_names = taxonomy_df["skill_name"].tolist()
+    matrix = embeddings_df.to_numpy(dtype=np.float32)
+    emb_row = {name: i for i, name in enumerate(emb_names)}
+
+    ids, documents, rows, metadatas = [], [], [], []
+    with timeline.phase("skill_rows", rows=len(taxonomy_df)):
+        for record in taxonomy_df.to_dict("records"):
+            skill_name = record["skill_name"]
+            row = emb_row.get(skill_name)
+            if row is None:
+                continue
+
+            metadata = {
+                "skill_id": int(record["skill_id"]),
+                "skill_name": skill_name,
+                "category": record.get("category", "tech_skills"),
+                "total_count": int(record.get("total_count", 0)),
+            }
+            metadata["row_hash"] = row_hash(metadata, matrix[row].tobytes())
+
+            ids.append(f"skill_{record['skill_id']}")
+            documents.append(skill_name)
+            rows.append(row)
+            metadatas.append(metadata)
+
+    return ids, documents, matrix[rows], metadatas
 
 
 # ---------------------------------------------------------------------------
 # Job Titles Collection
 # ---------------------------------------------------------------------------
 
-def _normalize_job_title(title: str) -> str:
-    """Basic normalization for job titles."""
-    if not isinstance(title, str):
-        return ""
-    import re
-    t = title.strip().lower()
-    t = re.sub(r"\s+", " ", t)
-    # Remove common suffixes/prefixes that don't affect semantics
-    t = re.sub(r"\s*\(.*?\)\s*", " ", t)  # remove parenthetical
-    return t.strip()
-
-
-def _aggregate_job_skills(
-    job_skill_df: pd.DataFrame,
-    min_jobs_per_title: int = 3,
-    min_skill_ratio: float = SKILL_FREQUENCY_MIN_RATIO,
-    noise_skills: frozenset = NOISE_SKILLS,
-) -> dict[str, dict]:
-    """Aggregate skills per normalized job title.
-
-    Returns dict mapping normalized title -> {
-        "job_count": int,
-        "skills": [{"skill": str, "frequency": float, "count": int}, ...],
-    }
-    """
-    df = job_skill_df.copy()
-    df["job_title_normalized"] = df["job_title"].apply(_normalize_job_title)
-
-    # Filter noise skills
-    df = df[~df["skill"].isin(noise_skills)]
-
-    # Group by title, compute stats
-    title_groups = df.groupby("job_title_normalized")
-    result = {}
-
-    for title, group in title_groups:
-        if not title:
-            continue
-        job_count = group["job_id"].nunique()
-        if job_count < min_jobs_per_title:
-            continue
-
-        skill_counts = group.groupby("skill")["job_id"].nunique()
-        skill_freq = (skill_counts / job_count).sort_values(ascending=False)
-
-        # Filter by minimum frequency
-        skill_freq = skill_freq[skill_freq >= min_skill_ratio]
-        if skill_freq.empty:
-            continue
-
-        skills_list = [
-            {"skill": skill, "frequency": round(float(freq), 4), "count": int(skill_counts[skill])}
-            for skill, freq in skill_freq.head(30).items()
-        ]
-
-        result[title] = {
-            "job_count": job_count,
-            "skills": skills_list,
-        }
-
-    return result
-
-
 def populate_job_title_collection(
     client: chromadb.ClientAPI,
     model: Optional[SentenceTransformer] = None,
     job_skill_path: Optional[str] = None,
     collection_name: str = JOB_TITLE_COLLECTION_NAME,
+    model_name: str = EMBEDDING_MODEL_NAME,
+    embedding_store: Optional[EmbeddingStore] = None,
+    title_skills: Optional[dict[str, dict]] = None,
+    digests: Optional[Mapping[str, str]] = None,
 ) -> tuple[chromadb.Collection, dict[str, dict]]:
     """Create and populate the job_titles collection.
 
+    Titles are only encoded when they are new or their metadata changed;
+    a collection whose fingerprint matches the source parquet is reused
+    without any model inference.
+
     Args:
         client: ChromaDB client.
         model: SentenceTransformer model for encoding titles.
         job_skill_path: Path to job_skill_mapping parquet.
         collection_name: Collection name.
+        model_name: Name of ``model``, part of the collection fingerprint.
+        embedding_store: Optional on-disk store; only titles missing from it
+            are encoded.
+        title_skills: Precomputed title skill profiles; loaded from the
+            saved job-skill counts when omitted.
+        digests: Source file digests already computed at startup.
 
     Returns:
         Tuple of (collection, job_title_skills_dict).
     """
-    if model is None:
-        model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-
     path = job_skill_path or str(JOB_SKILL_MAPPING_PATH)
-    job_skill_df = pd.read_parquet(path)
+    if title_skills is None:
+        title_skills = load_or_build_job_skill_counts(path, digests=digests).title_skills()
+
+    with timeline.phase("fingerprint_sources", collection=collection_name):
+        fingerprint = fingerprint_sources(
+            [path],
+            {
+                "collection": collection_name,
+                "model": model_name,
+                "min_skill_ratio": SKILL_FREQUENCY_MIN_RATIO,
+                "noise_skills": sorted(NOISE_SKILLS),
+            },
+            digests,
+        )
+    collection, up_to_date = open_collection(client, collection_name, fingerprint)
+    if up_to_date:
+        logger.info("Collection %s is up to date, skipping rebuild.", collection_name)
+        return collection, title_skills
 
-    # Aggregate
-    title_skills = _aggregate_job_skills(job_skill_df)
+    ids, titles, metadatas = _job_title_rows(title_skills, model_name)
 
-    # Delete and recreate
-    try:
-        client.delete_collection(collection_name)
-    except Exception:
-        pass
-    collection = client.create_collection(
-        name=collection_name,
-        metadata={"hnsw:space": "cosine"},
-    )
-
-    # Encode and upsert
-    titles = list(title_skills.keys())
-    if not titles:
-        return collection, title_skills
+    def embed(positions: list[int]) -> list[list[float]]:
+        nonlocal model
+        if model is None:
+            model = SentenceTransformer(model_name)
+        batch = [titles[i] for i in positions]
+        with timeline.phase("encode", target=collection_name, texts=len(batch)):
+            if embedding_store is not None:
+                return embedding_store.encode(model, batch, batch_size=64, show_progress_bar=True).tolist()
+            return model.encode(batch, show_progress_bar=True, batch_size=64).tolist()
 
-    title_embeddings = model.encode(titles, show_progress_bar=True, batch_size=64)
+    sync_collection(collection, fingerprint, ids, titles, metadatas, embed=embed)
+    return collection, title_skills
 
-    batch_size = 500
-    ids, documents, embeddings, metadatas = [], [], [], []
 
-    for i, title in enumerate(titles):
-        info = title_skills[title]
+def _job_title_rows(
+    title_skills: dict[str, dict],
+    model_name: str,
+) -> tuple[list[str], list[str], list[dict]]:
+    """Ids, titles and metadata of the job-title rows."""
+    ids, titles, metadatas = [], [], []
+    for title, info in title_skills.items():
         title_hash = hashlib.md5(title.encode()).hexdigest()[:12]
 
         top_skills = [s["skill"] for s in info["skills"][:20]]
 
-        ids.append(f"job_{title_hash}")
-        documents.append(title)
-        embeddings.append(title_embeddings[i].tolist())
-        metadatas.append({
+        metadata = {
             "job_title_normalized": title,
             "job_count": info["job_count"],
             "skill_count": len(info["skills"]),
             "top_skills": json.dumps(top_skills),
-        })
+        }
+        metadata["row_hash"] = row_hash(metadata, model_name)
 
-        if len(ids) >= batch_size:
-            collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
-            ids, documents, embeddings, metadatas = [], [], [], []
+        ids.append(f"job_{title_hash}")
+        titles.append(title)
+        metadatas.append(metadata)
+    return ids, titles, metadatas
 
-    if ids:
-        collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
 
-    return collection, title_skills
+# ---------------------------------------------------------------------------
+# In-process Indexes
+# ---------------------------------------------------------------------------
+
+def build_memory_skill_index(
+    taxonomy_path: Optional[str] = None,
+    embeddings_path: Optional[str] = None,
+    name: str = SKILL_COLLECTION_NAME,
+) -> InMemoryVectorIndex:
+    """In-process replacement for the skill_taxonomy collection."""
+    ids, documents, vectors, metadatas = _skill_rows(
+        taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH),
+        embeddings_path or str(SKILL_EMBEDDINGS_PATH),
+    )
+    return InMemoryVectorIndex(name, ids, vectors, metadatas, documents)
+
+
+def build_memory_job_title_index(
+    title_skills: dict[str, dict],
+    model: Optional[SentenceTransformer] = None,
+    model_name: str = EMBEDDING_MODEL_NAME,
+    embedding_store: Optional[EmbeddingStore] = None,
+    name: str = JOB_TITLE_COLLECTION_NAME,
+) -> InMemoryVectorIndex:
+    """In-process replacement for the job_titles collection.
+
+    Title vectors come from ``embedding_store`` when given, so warm starts
+    do not run the model.
+    """
+    ids, titles, metadatas = _job_title_rows(title_skills, model_name)
+    model = model or SentenceTransformer(model_name)
+    with timeline.phase("encode", target=name, texts=len(titles)):
+        if embedding_store is not None:
+            vectors = embedding_store.encode(model, titles, batch_size=64)
+        else:
+            vectors = model.encode(titles, batch_size=64)
+    return InMemoryVectorIndex(name, ids, vectors, metadatas, titles)
 
 
 # ---------------------------------------------------------------------------
@@ -262,7 +392,7 @@ def populate_job_title_collection(
 # ---------------------------------------------------------------------------
 
 def query_skills(
-    collection: chromadb.Collection,
+    collection: VectorIndex,
     query_embeddings: list[list[float]],
     n_results: int = 5,
 ) -> list[list[dict]]:
@@ -298,7 +428,7 @@ def query_skills(
 
 
 def query_job_titles(
-    collection: chromadb.Collection,
+    collection: VectorIndex,
     query_embedding: list[float],
     n_results: int = 5,
 ) -> list[dict]:
@@ -10,12 +10,19 @@ SKILL_TAXONOMY_CATEGORIZED_PATH = DATA_DIR / "skill_taxonomy_categorized.parquet
 SKILL_EMBEDDINGS_PATH = DATA_DIR / "skill_embeddings.parquet"
 SKILL_SYNONYMS_PATH = DATA_DIR / "skill_synonyms.json"
 JOB_SKILL_MAPPING_PATH = DATA_DIR / "job_skill_mapping.parquet"
+JOB_SKILL_COUNTS_DIR = DATA_DIR / "job_skill_counts"
+EMBEDDING_STORE_DIR = DATA_DIR / "embedding_store"
+EMBEDDING_MODEL_DIR = DATA_DIR / "embedding_models"  # ONNX exports
+SERVING_BUNDLE_DIR = DATA_DIR / "serving_bundle"
+SKILL_COURSE_INDEX_DIR = DATA_DIR / "skill_course_index"
+COURSE_CATALOG_DIR = DATA_DIR / "course_catalog"
 
 # ---------- ChromaDB ----------
 CHROMA_HOST = "chromadb"  # matches service name in docker-compose.yaml
 CHROMA_PORT = 8001
 SKILL_COLLECTION_NAME = "skill_taxonomy"
 JOB_TITLE_COLLECTION_NAME = "job_titles"
+COLLECTION_SCHEMA_VERSION = 1  # bump to force a full resync of every collection
 
 # ---------- Embedding Model ----------
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
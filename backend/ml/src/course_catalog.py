@@ -0,0 +1,487 @@
+"""Columnar course catalog used for roadmap course recommendations.
+
+Courses are held as typed column arrays instead of one dict per course:
+strings packed into a single UTF-8 buffer with offsets, platform/category/
+level dictionary-encoded into small integer codes, and numeric fields as
+NumPy arrays. Candidate courses are re-ranked for a VAK learning style with
+one vectorized expression over those columns; dicts are only built for the
+courses that are returned.
+
+The catalog is ingested from the raw Coursera and Udemy CSVs with the
+PyArrow CSV reader and Arrow compute kernels (no per-row Python loop besides
+hashing Coursera titles into ids) and saved under
+``ml/data/process/course_catalog`` as plain ``.npy`` columns, keyed by a
+fingerprint of the CSVs. Later boots memory-map the saved columns instead of
+parsing the CSVs again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Sequence
+from functools import cached_property
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+
+from ml.src.chromadb_manager import fingerprint_sources
+from ml.src.config import COURSE_CATALOG_DIR
+from ml.src.timeline import timeline
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 1
+
+PLATFORM_COURSERA = "Coursera"
+PLATFORM_UDEMY = "Udemy"
+
+MIN_COURSE_SIMILARITY = 0.25  # hits below this are never recommended
+MAX_SKILLS_PER_COURSE = 10  # Coursera skills kept in the embedded skill text
+
+_STRING_COLUMNS = ("ids", "titles", "urls", "skill_texts")
+_CODE_COLUMNS = (("platform_codes", "platforms"), ("category_codes", "categories"), ("level_codes", "levels"))
+_NUMERIC_COLUMNS = ("subscribers", "reviews", "content_hours")
+_COURSE_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("title", pa.string()),
+    ("platform", pa.string()),
+    ("url", pa.string()),
+    ("category", pa.string()),
+    ("skill_text", pa.string()),
+    ("level", pa.string()),
+    ("subscribers", pa.int64()),
+    ("reviews", pa.int64()),
+    ("content_hours", pa.float64()),
+])
+
+_build_lock = threading.Lock()  # one ingestion at a time per process
+
+
+class StringColumn:
+    """Strings packed into one UTF-8 buffer; string ``i`` is ``data[offsets[i]:offsets[i + 1]]``."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_list(cls, values: Sequence[str]) -> "StringColumn":
+        encoded = [v.encode() for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    @classmethod
+    def from_arrow(cls, values: pa.Array | pa.ChunkedArray) -> "StringColumn":
+        """Zero-copy view of a null-free Arrow string array."""
+        values = pc.cast(values, pa.large_string())
+        if isinstance(values, pa.ChunkedArray):
+            values = values.combine_chunks()
+        if len(values) == 0:
+            return cls.from_list([])
+        _, offsets_buf, data_buf = values.buffers()
+        offsets = np.frombuffer(offsets_buf, dtype=np.int64)[values.offset:values.offset + len(values) + 1]
+        data = np.frombuffer(data_buf, dtype=np.uint8) if data_buf is not None else np.zeros(0, dtype=np.uint8)
+        return cls(data[offsets[0]:offsets[-1]], offsets - offsets[0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode()
+
+    def tolist(self) -> list[str]:
+        buf = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        return [buf[a:b].decode() for a, b in zip(offsets[:-1], offsets[1:])]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.offsets.nbytes
+
+
+class CourseCatalog:
+    """Course metadata as column arrays, one position per course.
+
+    Attributes:
+        ids: Course id per position.
+        titles, urls, skill_texts: String columns (``skill_text`` is what
+            a course is embedded from).
+        platform_codes, category_codes, level_codes: Codes into
+            ``platforms``, ``categories`` and ``levels``.
+        subscribers, reviews: ``int64`` counts.
+        content_hours: ``float64`` video hours (0 when unknown).
+    """
+
+    def __init__(
+        self,
+        ids: StringColumn,
+        titles: StringColumn,
+        urls: StringColumn,
+        skill_texts: StringColumn,
+        platform_codes: np.ndarray,
+        platforms: list[str],
+        category_codes: np.ndarray,
+        categories: list[str],
+        level_codes: np.ndarray,
+        levels: list[str],
+        subscribers: np.ndarray,
+        reviews: np.ndarray,
+        content_hours: np.ndarray,
+    ) -> None:
+        self.ids = ids
+        self.titles = titles
+        self.urls = urls
+        self.skill_texts = skill_texts
+        self.platform_codes = platform_codes
+        self.platforms = platforms
+        self.category_codes = category_codes
+        self.categories = categories
+        self.level_codes = level_codes
+        self.levels = levels
+        self.subscribers = subscribers
+        self.reviews = reviews
+        self.content_hours = content_hours
+
+    @classmethod
+    def from_courses(cls, courses: Sequence[dict]) -> "CourseCatalog":
+        """Catalog of course dicts (keys as in ``_COURSE_SCHEMA``); the first course per id wins."""
+        return cls.from_table(pa.Table.from_pylist(list(courses), schema=_COURSE_SCHEMA))
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> "CourseCatalog":
+        """Catalog of an Arrow table with the ``_COURSE_SCHEMA`` columns; the first row per id wins."""
+        table = _drop_duplicate_ids(table)
+        platform_codes, platforms = _encode(table["platform"], np.int8)
+        category_codes, categories = _encode(table["category"], np.int32)
+        level_codes, levels = _encode(table["level"], np.int16)
+        return cls(
+            ids=StringColumn.from_arrow(table["id"]),
+            titles=StringColumn.from_arrow(table["title"]),
+            urls=StringColumn.from_arrow(table["url"]),
+            skill_texts=StringColumn.from_arrow(table["skill_text"]),
+            platform_codes=platform_codes,
+            platforms=platforms,
+            category_codes=category_codes,
+            categories=categories,
+            level_codes=level_codes,
+            levels=levels,
+            subscribers=table["subscribers"].to_numpy(),
+            reviews=table["reviews"].to_numpy(),
+            content_hours=table["content_hours"].to_numpy(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+        columns = (self.ids, self.titles, self.urls, self.skill_texts)
+        arrays = (self.platform_codes, self.category_codes, self.level_codes,
+                  self.subscribers, self.reviews, self.content_hours)
+        return sum(c.nbytes for c in columns) + sum(a.nbytes for a in arrays)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def position(self, course_id: str) -> int:
+        """Position of ``course_id``, or -1."""
+        return self._positions.get(course_id, -1)
+
+    def vak_scores(self, positions: np.ndarray, similarities: np.ndarray, vak_style: Optional[str]) -> np.ndarray:
+        """Similarity plus learning-style and social-proof boosts, rounded to 3 decimals.
+
+        Visual learners get video-heavy courses (Udemy, > 5 hours) boosted,
+        auditory ones lecture-format Coursera courses, kinesthetic ones long
+        (> 10 hours), popular courses. With a style set, popular courses
+        (> 10k / > 50k subscribers) get a small social-proof boost as well.
+        """
+        similarities = np.asarray(similarities, dtype=np.float64)
+        if not vak_style:
+            return np.round(similarities, 3)
+
+        hours = self.content_hours[positions]
+        subscribers = self.subscribers[positions]
+        platform = self.platform_codes[positions]
+        boost = np.zeros(len(positions), dtype=np.float64)
+        if vak_style == "visual":
+            boost += 0.03 * (platform == self._platform_code(PLATFORM_UDEMY))
+            boost += 0.02 * (hours > 5)
+        elif vak_style == "auditory":
+            boost += 0.03 * (platform == self._platform_code(PLATFORM_COURSERA))
+        elif vak_style == "kinesthetic":
+            boost += 0.03 * (hours > 10)
+            boost += 0.02 * (subscribers > 10000)
+        boost += np.where(subscribers > 50000, 0.02, np.where(subscribers > 10000, 0.01, 0.0))
+        return np.round(similarities + boost, 3)
+
+    def rank(
+        self,
+        positions: np.ndarray,
+        similarities: np.ndarray,
+        n: int,
+        vak_style: Optional[str] = None,
+    ) -> list[dict]:
+        """Top ``n`` of the candidate courses by VAK-boosted score.
+
+        Args:
+            positions: Candidate positions, most similar first.
+            similarities: Cosine similarity per candidate.
+            n: Courses to return.
+            vak_style: Learning style (visual, auditory, kinesthetic) or None.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        similarities = np.asarray(similarities, dtype=np.float64)
+        keep = similarities >= MIN_COURSE_SIMILARITY
+        positions, similarities = positions[keep], similarities[keep]
+
+        scores = self.vak_scores(positions, similarities, vak_style)
+        order = np.argsort(-scores, kind="stable")[:n]  # ties keep similarity order
+        return [self.course(int(positions[i]), float(scores[i])) for i in order]
+
+    def course(self, pos: int, match_score: float) -> dict:
+        """Recommendation dict for the course at ``pos``."""
+        return {
+            "title": self.titles[pos],
+            "platform": self.platforms[self.platform_codes[pos]],
+            "url": self.urls[pos],
+            "category": self.categories[self.category_codes[pos]],
+            "level": self.levels[self.level_codes[pos]],
+            "match_score": match_score,
+            "subscribers": int(self.subscribers[pos]),
+            "reviews": int(self.reviews[pos]),
+            "content_hours": float(self.content_hours[pos]),
+        }
+
+    def save(self, directory: Optional[Path] = None, source_fingerprint: Optional[str] = None) -> Path:
+        """Write the columns atomically (a temp directory renamed into place)."""
+        root = Path(directory or COURSE_CATALOG_DIR)
+        tmp = root.with_name(root.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for name in _STRING_COLUMNS:
+            column = getattr(self, name)
+            np.save(tmp / f"{name}.data.npy", column.data)
+            np.save(tmp / f"{name}.offsets.npy", column.offsets)
+        for name, _ in _CODE_COLUMNS:
+            np.save(tmp / f"{name}.npy", getattr(self, name))
+        for name in _NUMERIC_COLUMNS:
+            np.save(tmp / f"{name}.npy", getattr(self, name))
+        with open(tmp / "manifest.json", "w") as f:
+            json.dump({
+                "version": CATALOG_VERSION,
+                "source_fingerprint": source_fingerprint,
+                "n_courses": len(self),
+                **{values: getattr(self, values) for _, values in _CODE_COLUMNS},
+            }, f, indent=2)
+        shutil.rmtree(root, ignore_errors=True)
+        os.replace(tmp, root)
+        return root
+
+    @classmethod
+    def load(
+        cls,
+        directory: Optional[Path] = None,
+        source_fingerprint: Optional[str] = None,
+    ) -> Optional["CourseCatalog"]:
+        """Memory-map a saved catalog, or None if missing, of another format version or built from other sources."""
+        root = Path(directory or COURSE_CATALOG_DIR)
+        try:
+            with open(root / "manifest.json") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get("version") != CATALOG_VERSION:
+            return None
+        if source_fingerprint is not None and manifest.get("source_fingerprint") != source_fingerprint:
+            return None
+
+        def load(name: str) -> np.ndarray:
+            return np.load(root / f"{name}.npy", mmap_mode="r")
+
+        return cls(
+            **{
+                name: StringColumn(load(f"{name}.data"), load(f"{name}.offsets"))
+                for name in _STRING_COLUMNS
+            },
+            **{codes: load(codes) for codes, _ in _CODE_COLUMNS},
+            **{values: manifest[values] for _, values in _CODE_COLUMNS},
+            **{name: load(name) for name in _NUMERIC_COLUMNS},
+        )
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _positions(self) -> dict[str, int]:
+        return {cid: i for i, cid in enumerate(self.ids.tolist())}
+
+    def _platform_code(self, platform: str) -> int:
+        return self.platforms.index(platform) if platform in self.platforms else -1
+
+
+def read_course_csvs(coursera_path: Path, udemy_path: Path) -> CourseCatalog:
+    """Ingest the raw Coursera and Udemy CSVs into a catalog.
+
+    Coursera courses without a name or skills and Udemy courses without a
+    title are skipped; missing text fields are empty and missing counts 0.
+    A source that is absent or fails to parse is logged and left out.
+    """
+    tables = []
+    for path, to_courses in ((coursera_path, _coursera_courses), (udemy_path, _udemy_courses)):
+        if not Path(path).exists():
+            continue
+        try:
+            with timeline.phase("read_csv", path=str(path)) as info:
+                raw = pa_csv.read_csv(
+                    path,
+                    parse_options=pa_csv.ParseOptions(
+                        newlines_in_values=True,
+                        invalid_row_handler=lambda row: "skip",
+                    ),
+                )
+                info["rows"] = raw.num_rows
+            with timeline.phase("normalize_courses", path=str(path)):
+                table = to_courses(raw)
+            logger.info("Loaded %d courses from %s.", table.num_rows, Path(path).name)
+            tables.append(table)
+        except Exception as e:
+            logger.error("Failed to load courses from %s: %s", path, e)
+    if not tables:
+        return CourseCatalog.from_table(_COURSE_SCHEMA.empty_table())
+    return CourseCatalog.from_table(pa.concat_tables(tables))
+
+
+def load_or_build_course_catalog(
+    coursera_path: Path,
+    udemy_path: Path,
+    directory: Optional[Path] = None,
+) -> CourseCatalog:
+    """Load the saved catalog, re-ingesting the CSVs if they changed."""
+    paths = [str(p) for p in (coursera_path, udemy_path) if Path(p).exists()]
+    fingerprint = fingerprint_sources(paths, {"course_catalog": CATALOG_VERSION, "sources": paths})
+
+    with _build_lock:
+        with timeline.phase("course_catalog_load") as info:
+            catalog = CourseCatalog.load(directory, source_fingerprint=fingerprint)
+            info["hit"] = catalog is not None
+        if catalog is not None:
+            return catalog
+
+        logger.info("Course catalog missing or stale, ingesting %s.", ", ".join(paths) or "nothing")
+        with timeline.phase("course_catalog_build") as info:
+            catalog = read_course_csvs(coursera_path, udemy_path)
+            info["rows"] = len(catalog)
+        if len(catalog):
+            try:
+                catalog.save(directory, source_fingerprint=fingerprint)
+            except OSError:
+                logger.exception("Could not save the course catalog; it will be re-ingested next start.")
+        return catalog
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+def _coursera_courses(raw: pa.Table) -> pa.Table:
+    """Coursera rows as courses; the skill text is the first few listed skills."""
+    names = pc.utf8_trim_whitespace(_text(raw, "name"))
+
+    # Split "a, b, ,c" into trimmed, non-empty skills and keep the first few per row
+    lists = pc.split_pattern(_text(raw, "skills").combine_chunks(), ",")
+    skills = pc.utf8_trim_whitespace(pc.list_flatten(lists))
+    rows = pc.list_parent_indices(lists).to_numpy()
+    keep = pc.greater(pc.utf8_length(skills), 0).to_numpy(zero_copy_only=False)
+    skills, rows = skills.filter(pa.array(keep)), rows[keep]
+    counts = np.bincount(rows, minlength=raw.num_rows)
+    starts = np.cumsum(counts) - counts
+    first = (np.arange(len(rows)) - starts[rows]) < MAX_SKILLS_PER_COURSE
+    kept_counts = np.minimum(counts, MAX_SKILLS_PER_COURSE)
+    offsets = np.concatenate([[0], np.cumsum(kept_counts)]).astype(np.int32)
+    skill_texts = pc.binary_join(pa.ListArray.from_arrays(pa.array(offsets), skills.filter(pa.array(first))), ", ")
+
+    valid = pa.array((counts > 0) & (pc.utf8_length(names).to_numpy(zero_copy_only=False) > 0))
+    names = names.filter(valid)
+    n = len(names)
+    ids = [f"coursera_{hashlib.md5(name.encode()).hexdigest()[:10]}" for name in names.to_pylist()]
+    return pa.table({
+        "id": pa.array(ids, pa.string()),
+        "title": names,
+        "platform": pa.repeat(PLATFORM_COURSERA, n),
+        "url": _text(raw, "url").filter(valid),
+        "category": _text(raw, "category").filter(valid),
+        "skill_text": skill_texts.filter(valid),
+        "level": pa.repeat("All Levels", n),
+        "subscribers": np.zeros(n, dtype=np.int64),
+        "reviews": np.zeros(n, dtype=np.int64),
+        "content_hours": np.zeros(n, dtype=np.float64),
+    }, schema=_COURSE_SCHEMA)
+
+
+def _udemy_courses(raw: pa.Table) -> pa.Table:
+    """Udemy rows as courses; title and subject stand in for the missing skill list."""
+    titles = pc.utf8_trim_whitespace(_text(raw, "course_title"))
+    valid = pc.greater(pc.utf8_length(titles), 0)
+    raw, titles = raw.filter(valid), titles.filter(valid)
+    subjects = _text(raw, "subject")
+
+    if "course_id" in raw.column_names:
+        ids = pc.binary_join_element_wise("udemy_", _text(raw, "course_id"), "")
+    else:
+        ids = pa.array(
+            [f"udemy_{hashlib.md5(t.encode()).hexdigest()[:10]}" for t in titles.to_pylist()], pa.string()
+        )
+    return pa.table({
+        "id": ids,
+        "title": titles,
+        "platform": pa.repeat(PLATFORM_UDEMY, raw.num_rows),
+        "url": _text(raw, "url"),
+        "category": subjects,
+        "skill_text": pc.binary_join_element_wise(titles, subjects, " "),
+        "level": _text(raw, "level", "All Levels"),
+        "subscribers": _number(raw, "num_subscribers", pa.int64()),
+        "reviews": _number(raw, "num_reviews", pa.int64()),
+        "content_hours": _number(raw, "content_duration", pa.float64()),
+    }, schema=_COURSE_SCHEMA)
+
+
+def _text(raw: pa.Table, name: str, default: str = "") -> pa.ChunkedArray:
+    """Column ``name`` as strings, ``default`` where it is null or missing."""
+    if name not in raw.column_names:
+        return pa.chunked_array([pa.repeat(default, raw.num_rows)])
+    return pc.fill_null(pc.cast(raw[name], pa.string()), default)
+
+
+def _number(raw: pa.Table, name: str, dtype: pa.DataType) -> pa.ChunkedArray:
+    """Numeric column ``name`` (truncated for integers), 0 where it is null or missing."""
+    if name not in raw.column_names:
+        return pa.chunked_array([pa.repeat(pa.scalar(0, dtype), raw.num_rows)])
+    return pc.fill_null(pc.cast(raw[name], dtype, safe=False), pa.scalar(0, dtype))
+
+
+def _drop_duplicate_ids(table: pa.Table) -> pa.Table:
+    """Keep the first row per course id, in order."""
+    rows = table.append_column("_row", pa.array(np.arange(table.num_rows)))
+    first = rows.group_by("id", use_threads=False).aggregate([("_row", "min")])["_row_min"]
+    if len(first) == table.num_rows:
+        return table
+    return table.take(np.sort(first.to_numpy()))
+
+
+def _encode(values: pa.ChunkedArray, dtype) -> tuple[np.ndarray, list[str]]:
+    """Dictionary-encode ``values`` into codes and the distinct values (first-seen order)."""
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    encoded = pc.dictionary_encode(values)
+    return encoded.indices.to_numpy(zero_copy_only=False).astype(dtype), encoded.dictionary.to_pylist()
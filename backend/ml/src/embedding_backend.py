@@ -0,0 +1,128 @@
+"""Loading the embedding model on PyTorch or ONNX Runtime.
+
+``torch`` is the stock ``SentenceTransformer``. ``onnx`` runs the same
+weights through ONNX Runtime, and ``onnx-int8`` adds dynamic int8
+quantization of the linear layers, which is the cheapest option on CPU.
+Both ONNX variants are exported once from the configured model into
+``ml/data/process/embedding_models`` and loaded from there afterwards.
+
+Vectors from different backends are close but not bit-identical, so the
+embedding store and the job-title collection are keyed by
+``embedding_model_id`` rather than by the bare model name. Run
+``scripts.check_embedding_parity`` before switching backends to confirm the
+similarity thresholds still hold.
+"""
+
+import logging
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+from sentence_transformers import SentenceTransformer
+
+from ml.src.config import EMBEDDING_MODEL_DIR, EMBEDDING_MODEL_NAME
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKEND_TORCH = "torch"
+EMBEDDING_BACKEND_ONNX = "onnx"
+EMBEDDING_BACKEND_ONNX_INT8 = "onnx-int8"
+EMBEDDING_BACKENDS = (EMBEDDING_BACKEND_TORCH, EMBEDDING_BACKEND_ONNX, EMBEDDING_BACKEND_ONNX_INT8)
+
+# Dynamic quantization preset; "avx2" runs on any recent x86-64 CPU. Use
+# "avx512_vnni" on servers that support it, "arm64" on ARM hosts.
+DEFAULT_QUANTIZATION_CONFIG = "avx2"
+
+_ONNX_FILE = "onnx/model.onnx"
+
+_export_lock = threading.Lock()
+
+
+def embedding_model_id(model_name: str, backend: str = EMBEDDING_BACKEND_TORCH) -> str:
+    """Identity of the vectors ``backend`` produces for ``model_name``.
+
+    The PyTorch backend keeps the bare model name so existing embedding
+    stores and collections stay valid.
+    """
+    if backend == EMBEDDING_BACKEND_TORCH:
+        return model_name
+    return f"{model_name}@{backend}"
+
+
+def load_embedding_model(
+    model_name: str = EMBEDDING_MODEL_NAME,
+    backend: str = EMBEDDING_BACKEND_TORCH,
+    model_dir: Optional[Path] = None,
+    quantization_config: str = DEFAULT_QUANTIZATION_CONFIG,
+) -> SentenceTransformer:
+    """Load ``model_name`` on the given backend, exporting it on first use.
+
+    Args:
+        model_name: Hugging Face model name or local path.
+        backend: One of ``EMBEDDING_BACKENDS``.
+        model_dir: Where exported ONNX models are cached.
+        quantization_config: Preset for ``onnx-int8``.
+
+    Raises:
+        ValueError: If ``backend`` is unknown.
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {EMBEDDING_BACKENDS}")
+    if backend == EMBEDDING_BACKEND_TORCH:
+        return SentenceTransformer(model_name)
+
+    path = export_onnx_model(model_name, model_dir)
+    if backend == EMBEDDING_BACKEND_ONNX:
+        return SentenceTransformer(str(path), backend="onnx", model_kwargs={"file_name": _ONNX_FILE})
+
+    file_name = export_quantized_onnx_model(model_name, model_dir, quantization_config)
+    return SentenceTransformer(str(path), backend="onnx", model_kwargs={"file_name": file_name})
+
+
+def export_onnx_model(model_name: str, model_dir: Optional[Path] = None) -> Path:
+    """Export ``model_name`` to ONNX once and return the local model directory."""
+    path = _model_path(model_name, model_dir)
+    with _export_lock:
+        if (path / _ONNX_FILE).exists():
+            return path
+        logger.info("Exporting %s to ONNX at %s...", model_name, path)
+        tmp = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        SentenceTransformer(model_name, backend="onnx").save(str(tmp))
+        shutil.rmtree(path, ignore_errors=True)
+        tmp.rename(path)
+    return path
+
+
+def export_quantized_onnx_model(
+    model_name: str,
+    model_dir: Optional[Path] = None,
+    quantization_config: str = DEFAULT_QUANTIZATION_CONFIG,
+) -> str:
+    """Write a dynamically int8-quantized copy next to the ONNX export.
+
+    Returns:
+        The quantized file name relative to the model directory, for
+        ``model_kwargs={"file_name": ...}``.
+    """
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    path = export_onnx_model(model_name, model_dir)
+    file_name = f"onnx/model_qint8_{quantization_config}.onnx"
+    with _export_lock:
+        if not (path / file_name).exists():
+            logger.info("Quantizing %s (%s)...", model_name, quantization_config)
+            model = SentenceTransformer(str(path), backend="onnx", model_kwargs={"file_name": _ONNX_FILE})
+            export_dynamic_quantized_onnx_model(model, quantization_config, str(path))
+    return file_name
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+def _model_path(model_name: str, model_dir: Optional[Path]) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+    return Path(model_dir or EMBEDDING_MODEL_DIR) / slug
@@ -0,0 +1,226 @@
+"""Cross-request micro-batching for SentenceTransformer inference.
+
+Concurrent requests each encode a handful of texts. ``EmbeddingBatcher``
+queues those calls, and a single worker thread merges everything that
+arrives within a short window (or until ``max_batch_size`` texts) into one
+forward pass, then hands every caller its own rows back.
+
+``EmbeddingBatcher.encode`` mirrors ``SentenceTransformer.encode`` so it can
+sit between the embedding cache and the model.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_MS = 5.0
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_TIMEOUT_S = 60.0
+
+
+@dataclass
+class _Request:
+    texts: list[str]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingBatcher:
+    """Merge concurrent ``encode`` calls into batched forward passes.
+
+    Args:
+        model: SentenceTransformer (or anything with a compatible ``encode``).
+        window_ms: How long the worker waits for more requests after the
+            first one arrives.
+        max_batch_size: Texts per forward pass; a batch is dispatched early
+            once it is full. Calls larger than this go straight to the model.
+        timeout_s: Longest a caller waits for its batch before giving up.
+    """
+
+    def __init__(
+        self,
+        model,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+    ) -> None:
+        self.model = model
+        self.window_s = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.timeout_s = timeout_s
+
+        self._queue: "queue.Queue[_Request | None]" = queue.Queue()
+        self._carry: _Request | None = None  # request that did not fit the last batch
+        self._lock = threading.Lock()
+        # Guards _closed together with enqueueing, so nothing is queued after the stop sentinel
+        self._enqueue_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._texts = 0
+        self._max_batch_seen = 0
+        self._wait_s = 0.0
+        self._bypassed = 0
+        self._closed = False
+
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def encode(
+        self,
+        sentences: Union[str, list[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        """Embed ``sentences`` as part of a shared batch.
+
+        Large calls and calls with extra encode options go straight to the
+        model.
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        request = None
+        if not kwargs and len(texts) <= self.max_batch_size:
+            with self._enqueue_lock:
+                if not self._closed:
+                    request = _Request(texts)
+                    self._queue.put(request)
+        if request is None:
+            with self._lock:
+                self._bypassed += 1
+            return self.model.encode(
+                sentences, batch_size=batch_size, show_progress_bar=show_progress_bar, **kwargs
+            )
+
+        result = request.future.result(timeout=self.timeout_s)
+        return result[0] if single else result
+
+    def stats(self) -> dict:
+        """Queue depth and batch-size metrics."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize() + (self._carry is not None),
+                "batches": self._batches,
+                "requests": self._requests,
+                "texts": self._texts,
+                "mean_batch_size": round(self._texts / self._batches, 2) if self._batches else 0.0,
+                "max_batch_size_seen": self._max_batch_seen,
+                "mean_requests_per_batch": round(self._requests / self._batches, 2) if self._batches else 0.0,
+                "mean_queue_wait_ms": round(self._wait_s / self._requests * 1000, 3) if self._requests else 0.0,
+                "bypassed": self._bypassed,
+                "window_ms": self.window_s * 1000,
+                "max_batch_size": self.max_batch_size,
+            }
+
+    def close(self) -> None:
+        """Stop the worker after the queued requests are served.
+
+        Later ``encode`` calls go straight to the model.
+        """
+        with self._enqueue_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join(timeout=5)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            self._serve()
+        finally:
+            # Whatever stopped the worker, nothing may wait on it any more
+            with self._enqueue_lock:
+                self._closed = True
+            self._fail_pending()
+
+    def _serve(self) -> None:
+        while True:
+            first = self._carry or self._queue.get()
+            self._carry = None
+            if first is None:
+                return
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.perf_counter() + self.window_s
+            stop = False
+            while size < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                if size + len(request.texts) > self.max_batch_size:
+                    self._carry = request
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._dispatch(batch)
+            if stop:
+                if self._carry is not None:
+                    self._dispatch([self._carry])
+                    self._carry = None
+                return
+
+    def _fail_pending(self) -> None:
+        """Fail requests left in the queue once the worker is gone."""
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for request in pending:
+            if request is not None and not request.future.done():
+                request.future.set_exception(RuntimeError("EmbeddingBatcher is closed"))
+
+    def _dispatch(self, batch: list[_Request]) -> None:
+        """Run one forward pass for ``batch`` and resolve its futures."""
+        started = time.perf_counter()
+        unique = list(dict.fromkeys(t for r in batch for t in r.texts))
+        try:
+            encoded = np.asarray(
+                self.model.encode(unique, batch_size=self.max_batch_size, show_progress_bar=False)
+            )
+        except Exception as exc:
+            logger.exception("Batched encode of %d texts failed.", len(unique))
+            for r in batch:
+                r.future.set_exception(exc)
+            return
+
+        row = {t: i for i, t in enumerate(unique)}
+        for r in batch:
+            r.future.set_result(encoded[[row[t] for t in r.texts]])
+
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._texts += len(unique)
+            self._max_batch_seen = max(self._max_batch_seen, len(unique))
+            self._wait_s += sum(started - r.enqueued_at for r in batch)
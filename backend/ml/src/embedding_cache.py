@@ -0,0 +1,153 @@
+"""Two-tier cache in front of a SentenceTransformer's ``encode``.
+
+Tier 1 is a bounded in-process LRU; tier 2 is an optional ``EmbeddingStore``
+on disk that survives restarts. Texts are keyed by their whitespace-normalized
+form (the store adds the model name), and only texts missing from both tiers
+reach the model.
+
+The disk tier is read-only here: it holds the catalog, taxonomy and job-title
+texts written when those are indexed, and free-text request sentences are
+only kept in the LRU. That keeps the store bounded by the reference data and
+keeps disk writes off the request path.
+
+``EmbeddingCache.encode`` accepts the same call shapes as
+``SentenceTransformer.encode`` (a string or a list of strings), so services
+can take the cache wherever they take the model.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+import numpy as np
+
+from ml.src.embedding_store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def normalize_cache_text(text: str) -> str:
+    """Cache key text: surrounding whitespace stripped, inner runs collapsed."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class EmbeddingCache:
+    """LRU + on-disk embedding cache wrapping a model's ``encode``.
+
+    Args:
+        model: SentenceTransformer (or anything with a compatible ``encode``).
+        store: Optional disk tier (looked up, never written).
+        max_entries: Capacity of the in-process LRU tier.
+    """
+
+    def __init__(
+        self,
+        model,
+        store: Optional[EmbeddingStore] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.model = model
+        self.store = store
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._lru: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def encode(
+        self,
+        sentences: Union[str, list[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        """Embed ``sentences``, calling the model only for uncached texts.
+
+        Returns a 1-D vector for a single string and a 2-D array otherwise,
+        like ``SentenceTransformer.encode``. Calls with extra encode options
+        (e.g. ``normalize_embeddings``) bypass the cache.
+        """
+        if kwargs:
+            return self.model.encode(
+                sentences, batch_size=batch_size, show_progress_bar=show_progress_bar, **kwargs
+            )
+
+        single = isinstance(sentences, str)
+        texts = [normalize_cache_text(t) for t in ([sentences] if single else sentences)]
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        vectors: dict[str, np.ndarray] = {}
+        with self._lock:
+            for text in texts:
+                vec = self._lru.get(text)
+                if vec is not None:
+                    self._lru.move_to_end(text)
+                    vectors[text] = vec
+                    self.hits += 1
+
+        missing = [t for t in dict.fromkeys(texts) if t not in vectors]
+        if missing and self.store is not None:
+            found, stored = self.store.lookup(missing)
+            for i in np.flatnonzero(found):
+                vectors[missing[i]] = np.asarray(stored[i], dtype=np.float32)
+            self._count(disk_hits=int(found.sum()))
+            self._remember({missing[i]: vectors[missing[i]] for i in np.flatnonzero(found)})
+            missing = [t for t, hit in zip(missing, found) if not hit]
+
+        if missing:
+            encoded = np.asarray(
+                self.model.encode(missing, batch_size=batch_size, show_progress_bar=show_progress_bar),
+                dtype=np.float32,
+            )
+            new = dict(zip(missing, encoded))
+            vectors.update(new)
+            self._count(misses=len(missing))
+            self._remember(new)
+
+        result = np.stack([vectors[t] for t in texts])
+        return result[0] if single else result
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "disk_entries": len(self.store) if self.store is not None else None,
+            }
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _count(self, disk_hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            self.disk_hits += disk_hits
+            self.misses += misses
+
+    def _remember(self, vectors: dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for text, vec in vectors.items():
+                self._lru[text] = vec
+                self._lru.move_to_end(text)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+                self.evictions += 1
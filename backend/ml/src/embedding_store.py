@@ -0,0 +1,232 @@
+"""Persistent, content-addressed store of text embeddings.
+
+Vectors are keyed by a hash of (model name, text) and kept per model under
+``ml/data/process/embedding_store`` as append-only segments: each ``flush``
+writes the pending vectors as a new pair of ``.npy`` files (sorted hex keys
+and the matching float32 vector matrix) instead of rewriting the store.
+Segments are merged size-tiered (a segment is folded into the one before it
+once that one is no more than twice its size), so there are O(log n) of them
+and each vector is rewritten O(log n) times. Segments are memory-mapped on
+load, so a warm start reads only the pages it needs and never calls the
+model for texts it has already seen.
+"""
+
+import glob
+import hashlib
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from ml.src.config import EMBEDDING_STORE_DIR
+from ml.src.timeline import timeline
+
+_KEY_DTYPE = "S32"  # hex blake2b digest, 16 bytes
+_SEGMENT_NAME = re.compile(r"\.(\d+)\.keys\.npy$")
+STORE_MISS_PHASE = "embedding_store_miss"  # timeline phase of every model call made by ``encode``
+
+
+@dataclass
+class _Segment:
+    seq: int  # 0 is the single-file layout written by older versions
+    keys: np.ndarray  # sorted, unique
+    vectors: np.ndarray
+
+
+class EmbeddingStore:
+    """Content-addressed ``(model name, text) -> float32 vector`` store.
+
+    Args:
+        model_name: Embedding model the stored vectors belong to.
+        directory: Directory holding the store files.
+    """
+
+    def __init__(self, model_name: str, directory: Optional[Path] = None) -> None:
+        self.model_name = model_name
+        self.directory = Path(directory or EMBEDDING_STORE_DIR)
+        self._slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+
+        self._lock = threading.Lock()  # guards the in-memory state; held only briefly
+        self._flush_lock = threading.Lock()  # one writer at a time
+        self._segments: list[_Segment] = []  # oldest first
+        self._pending: dict[bytes, np.ndarray] = {}
+        self._flushing: dict[bytes, np.ndarray] = {}  # being written; still served
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def key(self, text: str) -> bytes:
+        """Content address of ``text`` for this store's model."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model_name.encode())
+        digest.update(b"\0")
+        digest.update(text.encode())
+        return digest.hexdigest().encode()
+
+    def lookup(self, texts: list[str]) -> tuple[np.ndarray, list[Optional[np.ndarray]]]:
+        """Look up stored vectors.
+
+        Returns a boolean ``found`` mask and a list with the vector for each
+        found text (``None`` for misses).
+        """
+        keys = [self.key(t) for t in texts]
+        found = np.zeros(len(keys), dtype=bool)
+        vectors: list[Optional[np.ndarray]] = [None] * len(keys)
+
+        with self._lock:
+            segments = list(self._segments)
+            for i, k in enumerate(keys):
+                vec = self._pending.get(k)
+                if vec is None:
+                    vec = self._flushing.get(k)
+                if vec is not None:
+                    vectors[i] = vec
+                    found[i] = True
+
+        query = np.asarray(keys, dtype=_KEY_DTYPE)
+        for segment in reversed(segments):
+            todo = np.flatnonzero(~found)
+            if not len(todo):
+                break
+            pos = np.minimum(np.searchsorted(segment.keys, query[todo]), len(segment.keys) - 1)
+            hit = segment.keys[pos] == query[todo]
+            for i, p in zip(todo[hit], pos[hit]):
+                vectors[i] = segment.vectors[p]
+            found[todo[hit]] = True
+
+        return found, vectors
+
+    def add(self, texts: list[str], vectors: np.ndarray) -> None:
+        """Queue new vectors; they are persisted on the next ``flush``."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            for text, vec in zip(texts, vectors):
+                self._pending[self.key(text)] = vec
+
+    def flush(self) -> None:
+        """Write pending vectors as a new segment, merging segments as needed.
+
+        Files are written outside ``_lock``, so lookups are not blocked.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._flushing, self._pending = self._pending, {}
+                segments = list(self._segments)
+                seq = max((s.seq for s in segments), default=0) + 1
+
+            keys = np.asarray(list(self._flushing.keys()), dtype=_KEY_DTYPE)
+            order = np.argsort(keys)
+            new = self._write_segment(seq, keys[order], np.stack(list(self._flushing.values()))[order])
+            merged, obsolete = self._merge_tail(segments + [new])
+
+            with self._lock:
+                self._segments = merged
+                self._flushing = {}
+            for segment in obsolete:
+                self._remove_segment(segment)
+
+    def encode(
+        self,
+        model,
+        texts: list[str],
+        batch_size: int = 64,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """Return embeddings for ``texts``, encoding only the missing ones.
+
+        Newly encoded vectors are added to the store and flushed to disk.
+        Each model call is recorded as a ``STORE_MISS_PHASE`` timeline phase,
+        so a warm start shows none.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        found, vectors = self.lookup(texts)
+        missing = sorted({texts[i] for i in np.flatnonzero(~found)})
+        if missing:
+            with timeline.phase(STORE_MISS_PHASE, model=self.model_name, texts=len(missing)):
+                encoded = np.asarray(
+                    model.encode(missing, batch_size=batch_size, show_progress_bar=show_progress_bar),
+                    dtype=np.float32,
+                )
+            self.add(missing, encoded)
+            self.flush()
+            by_text = dict(zip(missing, encoded))
+            vectors = [v if v is not None else by_text[t] for t, v in zip(texts, vectors)]
+
+        return np.stack(vectors).astype(np.float32, copy=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(s.keys) for s in self._segments) + len(self._pending) + len(self._flushing)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _paths(self, seq: int) -> tuple[Path, Path]:
+        stem = self._slug if seq == 0 else f"{self._slug}.{seq:06d}"
+        return self.directory / f"{stem}.keys.npy", self.directory / f"{stem}.vectors.npy"
+
+    def _load(self) -> None:
+        seqs = [0] if self._paths(0)[0].exists() else []
+        for path in self.directory.glob(f"{glob.escape(self._slug)}.*.keys.npy"):
+            match = _SEGMENT_NAME.search(path.name)
+            if match and path.name == f"{self._slug}.{match.group(1)}.keys.npy":
+                seqs.append(int(match.group(1)))
+        segments = []
+        for seq in sorted(seqs):
+            keys_path, vectors_path = self._paths(seq)
+            if not vectors_path.exists():
+                continue
+            keys = np.load(keys_path, mmap_mode="r")
+            vectors = np.load(vectors_path, mmap_mode="r")
+            if len(keys) != len(vectors):
+                continue  # torn write; its vectors are re-encoded on demand
+            segments.append(_Segment(seq, keys, vectors))
+        with self._lock:
+            self._segments = segments
+
+    def _write_segment(self, seq: int, keys: np.ndarray, vectors: np.ndarray) -> _Segment:
+        """Write one segment; the keys file goes last so a torn segment is never read."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        keys_path, vectors_path = self._paths(seq)
+        _atomic_save(vectors_path, vectors)
+        _atomic_save(keys_path, keys)
+        return _Segment(seq, np.load(keys_path, mmap_mode="r"), np.load(vectors_path, mmap_mode="r"))
+
+    def _merge_tail(self, segments: list[_Segment]) -> tuple[list[_Segment], list[_Segment]]:
+        """Fold the newest segment into the previous one while that one is not much larger.
+
+        Returns:
+            The new segment list and the segments it replaced.
+        """
+        obsolete: list[_Segment] = []
+        while len(segments) >= 2 and len(segments[-2].keys) <= 2 * len(segments[-1].keys):
+            older, newer = segments[-2], segments[-1]
+            keys = np.concatenate([newer.keys, older.keys])  # newer first: np.unique keeps it
+            vectors = np.concatenate([newer.vectors, older.vectors])
+            keys, first = np.unique(keys, return_index=True)
+            merged = self._write_segment(newer.seq + 1, keys, vectors[first])
+            obsolete += [older, newer]
+            segments = segments[:-2] + [merged]
+        return segments, obsolete
+
+    def _remove_segment(self, segment: _Segment) -> None:
+        for path in self._paths(segment.seq):
+            path.unlink(missing_ok=True)
+
+
+def _atomic_save(path: Path, array: np.ndarray) -> None:
+    """Write ``array`` next to ``path`` and rename it into place."""
+    tmp = path.with_suffix(".tmp.npy")
+    np.save(tmp, array)
+    os.replace(tmp, path)
@@ -0,0 +1,157 @@
+"""Rank every job title by how ready a user is for it.
+
+The title skill profiles are compiled into a sparse title x skill matrix
+(CSR, one column per taxonomy skill row). A user's skills become one dense
+credit vector over the taxonomy: 1.0 for skills they list, and the best
+cosine similarity to any of their skills where that reaches the match
+threshold, which is the semantic partial credit. Scoring all titles is then
+one sparse-dense product.
+
+``readiness_score`` uses the same rule as ``SkillGapAnalyzer.analyze``
+(matched required skills / required skills): profile skills without a
+taxonomy vector count as required but are never matched, exact names
+always match, and similarities within ``RESCORE_MARGIN`` of the threshold
+are re-scored per pair, as gap analysis does. Titles are ranked by
+``match_score``, the frequency-weighted share of the profile the user
+covers, with partial credit counted at its similarity.
+"""
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from scipy import sparse
+
+from ml.src.config import SKILL_MATCH_THRESHOLD
+from ml.src.skill_vectors import RESCORE_MARGIN, SkillVectors
+
+
+@dataclass
+class JobRecommendation:
+    """One ranked job title."""
+
+    job_title: str
+    match_score: float  # frequency-weighted coverage with partial credit
+    readiness_score: float  # matched / required, as in gap analysis
+    matched_count: int
+    required_count: int
+    job_count: int
+    missing_skills: list[str]  # most frequent uncovered skills
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class JobRecommender:
+    """Sparse title x skill profile matrix scored against user skills.
+
+    Args:
+        title_skills: Title skill profiles (see ``JobSkillCounts.title_skills``).
+        skills: Taxonomy skill vectors; profile skills without a vector never
+            count as covered, even when the user lists them (as in gap
+            analysis).
+    """
+
+    def __init__(self, title_skills: Mapping[str, dict], skills: SkillVectors) -> None:
+        self._skills = skills
+        self.titles = sorted(title_skills)
+
+        rows, cols, freqs = [], [], []
+        required = np.zeros(len(self.titles), dtype=np.int64)
+        freq_total = np.zeros(len(self.titles), dtype=np.float64)
+        job_counts = np.zeros(len(self.titles), dtype=np.int64)
+        for t, title in enumerate(self.titles):
+            info = title_skills[title]
+            job_counts[t] = info.get("job_count", 0)
+            for s in info.get("skills", []):
+                required[t] += 1
+                freq_total[t] += s["frequency"]
+                col = skills.row(s["skill"])
+                if col >= 0:
+                    rows.append(t)
+                    cols.append(col)
+                    freqs.append(s["frequency"])
+
+        shape = (len(self.titles), len(skills))
+        self._freq = sparse.csr_matrix((freqs, (rows, cols)), shape=shape, dtype=np.float64)
+        self._present = self._freq.copy()
+        self._present.data[:] = 1.0
+        self._required = required
+        self._freq_total = freq_total
+        self._job_counts = job_counts
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def recommend(
+        self,
+        user_skills: list[str],
+        top_k: int = 10,
+        threshold: float = SKILL_MATCH_THRESHOLD,
+        n_missing: int = 5,
+    ) -> list[JobRecommendation]:
+        """Top ``top_k`` titles for ``user_skills``.
+
+        Args:
+            user_skills: Normalized skill names.
+            top_k: Titles to return.
+            threshold: Min cosine similarity for partial credit.
+            n_missing: Uncovered skills listed per title.
+        """
+        credit = self.skill_credit(user_skills, threshold)
+        covered = credit > 0
+
+        match = self._freq @ credit
+        matched = self._present @ covered.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            match_score = np.where(self._freq_total > 0, match / self._freq_total, 0.0)
+            readiness = np.where(self._required > 0, matched / self._required, 0.0)
+
+        # Highest match score first; ties by readiness, then more postings
+        order = np.lexsort((-self._job_counts, -readiness, -match_score))[:top_k]
+        return [
+            JobRecommendation(
+                job_title=self.titles[t],
+                match_score=round(float(match_score[t]), 4),
+                readiness_score=round(float(readiness[t]), 4),
+                matched_count=int(round(matched[t])),
+                required_count=int(self._required[t]),
+                job_count=int(self._job_counts[t]),
+                missing_skills=self._missing(t, covered, n_missing),
+            )
+            for t in order
+        ]
+
+    def skill_credit(self, user_skills: list[str], threshold: float = SKILL_MATCH_THRESHOLD) -> np.ndarray:
+        """Credit per taxonomy skill row: 1 if listed, else best similarity >= ``threshold``."""
+        credit = np.zeros(len(self._skills), dtype=np.float64)
+        user_rows = self._skills.rows(list(dict.fromkeys(user_skills)))
+        user_rows = user_rows[user_rows >= 0]
+        if not len(user_rows):
+            return credit
+
+        matrix = self._skills.matrix  # rows are L2-normalized
+        best = (matrix @ matrix[user_rows].T).max(axis=1).astype(np.float64)
+        # Decide rows near the threshold with the per-pair similarity, so a
+        # skill is covered here exactly when gap analysis would match it
+        for row in np.flatnonzero(np.abs(best - threshold) < RESCORE_MARGIN).tolist():
+            best[row] = max(self._skills.pair_similarity(u, row) for u in user_rows.tolist())
+        credit[best >= threshold] = best[best >= threshold]
+        credit[user_rows] = 1.0
+        return np.clip(credit, 0.0, 1.0)
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _missing(self, title: int, covered: np.ndarray, n: int) -> list[str]:
+        start, end = self._freq.indptr[title], self._freq.indptr[title + 1]
+        cols = self._freq.indices[start:end]
+        freqs = self._freq.data[start:end]
+        uncovered = ~covered[cols]
+        top = np.argsort(-freqs[uncovered], kind="stable")[:n]
+        return [self._skills.names[c] for c in cols[uncovered][top]]
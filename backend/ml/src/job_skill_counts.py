@@ -0,0 +1,322 @@
+"""Per-title skill counters aggregated from ``job_skill_mapping.parquet``.
+
+The job-title skill profiles are derived from three counters:
+
+- unique jobs per normalized title,
+- unique jobs per (normalized title, skill),
+- the set of job ids already counted.
+
+The counters are computed in a single vectorized pass and saved under
+``ml/data/process/job_skill_counts``. Profiles (frequency filter, top-N) are
+derived from them on load, so newly scraped postings only have to be added
+to the counters (``ingest``) instead of re-aggregating every title.
+
+Refresh with ``python -m scripts.ingest_job_postings <new_postings.parquet>``.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from ml.src.config import (
+    JOB_SKILL_COUNTS_DIR,
+    JOB_SKILL_MAPPING_PATH,
+    NOISE_SKILLS,
+    SKILL_FREQUENCY_MIN_RATIO,
+)
+from ml.src.source_digests import file_digest, lookup_digest
+from ml.src.timeline import timeline
+
+logger = logging.getLogger(__name__)
+
+COUNTS_VERSION = 1
+MAX_SKILLS_PER_TITLE = 30
+
+_REQUIRED_POSTING_COLUMNS = ("job_id", "job_title", "skill")
+
+_build_lock = threading.Lock()  # one recount at a time per process
+
+
+def normalize_job_title(title: str) -> str:
+    """Basic normalization for job titles."""
+    if not isinstance(title, str):
+        return ""
+    t = title.strip().lower()
+    t = re.sub(r"\s+", " ", t)
+    # Remove common suffixes/prefixes that don't affect semantics
+    t = re.sub(r"\s*\(.*?\)\s*", " ", t)  # remove parenthetical
+    return t.strip()
+
+
+class JobSkillCounts:
+    """Unique-job counters per title and per (title, skill).
+
+    Args:
+        title_jobs: Normalized title -> number of unique jobs.
+        pair_jobs: (title, skill) -> number of unique jobs.
+        job_ids: Job ids already counted.
+        noise_skills: Skills excluded from counting.
+    """
+
+    def __init__(
+        self,
+        title_jobs: pd.Series,
+        pair_jobs: pd.Series,
+        job_ids: set[str],
+        noise_skills: frozenset = NOISE_SKILLS,
+    ) -> None:
+        self.title_jobs = title_jobs
+        self.pair_jobs = pair_jobs
+        self.job_ids = job_ids
+        self.noise_skills = noise_skills
+        self.source_digest: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def empty(cls, noise_skills: frozenset = NOISE_SKILLS) -> "JobSkillCounts":
+        return cls(
+            title_jobs=pd.Series(dtype="int64", name="job_count"),
+            pair_jobs=pd.Series(
+                dtype="int64",
+                name="job_count",
+                index=pd.MultiIndex.from_arrays([[], []], names=["title", "skill"]),
+            ),
+            job_ids=set(),
+            noise_skills=noise_skills,
+        )
+
+    @classmethod
+    def from_frame(cls, job_skill_df: pd.DataFrame, noise_skills: frozenset = NOISE_SKILLS) -> "JobSkillCounts":
+        """Count a full ``job_skill_mapping`` frame."""
+        counts = cls.empty(noise_skills)
+        counts.ingest(job_skill_df)
+        return counts
+
+    def ingest(self, job_skill_df: pd.DataFrame) -> int:
+        """Add postings to the counters.
+
+        Postings are immutable once counted: rows whose ``job_id`` was
+        already ingested are skipped.
+
+        Returns:
+            Number of new jobs counted.
+        """
+        df = job_skill_df[["job_id", "job_title", "skill"]]
+        batch_ids = set(df["job_id"].dropna().unique())
+        new_ids = batch_ids - self.job_ids
+        if not new_ids:
+            return 0
+        if len(new_ids) < len(batch_ids):
+            df = df[df["job_id"].isin(new_ids)]
+
+        # Normalize each distinct raw title once
+        codes, raw_titles = pd.factorize(df["job_title"], use_na_sentinel=False)
+        norm_titles = pd.Index([normalize_job_title(t) for t in raw_titles])
+        df = pd.DataFrame({
+            "job_id": df["job_id"].to_numpy(),
+            "title": norm_titles.take(codes),
+            "skill": df["skill"].to_numpy(),
+        })
+        df = df[(df["title"] != "") & df["skill"].notna() & ~df["skill"].isin(self.noise_skills)]
+
+        title_jobs = df.drop_duplicates(["title", "job_id"]).groupby("title").size()
+        pair_jobs = df.drop_duplicates(["title", "skill", "job_id"]).groupby(["title", "skill"]).size()
+
+        self.title_jobs = self.title_jobs.add(title_jobs, fill_value=0).astype("int64").rename("job_count")
+        self.pair_jobs = self.pair_jobs.add(pair_jobs, fill_value=0).astype("int64").rename("job_count")
+        self.job_ids |= new_ids
+        return len(new_ids)
+
+    def title_skills(
+        self,
+        min_jobs_per_title: int = 3,
+        min_skill_ratio: float = SKILL_FREQUENCY_MIN_RATIO,
+        top_n: int = MAX_SKILLS_PER_TITLE,
+    ) -> dict[str, dict]:
+        """Skill profile per normalized title.
+
+        Skills are ordered by frequency, ties broken by skill name.
+
+        Returns dict mapping normalized title -> {
+            "job_count": int,
+            "skills": [{"skill": str, "frequency": float, "count": int}, ...],
+        }
+        """
+        title_jobs = self.title_jobs[self.title_jobs >= min_jobs_per_title]
+        pairs = self.pair_jobs.rename("count").reset_index()
+        pairs = pairs[pairs["title"].isin(title_jobs.index)]
+        pairs["job_count"] = title_jobs.reindex(pairs["title"]).to_numpy()
+        pairs["frequency"] = pairs["count"] / pairs["job_count"]
+        pairs = pairs[pairs["frequency"] >= min_skill_ratio]
+        pairs = pairs.sort_values(
+            ["title", "frequency", "skill"], ascending=[True, False, True], kind="stable"
+        )
+        pairs = pairs.groupby("title", sort=False).head(top_n)
+
+        result: dict[str, dict] = {}
+        for title, skill, count, job_count, freq in pairs[
+            ["title", "skill", "count", "job_count", "frequency"]
+        ].itertuples(index=False):
+            entry = result.get(title)
+            if entry is None:
+                entry = result[title] = {"job_count": int(job_count), "skills": []}
+            entry["skills"].append({"skill": skill, "frequency": round(float(freq), 4), "count": int(count)})
+        return result
+
+    def save(self, directory: Optional[Path] = None) -> Path:
+        """Write the counters; the manifest is written last."""
+        root = Path(directory or JOB_SKILL_COUNTS_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        manifest_path = root / "manifest.json"
+        manifest_path.unlink(missing_ok=True)
+
+        _atomic_to_parquet(self.title_jobs.rename_axis("title").reset_index(), root / "title_jobs.parquet")
+        _atomic_to_parquet(self.pair_jobs.reset_index(), root / "pair_jobs.parquet")
+        _atomic_to_parquet(pd.DataFrame({"job_id": sorted(self.job_ids)}), root / "job_ids.parquet")
+
+        manifest = {
+            "version": COUNTS_VERSION,
+            "noise_skills": sorted(self.noise_skills),
+            "source_digest": self.source_digest,
+            "n_titles": int(len(self.title_jobs)),
+            "n_pairs": int(len(self.pair_jobs)),
+            "n_jobs": len(self.job_ids),
+        }
+        tmp = manifest_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, manifest_path)
+        return root
+
+    @classmethod
+    def load(cls, directory: Optional[Path] = None) -> Optional["JobSkillCounts"]:
+        """Load saved counters, or ``None`` if missing or built differently."""
+        root = Path(directory or JOB_SKILL_COUNTS_DIR)
+        try:
+            with open(root / "manifest.json") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get("version") != COUNTS_VERSION:
+            return None
+
+        title_df = pd.read_parquet(root / "title_jobs.parquet")
+        pair_df = pd.read_parquet(root / "pair_jobs.parquet")
+        job_ids = pd.read_parquet(root / "job_ids.parquet")["job_id"]
+        counts = cls(
+            title_jobs=title_df.set_index("title")["job_count"],
+            pair_jobs=pair_df.set_index(["title", "skill"])["job_count"],
+            job_ids=set(job_ids),
+            noise_skills=frozenset(manifest["noise_skills"]),
+        )
+        counts.source_digest = manifest.get("source_digest")
+        return counts
+
+
+def aggregate_job_skills(
+    job_skill_df: pd.DataFrame,
+    min_jobs_per_title: int = 3,
+    min_skill_ratio: float = SKILL_FREQUENCY_MIN_RATIO,
+    noise_skills: frozenset = NOISE_SKILLS,
+) -> dict[str, dict]:
+    """Aggregate skills per normalized job title in one vectorized pass."""
+    counts = JobSkillCounts.from_frame(job_skill_df, noise_skills)
+    return counts.title_skills(min_jobs_per_title, min_skill_ratio)
+
+
+def load_or_build_job_skill_counts(
+    job_skill_path: Optional[str] = None,
+    directory: Optional[Path] = None,
+    noise_skills: frozenset = NOISE_SKILLS,
+    digests: Optional[Mapping[str, str]] = None,
+) -> JobSkillCounts:
+    """Load the saved counters, recounting the parquet if it changed.
+
+    ``digests`` holds source file digests already computed at startup.
+    """
+    path = job_skill_path or str(JOB_SKILL_MAPPING_PATH)
+    digest = lookup_digest(path, digests)
+
+    with _build_lock:
+        with timeline.phase("job_skill_counts_load") as info:
+            counts = JobSkillCounts.load(directory)
+            info["hit"] = bool(
+                counts is not None
+                and counts.source_digest == digest
+                and counts.noise_skills == noise_skills
+            )
+        if info["hit"]:
+            return counts
+
+        logger.info("Job-skill counts missing or stale, recounting %s.", path)
+        with timeline.phase("job_skill_counts_build", path=path) as info:
+            job_skill_df = pd.read_parquet(path, columns=["job_id", "job_title", "skill"])
+            info["rows"] = len(job_skill_df)
+            counts = JobSkillCounts.from_frame(job_skill_df, noise_skills)
+            counts.source_digest = digest
+        try:
+            counts.save(directory)
+        except OSError:
+            logger.exception("Could not save job-skill counts; they will be recomputed next start.")
+        return counts
+
+
+def ingest_job_postings(
+    new_postings: pd.DataFrame,
+    job_skill_path: Optional[str] = None,
+    directory: Optional[Path] = None,
+) -> int:
+    """Append new postings to ``job_skill_mapping`` and update the counters.
+
+    Only the new postings are counted; existing titles keep their counters.
+    ``new_postings`` needs ``job_id``, ``job_title`` and ``skill``; other
+    columns of ``job_skill_mapping`` it lacks are stored as nulls.
+
+    Returns:
+        Number of new jobs counted.
+
+    Raises:
+        ValueError: If a required column is missing from ``new_postings``.
+    """
+    missing = set(_REQUIRED_POSTING_COLUMNS) - set(new_postings.columns)
+    if missing:
+        raise ValueError(f"New postings are missing columns: {sorted(missing)}")
+
+    path = job_skill_path or str(JOB_SKILL_MAPPING_PATH)
+    counts = load_or_build_job_skill_counts(path, directory)
+
+    new_postings = new_postings[~new_postings["job_id"].isin(counts.job_ids)]
+    added = counts.ingest(new_postings)
+    if not added:
+        return 0
+
+    existing = pd.read_parquet(path)
+    combined = pd.concat([existing, new_postings.reindex(columns=existing.columns)], ignore_index=True)
+    tmp = f"{path}.tmp"
+    combined.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+    counts.source_digest = file_digest(path)
+    counts.save(directory)
+    logger.info("Ingested %d new jobs (%d rows) into %s.", added, len(new_postings), path)
+    return added
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+def _atomic_to_parquet(df: pd.DataFrame, path: Path) -> None:
+    tmp = path.with_suffix(".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
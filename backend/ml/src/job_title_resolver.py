@@ -0,0 +1,220 @@
+"""Cheap job-title resolution ahead of the semantic title search.
+
+Titles are compared in a canonical form: punctuation split off, common
+abbreviations expanded ("sr." -> "senior", "mgr" -> "manager"). A query
+resolves without the embedding model when, in order:
+
+1. its canonical form equals that of a known title ("data-scientist");
+2. it equals a known title once seniority/level words are dropped and word
+   order is ignored ("data scientist ii", "engineer, project"), taking the
+   title with the most postings;
+3. a known title differs only by typos: trigram overlap picks candidates,
+   and every word must be a near match of the candidate's word in the same
+   position ("softwre enginer").
+
+Everything else falls through to the semantic search. Resolved requirements
+are kept in a bounded LRU keyed by the normalized query and the version of
+the title data, so repeated titles cost neither a model call nor a vector
+search.
+"""
+
+import hashlib
+import heapq
+import re
+import threading
+from collections import Counter, OrderedDict
+from difflib import SequenceMatcher
+from collections.abc import Mapping
+from typing import Any, Optional
+
+DEFAULT_CACHE_SIZE = 10_000
+
+# Confidence reported for a match that differs only in seniority/level words
+LEVEL_MATCH_CONFIDENCE = 0.95
+# Typo matching: min trigram Jaccard similarity for a candidate title, and
+# min per-word similarity (difflib ratio) for accepting it
+TRIGRAM_CANDIDATE_THRESHOLD = 0.5
+TYPO_WORD_RATIO = 0.85
+_MAX_TYPO_CANDIDATES = 5
+
+_TOKEN = re.compile(r"\.?[a-z0-9][a-z0-9+#&]*")
+_ABBREVIATIONS = {
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "jnr": "junior",
+    "mgr": "manager",
+    "asst": "assistant",
+    "assoc": "associate",
+    "exec": "executive",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dev": "developer",
+}
+_LEVEL_WORDS = frozenset({"senior", "junior", "i", "ii", "iii", "iv", "v", "1", "2", "3"})
+
+
+def canonical_job_title(title: str) -> str:
+    """Title as space-separated tokens with abbreviations expanded."""
+    tokens = _TOKEN.findall(title.lower())
+    return " ".join(_ABBREVIATIONS.get(t, t) for t in tokens)
+
+
+def title_data_version(title_skills: Mapping[str, dict]) -> str:
+    """Digest of the title profiles; changes whenever a profile does."""
+    h = hashlib.sha256()
+    for title in sorted(title_skills):
+        info = title_skills[title]
+        h.update(f"{title}\x00{info.get('job_count', 0)}\x00".encode())
+        for s in info.get("skills", []):
+            h.update(f"{s['skill']}\x01{s['frequency']}\x00".encode())
+    return h.hexdigest()[:16]
+
+
+class JobTitleResolver:
+    """Lexical index over known titles plus an LRU of resolved queries.
+
+    Args:
+        title_skills: Title skill profiles (see ``JobSkillCounts.title_skills``).
+        cache_size: Max cached resolutions.
+        data_version: Identity of ``title_skills``; computed when omitted.
+    """
+
+    def __init__(
+        self,
+        title_skills: Mapping[str, dict],
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        data_version: Optional[str] = None,
+    ) -> None:
+        self.cache_size = cache_size
+        self.data_version = data_version or title_data_version(title_skills)
+
+        job_counts = {t: title_skills[t].get("job_count", 0) for t in title_skills}
+        # Most postings first, so the first title seen per key wins
+        titles = sorted(title_skills, key=lambda t: (-job_counts[t], t))
+        self._canonical: dict[str, str] = {}
+        self._level_free: dict[str, str] = {}
+        self._trigram_titles: list[str] = []
+        self._trigram_sizes: list[int] = []
+        self._trigram_index: dict[str, list[int]] = {}
+        for title in titles:
+            canonical = canonical_job_title(title)
+            if not canonical:
+                continue
+            self._canonical.setdefault(canonical, title)
+            self._level_free.setdefault(_level_free_key(canonical), title)
+            grams = _trigrams(canonical)
+            idx = len(self._trigram_titles)
+            self._trigram_titles.append(title)
+            self._trigram_sizes.append(len(grams))
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(idx)
+
+        self._lock = threading.Lock()
+        self._lru: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lexical_matches = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def lexical_match(self, title: str) -> Optional[tuple[str, float]]:
+        """Known title for ``title`` and its confidence, if one matches lexically."""
+        canonical = canonical_job_title(title)
+        if not canonical:
+            return None
+        match = self._canonical_match(canonical) or self._typo_match(canonical)
+        if match is not None:
+            with self._lock:
+                self.lexical_matches += 1
+        return match
+
+    def get(self, title: str) -> Any:
+        """Cached resolution of ``title`` for the current data version, or None."""
+        key = (self.data_version, title)
+        with self._lock:
+            value = self._lru.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, title: str, value: Any) -> None:
+        with self._lock:
+            key = (self.data_version, title)
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.cache_size:
+                self._lru.popitem(last=False)
+
+    def invalidate(self, data_version: Optional[str] = None) -> None:
+        """Drop cached resolutions, e.g. after the title data changed."""
+        with self._lock:
+            if data_version is not None:
+                self.data_version = data_version
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "data_version": self.data_version,
+                "entries": len(self._lru),
+                "max_entries": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "lexical_matches": self.lexical_matches,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _canonical_match(self, canonical: str) -> Optional[tuple[str, float]]:
+        title = self._canonical.get(canonical)
+        if title is not None:
+            return title, 1.0
+        title = self._level_free.get(_level_free_key(canonical))
+        if title is not None:
+            return title, LEVEL_MATCH_CONFIDENCE
+        return None
+
+    def _typo_match(self, canonical: str) -> Optional[tuple[str, float]]:
+        grams = _trigrams(canonical)
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self._trigram_index.get(gram, ()))
+
+        # Best candidates by trigram Jaccard; ties go to the title with more postings
+        candidates = heapq.nlargest(
+            _MAX_TYPO_CANDIDATES,
+            ((n / (len(grams) + self._trigram_sizes[idx] - n), -idx) for idx, n in shared.items()),
+        )
+        words = canonical.split()
+        for jaccard, neg_idx in candidates:
+            if jaccard < TRIGRAM_CANDIDATE_THRESHOLD:
+                break
+            title = self._trigram_titles[-neg_idx]
+            title_words = canonical_job_title(title).split()
+            if len(title_words) != len(words):
+                continue
+            ratios = [SequenceMatcher(None, w, t).ratio() for w, t in zip(words, title_words)]
+            if min(ratios) >= TYPO_WORD_RATIO:
+                return title, round(SequenceMatcher(None, canonical, " ".join(title_words)).ratio(), 4)
+        return None
+
+
+def _level_free_key(canonical: str) -> str:
+    """Canonical tokens without seniority/level words, in sorted order."""
+    tokens = [t for t in canonical.split() if t not in _LEVEL_WORDS]
+    return " ".join(sorted(tokens or canonical.split()))
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
@@ -0,0 +1,397 @@
+"""Precompiled serving bundle: the lookup structures the services need at
+startup, compiled offline into flat ``.npy`` arrays and memory-mapped on load.
+
+Layout of a bundle version directory::
+
+    manifest.json           version, source fingerprint, sizes, category names
+    skill_names.npy         (n_names,) unicode; taxonomy skills first, then any
+                            extra skills referenced only by job titles
+    skill_ids.npy           (n_names,) int64, -1 for non-taxonomy names
+    skill_categories.npy    (n_names,) uint8 codes into manifest["categories"]
+    skill_vectors.npy       (n_skills, dim) float32, L2-normalized, taxonomy rows
+    titles.npy              (n_titles,) unicode, sorted
+    title_job_counts.npy    (n_titles,) int64
+    title_indptr.npy        (n_titles + 1,) int64   CSR row pointers
+    title_skill_rows.npy    (nnz,) int32            CSR column -> skill_names row
+    title_skill_freq.npy    (nnz,) float64
+    title_skill_counts.npy  (nnz,) int64
+
+Versions live in ``serving_bundle/<fingerprint>/`` and ``serving_bundle/CURRENT``
+names the active one. A rebuild writes a new version directory and keeps the
+one it replaces, so a process that still has the previous version mapped
+keeps its files; only versions older than that are removed.
+
+Build offline with ``python -m scripts.build_serving_bundle``.
+"""
+
+import json
+import logging
+import os
+import shutil
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ml.src.chromadb_manager import fingerprint_sources
+from ml.src.config import (
+    JOB_SKILL_MAPPING_PATH,
+    NOISE_SKILLS,
+    SERVING_BUNDLE_DIR,
+    SKILL_EMBEDDINGS_PATH,
+    SKILL_FREQUENCY_MIN_RATIO,
+    SKILL_TAXONOMY_CATEGORIZED_PATH,
+)
+from ml.src.job_skill_counts import load_or_build_job_skill_counts
+from ml.src.timeline import timeline
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 2
+DEFAULT_CATEGORY = "tech_skills"
+
+
+class ServingBundle:
+    """Memory-mapped view over one bundle version directory."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path / "manifest.json") as f:
+            self.manifest: dict = json.load(f)
+
+        def load(name: str) -> np.ndarray:
+            return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+        self.skill_names = load("skill_names")
+        self.skill_ids = load("skill_ids")
+        self.skill_category_codes = load("skill_categories")
+        self.skill_vector_matrix = load("skill_vectors")
+        self.titles = load("titles")
+        self.title_job_counts = load("title_job_counts")
+        self.title_indptr = load("title_indptr")
+        self.title_skill_rows = load("title_skill_rows")
+        self.title_skill_freq = load("title_skill_freq")
+        self.title_skill_counts = load("title_skill_counts")
+
+        self.categories: list[str] = self.manifest["categories"]
+        self.n_skills: int = self.manifest["n_skills"]
+        self._name_list: list[str] = self.skill_names.tolist()
+        self._skill_row = {name: i for i, name in enumerate(self._name_list)}
+        self._title_row = {title: i for i, title in enumerate(self.titles.tolist())}
+
+    @property
+    def fingerprint(self) -> str:
+        return self.manifest["fingerprint"]
+
+    def skill_row(self, name: str) -> int:
+        """Row of ``name`` in the skill arrays, or -1."""
+        return self._skill_row.get(name, -1)
+
+    @property
+    def skill_lookup(self) -> Mapping[str, dict]:
+        """``skill_name -> {"skill_id", "category"}`` over taxonomy skills."""
+        return _SkillLookupView(self)
+
+    @property
+    def skill_categories(self) -> Mapping[str, str]:
+        """``skill_name -> category`` over all known names."""
+        return _SkillCategoryView(self)
+
+    @property
+    def skill_vectors(self) -> Mapping[str, np.ndarray]:
+        """``skill_name -> normalized vector`` (rows of the mapped matrix)."""
+        return _SkillVectorView(self)
+
+    @property
+    def title_skills(self) -> Mapping[str, dict]:
+        """Same shape as ``JobSkillCounts.title_skills()`` output, read from the CSR arrays."""
+        return _TitleSkillsView(self)
+
+
+# ---------------------------------------------------------------------------
+# Mapping views (dict-compatible, no per-entry Python objects at load time)
+# ---------------------------------------------------------------------------
+
+class _SkillLookupView(Mapping):
+    def __init__(self, bundle: ServingBundle) -> None:
+        self._b = bundle
+
+    def __getitem__(self, name: str) -> dict:
+        row = self._b._skill_row.get(name, -1)
+        if row < 0 or row >= self._b.n_skills:
+            raise KeyError(name)
+        return {
+            "skill_id": int(self._b.skill_ids[row]),
+            "category": self._b.categories[self._b.skill_category_codes[row]],
+        }
+
+    def __contains__(self, name: object) -> bool:
+        return 0 <= self._b._skill_row.get(name, -1) < self._b.n_skills
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._b._name_list[: self._b.n_skills])
+
+    def __len__(self) -> int:
+        return self._b.n_skills
+
+
+class _SkillCategoryView(Mapping):
+    def __init__(self, bundle: ServingBundle) -> None:
+        self._b = bundle
+
+    def __getitem__(self, name: str) -> str:
+        row = self._b._skill_row[name]
+        return self._b.categories[self._b.skill_category_codes[row]]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._b._skill_row
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._b._name_list)
+
+    def __len__(self) -> int:
+        return len(self._b._name_list)
+
+
+class _SkillVectorView(Mapping):
+    def __init__(self, bundle: ServingBundle) -> None:
+        self._b = bundle
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        row = self._b._skill_row.get(name, -1)
+        if row < 0 or row >= self._b.n_skills:
+            raise KeyError(name)
+        return self._b.skill_vector_matrix[row]
+
+    def __contains__(self, name: object) -> bool:
+        return 0 <= self._b._skill_row.get(name, -1) < self._b.n_skills
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._b._name_list[: self._b.n_skills])
+
+    def __len__(self) -> int:
+        return self._b.n_skills
+
+
+class _TitleSkillsView(Mapping):
+    def __init__(self, bundle: ServingBundle) -> None:
+        self._b = bundle
+
+    def __getitem__(self, title: str) -> dict:
+        b = self._b
+        row = b._title_row[title]
+        start, end = int(b.title_indptr[row]), int(b.title_indptr[row + 1])
+        return {
+            "job_count": int(b.title_job_counts[row]),
+            "skills": [
+                {
+                    "skill": b._name_list[b.title_skill_rows[j]],
+                    "frequency": float(b.title_skill_freq[j]),
+                    "count": int(b.title_skill_counts[j]),
+                }
+                for j in range(start, end)
+            ],
+        }
+
+    def __contains__(self, title: object) -> bool:
+        return title in self._b._title_row
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._b._title_row)
+
+    def __len__(self) -> int:
+        return len(self._b._title_row)
+
+
+# ---------------------------------------------------------------------------
+# Build / load
+# ---------------------------------------------------------------------------
+
+def _source_paths(
+    taxonomy_path: Optional[str],
+    embeddings_path: Optional[str],
+    job_skill_path: Optional[str],
+) -> list[str]:
+    return [
+        taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH),
+        embeddings_path or str(SKILL_EMBEDDINGS_PATH),
+        job_skill_path or str(JOB_SKILL_MAPPING_PATH),
+    ]
+
+
+def bundle_fingerprint(
+    taxonomy_path: Optional[str] = None,
+    embeddings_path: Optional[str] = None,
+    job_skill_path: Optional[str] = None,
+    digests: Optional[Mapping[str, str]] = None,
+) -> str:
+    """Fingerprint of the bundle sources and build parameters."""
+    return fingerprint_sources(
+        _source_paths(taxonomy_path, embeddings_path, job_skill_path),
+        {
+            "bundle_version": BUNDLE_VERSION,
+            "min_skill_ratio": SKILL_FREQUENCY_MIN_RATIO,
+            "noise_skills": sorted(NOISE_SKILLS),
+        },
+        digests,
+    )
+
+
+def build_serving_bundle(
+    output_dir: Optional[Path] = None,
+    taxonomy_path: Optional[str] = None,
+    embeddings_path: Optional[str] = None,
+    job_skill_path: Optional[str] = None,
+    digests: Optional[Mapping[str, str]] = None,
+    job_skill_counts_dir: Optional[Path] = None,
+) -> Path:
+    """Compile the parquet sources into a new bundle version and activate it.
+
+    Args:
+        digests: Source file digests already computed at startup.
+        job_skill_counts_dir: Directory of the saved job-skill counts.
+
+    Returns:
+        Path of the new bundle version directory.
+    """
+    root = Path(output_dir or SERVING_BUNDLE_DIR)
+    tax_path, emb_path, js_path = _source_paths(taxonomy_path, embeddings_path, job_skill_path)
+    fingerprint = bundle_fingerprint(tax_path, emb_path, js_path, digests)
+
+    tax_df = pd.read_parquet(tax_path)
+    emb_df = pd.read_parquet(emb_path)
+
+    # Skills: taxonomy rows that have an embedding, in taxonomy order
+    emb_names = emb_df["skill"].to_numpy() if "skill" in emb_df.columns else tax_df["skill_name"].to_numpy()
+    emb_matrix = emb_df.drop(columns=["skill"], errors="ignore").to_numpy(dtype=np.float32)
+    emb_row = pd.Series(np.arange(len(emb_names)), index=emb_names)
+    emb_row = emb_row[~emb_row.index.duplicated()]
+    tax_df = tax_df[tax_df["skill_name"].isin(emb_row.index)].drop_duplicates("skill_name")
+
+    names = tax_df["skill_name"].tolist()
+    vectors = emb_matrix[emb_row.loc[names].to_numpy()]
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    category_series = (
+        tax_df["category"].fillna(DEFAULT_CATEGORY)
+        if "category" in tax_df.columns
+        else pd.Series(DEFAULT_CATEGORY, index=tax_df.index)
+    )
+    categories = sorted(set(category_series) | {DEFAULT_CATEGORY})
+    category_code = {c: i for i, c in enumerate(categories)}
+
+    # Titles: CSR over the aggregated title -> skills mapping
+    title_skills = load_or_build_job_skill_counts(js_path, job_skill_counts_dir, digests=digests).title_skills()
+    titles = sorted(title_skills)
+    row_of = {name: i for i, name in enumerate(names)}
+    extra_names: list[str] = []
+    indptr = [0]
+    skill_rows: list[int] = []
+    freqs: list[float] = []
+    counts: list[int] = []
+    for title in titles:
+        for s in title_skills[title]["skills"]:
+            if s["skill"] not in row_of:
+                row_of[s["skill"]] = len(names) + len(extra_names)
+                extra_names.append(s["skill"])
+            skill_rows.append(row_of[s["skill"]])
+            freqs.append(s["frequency"])
+            counts.append(s["count"])
+        indptr.append(len(skill_rows))
+
+    all_names = names + extra_names
+    arrays = {
+        "skill_names": np.array(all_names, dtype=str),
+        "skill_ids": np.concatenate([
+            tax_df["skill_id"].to_numpy(dtype=np.int64),
+            np.full(len(extra_names), -1, dtype=np.int64),
+        ]),
+        "skill_categories": np.array(
+            [category_code[c] for c in category_series] + [category_code[DEFAULT_CATEGORY]] * len(extra_names),
+            dtype=np.uint8,
+        ),
+        "skill_vectors": np.ascontiguousarray(vectors, dtype=np.float32),
+        "titles": np.array(titles, dtype=str),
+        "title_job_counts": np.array([title_skills[t]["job_count"] for t in titles], dtype=np.int64),
+        "title_indptr": np.array(indptr, dtype=np.int64),
+        "title_skill_rows": np.array(skill_rows, dtype=np.int32),
+        "title_skill_freq": np.array(freqs, dtype=np.float64),
+        "title_skill_counts": np.array(counts, dtype=np.int64),
+    }
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "fingerprint": fingerprint,
+        "n_skills": len(names),
+        "n_names": len(all_names),
+        "dim": int(vectors.shape[1]),
+        "n_titles": len(titles),
+        "categories": categories,
+    }
+
+    version_dir = root / fingerprint[:16]
+    tmp_dir = root / f"{fingerprint[:16]}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+    with open(tmp_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    shutil.rmtree(version_dir, ignore_errors=True)
+    os.replace(tmp_dir, version_dir)
+
+    _activate(root, version_dir.name)
+    logger.info("Built serving bundle %s (%d skills, %d titles).", version_dir, len(names), len(titles))
+    return version_dir
+
+
+def load_serving_bundle(path: Optional[Path] = None) -> Optional[ServingBundle]:
+    """Map the active bundle under ``path``, or return None if there is none."""
+    root = Path(path or SERVING_BUNDLE_DIR)
+    current = root / "CURRENT"
+    if not current.exists():
+        return None
+    version_dir = root / current.read_text().strip()
+    if not (version_dir / "manifest.json").exists():
+        return None
+    bundle = ServingBundle(version_dir)
+    if bundle.manifest.get("version") != BUNDLE_VERSION:
+        return None
+    return bundle
+
+
+def load_or_build_serving_bundle(
+    path: Optional[Path] = None,
+    digests: Optional[Mapping[str, str]] = None,
+    job_skill_counts_dir: Optional[Path] = None,
+) -> ServingBundle:
+    """Map the active bundle if it matches the current sources, else rebuild it.
+
+    ``digests`` holds source file digests already computed at startup; a
+    rebuild reads the job-skill counts saved under ``job_skill_counts_dir``.
+    """
+    with timeline.phase("serving_bundle_load"):
+        bundle = load_serving_bundle(path)
+        fingerprint = bundle_fingerprint(digests=digests)
+        if bundle is not None and bundle.fingerprint == fingerprint:
+            return bundle
+    logger.info("Serving bundle missing or stale, rebuilding.")
+    with timeline.phase("serving_bundle_build"):
+        return ServingBundle(
+            build_serving_bundle(path, digests=digests, job_skill_counts_dir=job_skill_counts_dir)
+        )
+
+
+def _activate(root: Path, version: str) -> None:
+    """Point CURRENT at ``version``, keeping the previous version and dropping older ones.
+
+    Directories still being written by another build (``*.tmp``) are left alone.
+    """
+    current = root / "CURRENT"
+    keep = {version, current.read_text().strip() if current.exists() else version}
+    tmp = root / "CURRENT.tmp"
+    tmp.write_text(version)
+    os.replace(tmp, current)
+    for child in root.iterdir():
+        if child.is_dir() and child.name not in keep and not child.name.endswith(".tmp"):
+            shutil.rmtree(child, ignore_errors=True)
@@ -0,0 +1,338 @@
+"""Precomputed top-N courses for every taxonomy skill.
+
+Roadmap requests ask for courses per missing skill, and those skills almost
+always come from the taxonomy. The table holds, for every taxonomy skill, the
+``top_n`` most similar courses (exact cosine search over the course vectors)
+as two fixed-width arrays: course positions (``int32``, ``-1`` padded) and
+similarities (``float32``). Serving a skill is then a row lookup; only skills
+outside the taxonomy need a live vector search.
+
+The table is saved under ``ml/data/process/skill_course_index`` together with
+the skill vectors and a content hash per course, so a changed catalog is
+applied incrementally (``SkillCourseIndex.update``): added or edited courses
+are scored against every skill, and only rows that lost a removed or edited
+course are recomputed in full.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from ml.src.config import SKILL_COURSE_INDEX_DIR, SKILL_TAXONOMY_CATEGORIZED_PATH
+from ml.src.timeline import timeline
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_TOP_N = 20  # LearningRoadmapService fetches at most 20 candidates per skill
+_HASH_DTYPE = "S16"
+_SKILL_CHUNK = 256  # skills scored per matrix product, bounds peak memory
+
+
+def course_content_hash(text: str) -> bytes:
+    """Hash of the text a course is embedded from; changes when it must be re-embedded."""
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest().encode()
+
+
+def taxonomy_skill_names(taxonomy_path: Optional[str] = None) -> list[str]:
+    """Skill names of the categorized taxonomy."""
+    path = taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH)
+    return pd.read_parquet(path, columns=["skill_name"])["skill_name"].dropna().unique().tolist()
+
+
+@dataclass
+class SkillCourseUpdate:
+    """What ``SkillCourseIndex.update`` had to recompute."""
+
+    added_courses: int = 0
+    removed_courses: int = 0
+    new_skills: int = 0
+    rescored_rows: int = 0  # rows merged with added courses only
+    recomputed_rows: int = 0  # rows rebuilt against the whole catalog
+
+
+class SkillCourseIndex:
+    """Top-N courses per skill as fixed-width arrays.
+
+    Attributes:
+        skill_names: Skill per row.
+        skill_vectors: L2-normalized query vector per row.
+        course_ids: Course id per course position.
+        course_hashes: ``course_content_hash`` per course position.
+        top_courses: ``(n_skills, top_n)`` course positions, best first; -1 pads.
+        top_sims: Matching cosine similarities.
+        model_id: Embedding model the vectors come from.
+    """
+
+    def __init__(
+        self,
+        skill_names: list[str],
+        skill_vectors: np.ndarray,
+        course_ids: np.ndarray,
+        course_hashes: np.ndarray,
+        top_courses: np.ndarray,
+        top_sims: np.ndarray,
+        model_id: str,
+    ) -> None:
+        self.skill_names = skill_names
+        self.skill_vectors = skill_vectors
+        self.course_ids = course_ids
+        self.course_hashes = course_hashes
+        self.top_courses = top_courses
+        self.top_sims = top_sims
+        self.model_id = model_id
+        self._skill_row = {name: i for i, name in enumerate(skill_names)}
+
+    def __len__(self) -> int:
+        return len(self.skill_names)
+
+    @property
+    def top_n(self) -> int:
+        return self.top_courses.shape[1]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        skill_names: list[str],
+        skill_vectors: np.ndarray,
+        course_ids: list[str],
+        course_hashes: list[bytes],
+        course_vectors: np.ndarray,
+        model_id: str,
+        top_n: int = DEFAULT_TOP_N,
+    ) -> "SkillCourseIndex":
+        """Score every skill against every course."""
+        skill_vectors = _normalize(skill_vectors)
+        course_vectors = _normalize(course_vectors)
+        with timeline.phase("build_skill_course_index", skills=len(skill_names), courses=len(course_ids)):
+            top_courses, top_sims = _top_n(skill_vectors, course_vectors, top_n)
+        return cls(
+            skill_names=list(skill_names),
+            skill_vectors=skill_vectors,
+            course_ids=np.asarray(course_ids, dtype=str),
+            course_hashes=np.asarray(course_hashes, dtype=_HASH_DTYPE),
+            top_courses=top_courses,
+            top_sims=top_sims,
+            model_id=model_id,
+        )
+
+    def lookup(self, skill_name: str, k: int) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """Best ``k`` (course positions, similarities) for a skill, or None if it is not in the table.
+
+        Positions index the course list the table was built or updated with.
+        """
+        row = self._skill_row.get(skill_name)
+        if row is None:
+            return None
+        positions = self.top_courses[row, :k]
+        positions = positions[positions >= 0]
+        return positions, self.top_sims[row, : len(positions)]
+
+    def update(
+        self,
+        skill_names: list[str],
+        encode_skills: Callable[[list[str]], np.ndarray],
+        course_ids: list[str],
+        course_hashes: list[bytes],
+        course_vectors: np.ndarray,
+    ) -> tuple["SkillCourseIndex", SkillCourseUpdate]:
+        """Table for a new skill list and course catalog, reusing unaffected rows.
+
+        Args:
+            skill_names: Skills of the new table.
+            encode_skills: Embeds skill names missing from this table.
+            course_ids: Course id per row of ``course_vectors``.
+            course_hashes: ``course_content_hash`` per course.
+            course_vectors: Embeddings of the new catalog.
+
+        Returns:
+            The new table and what had to be recomputed.
+        """
+        stats = SkillCourseUpdate()
+        course_vectors = _normalize(course_vectors)
+        course_hashes = np.asarray(course_hashes, dtype=_HASH_DTYPE)
+        n_courses = len(course_ids)
+
+        # Old course position -> new position; -1 for removed or edited courses
+        new_pos = {cid: i for i, cid in enumerate(course_ids)}
+        old_to_new = np.full(len(self.course_ids) + 1, -1, dtype=np.int32)  # last slot maps -1 pads
+        kept_new = np.zeros(n_courses, dtype=bool)
+        for old, (cid, h) in enumerate(zip(self.course_ids.tolist(), self.course_hashes)):
+            pos = new_pos.get(cid)
+            if pos is not None and course_hashes[pos] == h:
+                old_to_new[old] = pos
+                kept_new[pos] = True
+        added = np.flatnonzero(~kept_new)
+        stats.added_courses = len(added)
+        stats.removed_courses = int(len(self.course_ids) - kept_new.sum())
+
+        # Skill vectors: reuse stored ones, encode the rest
+        old_rows = np.array([self._skill_row.get(name, -1) for name in skill_names], dtype=np.int64)
+        new_skill_rows = np.flatnonzero(old_rows < 0)
+        stats.new_skills = len(new_skill_rows)
+        skill_vectors = np.empty((len(skill_names), self.skill_vectors.shape[1]), dtype=np.float32)
+        skill_vectors[old_rows >= 0] = self.skill_vectors[old_rows[old_rows >= 0]]
+        if len(new_skill_rows):
+            skill_vectors[new_skill_rows] = _normalize(encode_skills([skill_names[i] for i in new_skill_rows]))
+
+        top_courses = np.full((len(skill_names), self.top_n), -1, dtype=np.int32)
+        top_sims = np.zeros((len(skill_names), self.top_n), dtype=np.float32)
+        reused = np.flatnonzero(old_rows >= 0)
+        top_courses[reused] = old_to_new[self.top_courses[old_rows[reused]]]
+        top_sims[reused] = self.top_sims[old_rows[reused]]
+
+        # Rows that lost an entry may be missing a course ranked just below it
+        lost = (self.top_courses[old_rows[reused]] >= 0) & (top_courses[reused] < 0)
+        full = np.concatenate([new_skill_rows, reused[lost.any(axis=1)]])
+        partial = reused[~lost.any(axis=1)]
+
+        with timeline.phase("update_skill_course_index", full=len(full), partial=len(partial), added=len(added)):
+            if len(full):
+                top_courses[full], top_sims[full] = _top_n(skill_vectors[full], course_vectors, self.top_n)
+            if len(partial) and len(added):
+                add_idx, add_sims = _top_n(skill_vectors[partial], course_vectors[added], self.top_n)
+                add_idx = np.where(add_idx >= 0, added[np.maximum(add_idx, 0)], -1).astype(np.int32)
+                top_courses[partial], top_sims[partial] = _merge(
+                    top_courses[partial], top_sims[partial], add_idx, add_sims, self.top_n
+                )
+        stats.recomputed_rows = len(full)
+        stats.rescored_rows = len(partial) if len(added) else 0
+
+        index = SkillCourseIndex(
+            skill_names=list(skill_names),
+            skill_vectors=skill_vectors,
+            course_ids=np.asarray(course_ids, dtype=str),
+            course_hashes=course_hashes,
+            top_courses=top_courses,
+            top_sims=top_sims,
+            model_id=self.model_id,
+        )
+        return index, stats
+
+    def save(self, directory: Optional[Path] = None) -> Path:
+        """Write the table atomically (a temp directory renamed into place)."""
+        root = Path(directory or SKILL_COURSE_INDEX_DIR)
+        tmp = root.with_name(root.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        np.save(tmp / "skill_names.npy", np.asarray(self.skill_names, dtype=str))
+        np.save(tmp / "skill_vectors.npy", self.skill_vectors)
+        np.save(tmp / "course_ids.npy", self.course_ids)
+        np.save(tmp / "course_hashes.npy", self.course_hashes)
+        np.save(tmp / "top_courses.npy", self.top_courses)
+        np.save(tmp / "top_sims.npy", self.top_sims)
+        with open(tmp / "manifest.json", "w") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "model": self.model_id,
+                "top_n": self.top_n,
+                "n_skills": len(self.skill_names),
+                "n_courses": len(self.course_ids),
+            }, f, indent=2)
+        shutil.rmtree(root, ignore_errors=True)
+        os.replace(tmp, root)
+        return root
+
+    @classmethod
+    def load(cls, directory: Optional[Path] = None) -> Optional["SkillCourseIndex"]:
+        """Load a saved table, or None if missing or of another format version."""
+        root = Path(directory or SKILL_COURSE_INDEX_DIR)
+        try:
+            with open(root / "manifest.json") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get("version") != INDEX_VERSION:
+            return None
+        return cls(
+            skill_names=np.load(root / "skill_names.npy").tolist(),
+            skill_vectors=np.load(root / "skill_vectors.npy"),
+            course_ids=np.load(root / "course_ids.npy"),
+            course_hashes=np.load(root / "course_hashes.npy"),
+            top_courses=np.load(root / "top_courses.npy"),
+            top_sims=np.load(root / "top_sims.npy"),
+            model_id=manifest["model"],
+        )
+
+
+def load_or_build_skill_course_index(
+    skill_names: list[str],
+    encode_skills: Callable[[list[str]], np.ndarray],
+    course_ids: list[str],
+    course_hashes: list[bytes],
+    course_vectors: np.ndarray,
+    model_id: str,
+    top_n: int = DEFAULT_TOP_N,
+    directory: Optional[Path] = None,
+) -> SkillCourseIndex:
+    """Bring the saved table up to date with the catalog, or build it from scratch.
+
+    A saved table for the same model and ``top_n`` is updated incrementally;
+    the result is saved when anything changed.
+    """
+    saved = SkillCourseIndex.load(directory)
+    if saved is not None and saved.model_id == model_id and saved.top_n == top_n:
+        index, stats = saved.update(skill_names, encode_skills, course_ids, course_hashes, course_vectors)
+        changed = stats.added_courses or stats.removed_courses or stats.new_skills or len(index) != len(saved)
+        logger.info("Skill-course index updated: %s", stats)
+    else:
+        index = SkillCourseIndex.build(
+            skill_names, encode_skills(skill_names), course_ids, course_hashes, course_vectors, model_id, top_n
+        )
+        changed = True
+    if changed:
+        try:
+            index.save(directory)
+        except OSError:
+            logger.exception("Could not save the skill-course index.")
+    return index
+
+
+# ---------------------------------------------------------------------------
+# Private helpers
+# ---------------------------------------------------------------------------
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def _top_n(queries: np.ndarray, items: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Exact top-``n`` items per query by dot product, best first, -1 padded."""
+    top = np.full((len(queries), n), -1, dtype=np.int32)
+    sims = np.zeros((len(queries), n), dtype=np.float32)
+    k = min(n, len(items))
+    if k == 0:
+        return top, sims
+    for start in range(0, len(queries), _SKILL_CHUNK):
+        scores = queries[start:start + _SKILL_CHUNK] @ items.T
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < len(items) else np.argsort(-scores, axis=1)
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind="stable")
+        top[start:start + len(scores), :k] = np.take_along_axis(part, order, axis=1)
+        sims[start:start + len(scores), :k] = np.take_along_axis(part_scores, order, axis=1)
+    return top, sims
+
+
+def _merge(
+    idx_a: np.ndarray, sims_a: np.ndarray, idx_b: np.ndarray, sims_b: np.ndarray, n: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise top-``n`` of two ranked lists (pads ignored)."""
+    idx = np.concatenate([idx_a, idx_b], axis=1)
+    sims = np.concatenate([sims_a, sims_b], axis=1)
+    order = np.argsort(-np.where(idx >= 0, sims, -np.inf), axis=1, kind="stable")[:, :n]
+    idx = np.take_along_axis(idx, order, axis=1)
+    sims = np.where(idx >= 0, np.take_along_axis(sims, order, axis=1), 0.0).astype(np.float32)
+    return idx, sims
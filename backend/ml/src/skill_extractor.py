@@ -5,12 +5,13 @@ Supports two input modes:
 2. Free text paragraphs (e.g., CV/resume descriptions)
 
 Uses a two-pass approach:
-- Pass 1 (exact): Match normalized n-grams against skill taxonomy
+- Pass 1 (exact): Match normalized n-grams against skill taxonomy (token trie)
 - Pass 2 (semantic): Encode text with all-MiniLM-L6-v2, query ChromaDB
 """
 
 import re
-from dataclasses import asdict, dataclass
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass, field
 
 import chromadb
 import numpy as np
@@ -26,7 +27,14 @@ from ml.src.config import (
     SKILL_MATCH_THRESHOLD,
     SKILL_TAXONOMY_CATEGORIZED_PATH,
 )
-from ml.src.skill_normalizer import normalize_skill, parse_skills_csv, preprocess_text
+from ml.src.serving_bundle import ServingBundle
+from ml.src.skill_normalizer import parse_skills_csv, preprocess_text
+from ml.src.taxonomy_matcher import TaxonomyMatcher
+from ml.src.timeline import timeline
+from ml.src.vector_index import VectorIndex
+
+MODE_SKILL_LIST = "skill_list"
+MODE_FREE_TEXT = "free_text"
 
 
 @dataclass
@@ -43,6 +51,16 @@ class SkillMatch:
         return asdict(self)
 
 
+@dataclass
+class _DocumentPlan:
+    """One document after the exact pass."""
+
+    n_results: int  # semantic candidates considered per query
+    skip_noise: bool  # drop NOISE_SKILLS from semantic hits
+    exact: list[SkillMatch] = field(default_factory=list)
+    queries: list[str] = field(default_factory=list)  # texts needing semantic search
+
+
 class SkillExtractor:
     """Extract skills from text using exact + semantic matching.
 
@@ -52,32 +70,46 @@ class SkillExtractor:
         threshold: Minimum cosine similarity to accept a match.
         taxonomy_path: Path to categorized taxonomy parquet.
         collection_name: ChromaDB collection name for skills.
+        bundle: Precompiled serving bundle; when given, the taxonomy lookup
+            is read from it instead of the parquet file.
+        index: Vector index to query instead of the ChromaDB collection
+            (e.g. an ``InMemoryVectorIndex``); ``chroma_client`` may then
+            be None.
     """
 
     def __init__(
         self,
-        chroma_client: chromadb.ClientAPI,
+        chroma_client: chromadb.ClientAPI | None,
         model: SentenceTransformer | None = None,
         threshold: float = SKILL_MATCH_THRESHOLD,
         taxonomy_path: str | None = None,
         collection_name: str = SKILL_COLLECTION_NAME,
+        bundle: ServingBundle | None = None,
+        index: VectorIndex | None = None,
     ):
         self.client = chroma_client
         self.model = model or SentenceTransformer(EMBEDDING_MODEL_NAME)
         self.threshold = threshold
-        self.collection = chroma_client.get_collection(collection_name)
+        self.collection = index if index is not None else chroma_client.get_collection(collection_name)
 
         # Load taxonomy for exact matching lookup
-        tax_path = taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH)
-        tax_df = pd.read_parquet(tax_path)
-        self._skill_lookup: dict[str, dict] = {
-            row["skill_name"]: {
-                "skill_id": int(row["skill_id"]),
-                "category": row.get("category", "tech_skills"),
-            }
-            for _, row in tax_df.iterrows()
-        }
+        if bundle is not None:
+            self._skill_lookup: Mapping[str, dict] = bundle.skill_lookup
+        else:
+            tax_path = taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH)
+            with timeline.phase("read_parquet", path=tax_path):
+                tax_df = pd.read_parquet(tax_path)
+            with timeline.phase("iterrows_skill_lookup", rows=len(tax_df)):
+                self._skill_lookup = {
+                    row["skill_name"]: {
+                        "skill_id": int(row["skill_id"]),
+                        "category": row.get("category", "tech_skills"),
+                    }
+                    for _, row in tax_df.iterrows()
+                }
         self._skill_names = set(self._skill_lookup.keys())
+        with timeline.phase("build_taxonomy_matcher", skills=len(self._skill_names)):
+            self._matcher = TaxonomyMatcher(self._skill_names)
 
     # ------------------------------------------------------------------
     # Public API
@@ -91,17 +123,69 @@ class SkillExtractor:
         2. Exact match against taxonomy
         3. Semantic match for non-exact items
         """
-        normalized = parse_skills_csv(skills_csv)
-        if not normalized:
-            return []
+        return self.extract_batch([(skills_csv, MODE_SKILL_LIST)])[0]
 
-        matches: list[SkillMatch] = []
-        unmatched: list[str] = []
+    def extract_from_text(self, text: str) -> list[SkillMatch]:
+        """Extract skills from free-form text (CV, resume, job description).
+
+        Two-pass approach:
+        1. Exact: Extract n-grams, normalize, match against taxonomy
+        2. Semantic: Encode sentences, query ChromaDB for nearest skills
+        """
+        return self.extract_batch([(text, MODE_FREE_TEXT)])[0]
+
+    def extract_batch(self, documents: Sequence[tuple[str, str]]) -> list[list[SkillMatch]]:
+        """Extract skills from many documents with one semantic pass.
+
+        The exact pass runs per document; every text left unmatched across
+        the batch is then encoded in one deduplicated ``encode`` call and
+        searched with one multi-query vector search.
+
+        Args:
+            documents: ``(text, mode)`` pairs, mode being ``MODE_SKILL_LIST``
+                or ``MODE_FREE_TEXT``.
 
-        for skill in normalized:
+        Returns:
+            Matches per document, in input order.
+        """
+        plans = [self._plan(text, mode) for text, mode in documents]
+        queries = list(dict.fromkeys(q for plan in plans for q in plan.queries))
+        results = self._semantic_search(queries, n_results=max((p.n_results for p in plans), default=1))
+        return [self._resolve(plan, results) for plan in plans]
+
+    @classmethod
+    def merge_matches(cls, best: dict[str, SkillMatch], matches: list[SkillMatch]) -> list[SkillMatch]:
+        """Fold ``matches`` into a running per-skill ``best`` (same rule as ``_deduplicate``).
+
+        Used to deduplicate across the chunks of a long document. Returns the
+        entries that were added or improved, highest confidence first.
+        """
+        changed = []
+        for match in cls._deduplicate(matches):
+            current = best.get(match.skill_name)
+            if current is None or match.confidence > current.confidence:
+                best[match.skill_name] = match
+                changed.append(match)
+        return changed
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _plan(self, text: str, mode: str) -> "_DocumentPlan":
+        if mode == MODE_SKILL_LIST:
+            return self._plan_skill_list(text)
+        if mode == MODE_FREE_TEXT:
+            return self._plan_text(text)
+        raise ValueError(f"Unknown extraction mode {mode!r}")
+
+    def _plan_skill_list(self, skills_csv: str) -> "_DocumentPlan":
+        """Exact matches of the listed skills; the rest need semantic search."""
+        plan = _DocumentPlan(n_results=1, skip_noise=False)
+        for skill in parse_skills_csv(skills_csv):
             if skill in self._skill_lookup:
                 info = self._skill_lookup[skill]
-                matches.append(SkillMatch(
+                plan.exact.append(SkillMatch(
                     skill_name=skill,
                     skill_id=info["skill_id"],
                     category=info["category"],
@@ -109,60 +193,49 @@ class SkillExtractor:
                     matched_from=skill,
                 ))
             else:
-                unmatched.append(skill)
-
-        # Semantic matching for unmatched skills
-        if unmatched:
-            embeddings = self.model.encode(unmatched).tolist()
-            results = query_skills(self.collection, embeddings, n_results=1)
-            for text, result_list in zip(unmatched, results):
-                if result_list and result_list[0]["similarity"] >= self.threshold:
-                    best = result_list[0]
-                    matches.append(SkillMatch(
-                        skill_name=best["skill_name"],
-                        skill_id=best["skill_id"],
-                        category=best["category"],
-                        confidence=best["similarity"],
-                        matched_from=text,
-                    ))
-
-        return self._deduplicate(matches)
-
-    def extract_from_text(self, text: str) -> list[SkillMatch]:
-        """Extract skills from free-form text (CV, resume, job description).
+                plan.queries.append(skill)
+        return plan
 
-        Two-pass approach:
-        1. Exact: Extract n-grams, normalize, match against taxonomy
-        2. Semantic: Encode sentences, query ChromaDB for nearest skills
-        """
+    def _plan_text(self, text: str) -> "_DocumentPlan":
+        """Exact n-gram matches; sentences without any need semantic search."""
+        plan = _DocumentPlan(n_results=3, skip_noise=True)
         text = preprocess_text(text)
         if not text:
-            return []
+            return plan
 
-        # Split into sentences
-        sentences = self._split_sentences(text)
-
-        all_matches: list[SkillMatch] = []
-        sentences_without_exact: list[str] = []
-
-        # Pass 1: N-gram exact matching
-        for sentence in sentences:
+        for sentence in self._split_sentences(text):
             exact_matches = self._extract_exact_from_sentence(sentence)
             if exact_matches:
-                all_matches.extend(exact_matches)
+                plan.exact.extend(exact_matches)
             else:
-                sentences_without_exact.append(sentence)
-
-        # Pass 2: Semantic matching for sentences without exact matches
-        if sentences_without_exact:
-            semantic_matches = self._extract_semantic_from_sentences(sentences_without_exact)
-            all_matches.extend(semantic_matches)
-
-        return self._deduplicate(all_matches)
-
-    # ------------------------------------------------------------------
-    # Private helpers
-    # ------------------------------------------------------------------
+                plan.queries.append(sentence)
+        return plan
+
+    def _semantic_search(self, texts: list[str], n_results: int) -> dict[str, list[dict]]:
+        """Nearest skills for each distinct text, from one encode and one query."""
+        if not texts:
+            return {}
+        embeddings = self.model.encode(texts).tolist()
+        results = query_skills(self.collection, embeddings, n_results=n_results)
+        return dict(zip(texts, results))
+
+    def _resolve(self, plan: "_DocumentPlan", results: dict[str, list[dict]]) -> list[SkillMatch]:
+        """Combine a document's exact matches with its semantic hits."""
+        matches = list(plan.exact)
+        for text in plan.queries:
+            for match in results[text][:plan.n_results]:
+                if match["similarity"] < self.threshold:
+                    continue
+                if plan.skip_noise and match["skill_name"] in NOISE_SKILLS:
+                    continue
+                matches.append(SkillMatch(
+                    skill_name=match["skill_name"],
+                    skill_id=match["skill_id"],
+                    category=match["category"],
+                    confidence=match["similarity"],
+                    matched_from=text,
+                ))
+        return self._deduplicate(matches)
 
     @staticmethod
     def _split_sentences(text: str) -> list[str]:
@@ -172,69 +245,18 @@ class SkillExtractor:
         sentences = [p.strip() for p in parts if len(p.strip()) >= 5]
         return sentences if sentences else [text]
 
-    def _extract_ngrams(self, text: str, max_n: int = 4) -> list[str]:
-        """Extract word n-grams (1 through max_n) from text."""
-        words = text.lower().split()
-        ngrams = []
-        for n in range(max_n, 0, -1):  # longest first
-            for i in range(len(words) - n + 1):
-                ngram = " ".join(words[i : i + n])
-                ngrams.append(ngram)
-        return ngrams
-
     def _extract_exact_from_sentence(self, sentence: str) -> list[SkillMatch]:
-        """Try to find exact taxonomy matches from n-grams in a sentence."""
-        ngrams = self._extract_ngrams(sentence, max_n=4)
+        """Find exact taxonomy matches among the 1-4-word n-grams of a sentence."""
         matches: list[SkillMatch] = []
-        found_skills: set[str] = set()
-
-        for ngram in ngrams:
-            normalized = normalize_skill(ngram)
-            if (
-                normalized
-                and normalized in self._skill_lookup
-                and normalized not in found_skills
-                and normalized not in NOISE_SKILLS
-            ):
-                info = self._skill_lookup[normalized]
-                matches.append(SkillMatch(
-                    skill_name=normalized,
-                    skill_id=info["skill_id"],
-                    category=info["category"],
-                    confidence=1.0,
-                    matched_from=ngram,
-                ))
-                found_skills.add(normalized)
-
-        return matches
-
-    def _extract_semantic_from_sentences(
-        self,
-        sentences: list[str],
-        n_results: int = 3,
-    ) -> list[SkillMatch]:
-        """Encode sentences and query ChromaDB for semantically similar skills."""
-        if not sentences:
-            return []
-
-        embeddings = self.model.encode(sentences).tolist()
-        results = query_skills(self.collection, embeddings, n_results=n_results)
-
-        matches: list[SkillMatch] = []
-        for sentence, result_list in zip(sentences, results):
-            for match in result_list:
-                if (
-                    match["similarity"] >= self.threshold
-                    and match["skill_name"] not in NOISE_SKILLS
-                ):
-                    matches.append(SkillMatch(
-                        skill_name=match["skill_name"],
-                        skill_id=match["skill_id"],
-                        category=match["category"],
-                        confidence=match["similarity"],
-                        matched_from=sentence,
-                    ))
-
+        for skill, ngram in self._matcher.find(sentence):
+            info = self._skill_lookup[skill]
+            matches.append(SkillMatch(
+                skill_name=skill,
+                skill_id=info["skill_id"],
+                category=info["category"],
+                confidence=1.0,
+                matched_from=ngram,
+            ))
         return matches
 
     @staticmethod
@@ -8,29 +8,32 @@ Pipeline:
 """
 
 import json
+from collections.abc import Mapping
 from dataclasses import asdict, dataclass, field
+from functools import cached_property
 
 import chromadb
 import numpy as np
-import pandas as pd
 from sentence_transformers import SentenceTransformer
 
-from ml.src.chromadb_manager import (
-    _aggregate_job_skills,
-    _normalize_job_title,
-    query_job_titles,
-)
+from ml.src.chromadb_manager import query_job_titles
 from ml.src.config import (
     EMBEDDING_MODEL_NAME,
-    JOB_SKILL_MAPPING_PATH,
     JOB_TITLE_COLLECTION_NAME,
     JOB_TITLE_MATCH_THRESHOLD,
     NOISE_SKILLS,
-    SKILL_EMBEDDINGS_PATH,
     SKILL_MATCH_THRESHOLD,
-    SKILL_TAXONOMY_CATEGORIZED_PATH,
 )
+from ml.src.job_recommender import JobRecommendation, JobRecommender
+from ml.src.job_skill_counts import load_or_build_job_skill_counts, normalize_job_title
+from ml.src.job_title_resolver import DEFAULT_CACHE_SIZE, JobTitleResolver
+from ml.src.serving_bundle import ServingBundle
 from ml.src.skill_extractor import SkillMatch
+from ml.src.skill_vectors import RESCORE_MARGIN, SkillVectors
+from ml.src.timeline import timeline
+from ml.src.vector_index import VectorIndex
+
+COHORT_BATCH_SIZE = 1024  # learners per similarity gather in analyze_cohort
 
 
 @dataclass
@@ -96,6 +99,57 @@ class GapAnalysisResult:
         }
 
 
+@dataclass
+class CohortTitleResult:
+    """Gap analysis of a cohort against one job title."""
+
+    job_title: str  # as requested
+    job_title_matched: str
+    job_title_confidence: float
+    required_skills: list[RequiredSkill]
+    learners: list[GapAnalysisResult]  # in learner order
+
+    @property
+    def resolved(self) -> bool:
+        return bool(self.required_skills)
+
+    def summary(self, top_missing: int = 10, bins: int = 10) -> dict:
+        """Cohort aggregates: readiness distribution and most common gaps."""
+        readiness = np.array([r.overall_readiness_score for r in self.learners], dtype=np.float64)
+        counts, edges = np.histogram(readiness, bins=bins, range=(0.0, 1.0))
+
+        missing_counts: dict[str, int] = {}
+        for r in self.learners:
+            for m in r.missing_skills:
+                missing_counts[m.skill_name] = missing_counts.get(m.skill_name, 0) + 1
+        required = {r.skill_name: r for r in self.required_skills}
+        n = len(self.learners)
+        most_missing = sorted(missing_counts.items(), key=lambda x: (-x[1], required[x[0]].importance_rank))
+
+        return {
+            "n_learners": n,
+            "readiness_mean": round(float(readiness.mean()), 4) if n else 0.0,
+            "readiness_median": round(float(np.median(readiness)), 4) if n else 0.0,
+            "readiness_p25": round(float(np.quantile(readiness, 0.25)), 4) if n else 0.0,
+            "readiness_p75": round(float(np.quantile(readiness, 0.75)), 4) if n else 0.0,
+            "fully_ready": int(np.count_nonzero(readiness >= 1.0)),
+            "readiness_histogram": [
+                {"min": round(float(lo), 2), "max": round(float(hi), 2), "count": int(c)}
+                for lo, hi, c in zip(edges[:-1], edges[1:], counts)
+            ],
+            "most_common_missing": [
+                {
+                    "skill_name": name,
+                    "category": required[name].category,
+                    "frequency": required[name].frequency,
+                    "learners_missing": count,
+                    "share": round(count / n, 4),
+                }
+                for name, count in most_missing[:top_missing]
+            ],
+        }
+
+
 class SkillGapAnalyzer:
     """Analyze the gap between user skills and job requirements.
 
@@ -106,45 +160,52 @@ class SkillGapAnalyzer:
         taxonomy_path: Path to categorized taxonomy parquet.
         embeddings_path: Path to skill embeddings parquet.
         collection_name: ChromaDB collection name for job titles.
+        bundle: Precompiled serving bundle; when given, title skills,
+            categories and vectors are read from it instead of parquet.
+        title_skills: Precomputed title skill profiles (e.g. shared with
+            the job-title collection); takes precedence over ``bundle``.
+        index: Vector index to query instead of the ChromaDB collection
+            (e.g. an ``InMemoryVectorIndex``); ``chroma_client`` may then
+            be None.
+        title_cache_size: Max cached job-title resolutions.
+        data_version: Identity of the title data for the resolution cache;
+            derived from the title profiles when omitted.
     """
 
     def __init__(
         self,
-        chroma_client: chromadb.ClientAPI,
+        chroma_client: chromadb.ClientAPI | None,
         model: SentenceTransformer | None = None,
         job_skill_path: str | None = None,
         taxonomy_path: str | None = None,
         embeddings_path: str | None = None,
         collection_name: str = JOB_TITLE_COLLECTION_NAME,
+        bundle: ServingBundle | None = None,
+        title_skills: Mapping[str, dict] | None = None,
+        index: VectorIndex | None = None,
+        title_cache_size: int = DEFAULT_CACHE_SIZE,
+        data_version: str | None = None,
     ):
         self.client = chroma_client
         self.model = model or SentenceTransformer(EMBEDDING_MODEL_NAME)
-        self.collection = chroma_client.get_collection(collection_name)
-
-        # Load job-skill aggregation
-        js_path = job_skill_path or str(JOB_SKILL_MAPPING_PATH)
-        job_skill_df = pd.read_parquet(js_path)
-        self._title_skills = _aggregate_job_skills(job_skill_df)
-
-        # Load categorized taxonomy for category lookup
-        tax_path = taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH)
-        tax_df = pd.read_parquet(tax_path)
-        self._skill_category: dict[str, str] = {
-            row["skill_name"]: row.get("category", "tech_skills")
-            for _, row in tax_df.iterrows()
-        }
-
-        # Load embeddings for similarity computation
-        emb_path = embeddings_path or str(SKILL_EMBEDDINGS_PATH)
-        emb_df = pd.read_parquet(emb_path)
-        if "skill" not in emb_df.columns:
-            emb_df.insert(0, "skill", tax_df["skill_name"].values)
-        skill_col = "skill"
-        emb_cols = [c for c in emb_df.columns if c != skill_col]
-        self._skill_vectors: dict[str, np.ndarray] = {
-            row[skill_col]: row[emb_cols].values.astype(np.float32)
-            for _, row in emb_df.iterrows()
-        }
+        self.collection = index if index is not None else chroma_client.get_collection(collection_name)
+
+        if bundle is not None:
+            self._skills = SkillVectors.from_bundle(bundle)
+        else:
+            self._skills = SkillVectors.from_parquet(embeddings_path, taxonomy_path)
+
+        if title_skills is not None:
+            self._title_skills: Mapping[str, dict] = title_skills
+        elif bundle is not None:
+            self._title_skills = bundle.title_skills
+        else:
+            self._title_skills = load_or_build_job_skill_counts(job_skill_path).title_skills()
+
+        with timeline.phase("build_title_resolver", titles=len(self._title_skills)):
+            self.title_resolver = JobTitleResolver(
+                self._title_skills, cache_size=title_cache_size, data_version=data_version
+            )
 
     # ------------------------------------------------------------------
     # Public API
@@ -175,60 +236,121 @@ class SkillGapAnalyzer:
         # Step 1: Find matching job title
         matched_title, title_confidence, required_skills = self._find_job_requirements(job_title)
 
-        if not required_skills:
-            return GapAnalysisResult(
-                job_title_matched=matched_title or job_title,
-                job_title_confidence=title_confidence,
-                matched_skills=[],
-                missing_skills=[],
-                category_breakdown={},
-                overall_readiness_score=0.0,
-            )
+        # Steps 2-4: matched/missing skills, category breakdown, readiness
+        [(matched, missing)] = self._compute_gaps([user_skill_names], required_skills, match_threshold)
+        return self._gap_result(matched_title or job_title, title_confidence, required_skills, matched, missing)
 
-        # Step 2: Match user skills against required skills
-        matched, missing = self._compute_gap(
-            user_skill_names, required_skills, match_threshold
-        )
+    def analyze_cohort(
+        self,
+        learners: list[list[str]],
+        job_titles: list[str],
+        match_threshold: float = SKILL_MATCH_THRESHOLD,
+    ) -> list[CohortTitleResult]:
+        """Run gap analysis for many learners against one or more job titles.
 
-        # Step 3: Category breakdown
-        category_breakdown = self._compute_category_breakdown(matched, missing)
+        Each title is resolved once, and the similarities of its required
+        skills to the whole taxonomy come from one matrix product shared by
+        all learners; every learner's best match per required skill is then
+        gathered from it in batches of ``COHORT_BATCH_SIZE`` learners.
+        Per-learner results equal ``analyze``.
 
-        # Step 4: Overall readiness score
-        total_required = len(required_skills)
-        total_matched = len(matched)
-        readiness = total_matched / total_required if total_required > 0 else 0.0
+        Args:
+            learners: Skill names per learner.
+            job_titles: Target job titles.
+            match_threshold: Min cosine similarity for user-to-required matching.
 
-        return GapAnalysisResult(
-            job_title_matched=matched_title,
-            job_title_confidence=title_confidence,
-            matched_skills=matched,
-            missing_skills=missing,
-            category_breakdown=category_breakdown,
-            overall_readiness_score=round(readiness, 4),
-        )
+        Returns:
+            One result per distinct title, in request order.
+        """
+        results = []
+        for job_title in dict.fromkeys(job_titles):
+            matched_title, title_confidence, required_skills = self._find_job_requirements(job_title)
+            req_sims = self._required_similarities(required_skills)
+            gaps = []
+            for start in range(0, len(learners), COHORT_BATCH_SIZE):
+                batch = learners[start:start + COHORT_BATCH_SIZE]
+                gaps.extend(self._compute_gaps(batch, required_skills, match_threshold, req_sims))
+            results.append(CohortTitleResult(
+                job_title=job_title,
+                job_title_matched=matched_title or job_title,
+                job_title_confidence=title_confidence,
+                required_skills=required_skills,
+                learners=[
+                    self._gap_result(matched_title or job_title, title_confidence, required_skills, matched, missing)
+                    for matched, missing in gaps
+                ],
+            ))
+        return results
+
+    def recommend_jobs(
+        self,
+        user_skills: list[SkillMatch] | list[str],
+        top_k: int = 10,
+        match_threshold: float = SKILL_MATCH_THRESHOLD,
+    ) -> list[JobRecommendation]:
+        """Rank all job titles by the user's coverage of their skill profiles.
+
+        Args:
+            user_skills: List of SkillMatch objects or plain skill name strings.
+            top_k: Number of titles to return.
+            match_threshold: Min cosine similarity for semantic partial credit.
+        """
+        user_skill_names = [
+            s.skill_name if isinstance(s, SkillMatch) else s
+            for s in user_skills
+        ]
+        return self._recommender.recommend(user_skill_names, top_k=top_k, threshold=match_threshold)
 
     def get_available_job_titles(self) -> list[str]:
         """Return list of all available normalized job titles."""
         return sorted(self._title_skills.keys())
 
+    @property
+    def n_job_titles(self) -> int:
+        return len(self._title_skills)
+
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
+    @cached_property
+    def _recommender(self) -> JobRecommender:
+        """Title x skill matrix, compiled on the first recommendation."""
+        with timeline.phase("build_job_recommender", titles=len(self._title_skills)):
+            return JobRecommender(self._title_skills, self._skills)
+
     def _find_job_requirements(
         self, job_title: str
     ) -> tuple[str, float, list[RequiredSkill]]:
         """Find the best matching job title and its required skills.
 
+        Resolutions are cached per normalized title; only titles that are
+        neither known nor lexically close to a known one reach the model
+        and the vector search.
+
         Returns (matched_title, confidence, required_skills).
         """
-        normalized = _normalize_job_title(job_title)
+        normalized = normalize_job_title(job_title)
 
+        cached = self.title_resolver.get(normalized)
+        if cached is None:
+            cached = self._resolve_job_title(normalized)
+            self.title_resolver.put(normalized, cached)
+        matched_title, confidence, required_skills = cached
+        return matched_title, confidence, list(required_skills)
+
+    def _resolve_job_title(self, normalized: str) -> tuple[str, float, list[RequiredSkill]]:
         # Check exact match first
         if normalized in self._title_skills:
             skills = self._build_required_skills(normalized)
             return normalized, 1.0, skills
 
+        # Lexical match (spelling/abbreviation/level variants of a known title)
+        lexical = self.title_resolver.lexical_match(normalized)
+        if lexical is not None:
+            title, confidence = lexical
+            return title, confidence, self._build_required_skills(title)
+
         # Semantic search
         query_embedding = self.model.encode(normalized).tolist()
         results = query_job_titles(self.collection, query_embedding, n_results=5)
@@ -253,7 +375,7 @@ class SkillGapAnalyzer:
         required = []
         for rank, s in enumerate(skills_data, 1):
             skill_name = s["skill"]
-            category = self._skill_category.get(skill_name, "tech_skills")
+            category = self._skills.category(skill_name)
             required.append(RequiredSkill(
                 skill_name=skill_name,
                 category=category,
@@ -294,7 +416,7 @@ class SkillGapAnalyzer:
 
         required = []
         for rank, (name, score) in enumerate(sorted_skills[:30], 1):
-            category = self._skill_category.get(name, "tech_skills")
+            category = self._skills.category(name)
             required.append(RequiredSkill(
                 skill_name=name,
                 category=category,
@@ -304,69 +426,169 @@ class SkillGapAnalyzer:
 
         return required
 
-    def _compute_gap(
+    def _gap_result(
         self,
-        user_skills: list[str],
+        matched_title: str,
+        title_confidence: float,
         required_skills: list[RequiredSkill],
-        threshold: float,
-    ) -> tuple[list[MatchedSkillDetail], list[RequiredSkill]]:
-        """Compare user skills against required skills using cosine similarity.
+        matched: list[MatchedSkillDetail],
+        missing: list[RequiredSkill],
+    ) -> GapAnalysisResult:
+        """Gap analysis result of one user from their matched and missing skills."""
+        # Category breakdown
+        category_breakdown = self._compute_category_breakdown(matched, missing)
+
+        # Overall readiness score
+        total_required = len(required_skills)
+        total_matched = len(matched)
+        readiness = total_matched / total_required if total_required > 0 else 0.0
+
+        return GapAnalysisResult(
+            job_title_matched=matched_title,
+            job_title_confidence=title_confidence,
+            matched_skills=matched,
+            missing_skills=missing,
+            category_breakdown=category_breakdown,
+            overall_readiness_score=round(readiness, 4),
+        )
 
-        Returns (matched_list, missing_list).
+    @staticmethod
+    def _cosine_similarities(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every row of ``a`` to every row of ``b``."""
+        a_norms = np.linalg.norm(a, axis=1)
+        b_norms = np.linalg.norm(b, axis=1)
+        return (a @ b.T) / (np.outer(a_norms, b_norms) + 1e-8)
+
+    def _required_similarities(self, required_skills: list[RequiredSkill]) -> np.ndarray:
+        """Cosine similarity of each required skill (with a vector) to every taxonomy skill.
+
+        Shape ``(n_required_with_vector, n_skills)``; rows follow the order of
+        ``required_skills``.
         """
-        matched: list[MatchedSkillDetail] = []
-        missing: list[RequiredSkill] = []
-        matched_required: set[str] = set()
-
-        # Get user skill vectors
-        user_vectors = {}
-        for s in user_skills:
-            vec = self._skill_vectors.get(s)
-            if vec is not None:
-                user_vectors[s] = vec
-
-        for req in required_skills:
-            req_vec = self._skill_vectors.get(req.skill_name)
-            if req_vec is None:
-                missing.append(req)
-                continue
-
-            # Check exact match first
-            if req.skill_name in user_skills:
-                matched.append(MatchedSkillDetail(
-                    user_skill=req.skill_name,
-                    required_skill=req.skill_name,
-                    category=req.category,
-                    similarity=1.0,
-                    frequency=req.frequency,
-                ))
-                matched_required.add(req.skill_name)
-                continue
-
-            # Semantic matching: find closest user skill
-            best_sim = 0.0
-            best_user_skill = ""
-            for user_s, user_vec in user_vectors.items():
-                sim = float(np.dot(user_vec, req_vec) / (
-                    np.linalg.norm(user_vec) * np.linalg.norm(req_vec) + 1e-8
-                ))
-                if sim > best_sim:
-                    best_sim = sim
-                    best_user_skill = user_s
-
-            if best_sim >= threshold and req.skill_name not in matched_required:
-                matched.append(MatchedSkillDetail(
-                    user_skill=best_user_skill,
+        matrix = self._skills.matrix
+        req_rows = self._skills.rows([r.skill_name for r in required_skills])
+        return self._cosine_similarities(matrix[req_rows[req_rows >= 0]], matrix)
+
+    def _learner_rows(self, learners: list[list[str]]) -> np.ndarray:
+        """Learner x skill matrix of taxonomy rows.
+
+        Each row holds a learner's skills with a vector, deduplicated in
+        order, padded with -1.
+        """
+        unique = [list(dict.fromkeys(skills)) for skills in learners]
+        lengths = np.fromiter((len(u) for u in unique), dtype=np.int64, count=len(unique))
+        flat = self._skills.rows([name for u in unique for name in u])
+        learner = np.repeat(np.arange(len(unique)), lengths)
+        keep = flat >= 0
+        flat, learner = flat[keep], learner[keep]
+        counts = np.bincount(learner, minlength=len(unique))
+        slot = np.arange(len(flat)) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = np.full((len(unique), int(counts.max(initial=0))), -1, dtype=np.int64)
+        rows[learner, slot] = flat
+        return rows
+
+    def _compute_gaps(
+        self,
+        learners: list[list[str]],
+        required_skills: list[RequiredSkill],
+        threshold: float,
+        req_sims: np.ndarray | None = None,
+    ) -> list[tuple[list[MatchedSkillDetail], list[RequiredSkill]]]:
+        """Compare each learner's skills against required skills using cosine similarity.
+
+        Learners become one learner x skill matrix of taxonomy rows (see
+        ``_learner_rows``). Every learner's best similarity to every required
+        skill is one gather from ``req_sims`` (see ``_required_similarities``;
+        computed against the learners' skills only when None) and one max.
+        Pairs within ``RESCORE_MARGIN`` of the threshold are then scored per
+        pair and assigned their first best-scoring user skill, so results,
+        rounded similarities included, equal the per-pair scan. Matched and
+        missing skills then follow from array masks.
+
+        Returns (matched_list, missing_list) per learner.
+        """
+        names = [r.skill_name for r in required_skills]
+        req_rows = self._skills.rows(names)
+        has_vec = req_rows >= 0
+        vec_cols = np.flatnonzero(has_vec)
+        vec_rows = req_rows[vec_cols]
+        user_rows = self._learner_rows(learners)
+        present = user_rows >= 0
+
+        # best_sim[l, j] / best_user[l, j]: best match of learner l for the
+        # j-th required skill with a vector; only strictly positive
+        # similarities count, as before
+        shape = (len(learners), len(vec_rows))
+        best_sim = np.zeros(shape, dtype=np.float64)
+        best_user = np.full(shape, -1, dtype=np.int64)
+        exact = np.zeros(shape, dtype=bool)
+        if present.any() and len(vec_rows):
+            matrix = self._skills.matrix
+            if req_sims is None:
+                cols, inverse = np.unique(user_rows[present], return_inverse=True)
+                req_sims = self._cosine_similarities(matrix[vec_rows], matrix[cols])
+                columns = np.zeros_like(user_rows)
+                columns[present] = inverse
+            else:
+                columns = np.where(present, user_rows, 0)
+
+            sims = req_sims[:, columns]  # (required, learner, user skill)
+            sims[:, ~present] = -np.inf
+            top_sims = sims.max(axis=2).T
+            exact = (user_rows[:, :, None] == vec_rows).any(axis=1)
+
+            # The matrix product only shortlists: pairs that may match are
+            # scored again one by one with SkillVectors.pair_similarity, the
+            # per-pair computation of the old scan, so matches and rounded
+            # similarities do not depend on GEMM summation order or on which
+            # learners share a batch
+            for l, j in zip(*np.nonzero(~exact & (top_sims >= threshold - RESCORE_MARGIN))):
+                near = sims[j, l] >= top_sims[l, j] - RESCORE_MARGIN
+                best_sim[l, j], best_user[l, j] = self._best_user_skill(vec_rows[j], user_rows[l][near])
+
+        # Exact matches always count; a similarity match only for the first
+        # occurrence of a required skill name
+        first = np.zeros(len(names), dtype=bool)
+        first[np.unique(names, return_index=True)[1]] = True
+        is_matched = np.zeros((len(learners), len(names)), dtype=bool)
+        is_matched[:, vec_cols] = exact | ((best_sim >= threshold) & first[vec_cols])
+        is_exact = np.zeros_like(is_matched)
+        is_exact[:, vec_cols] = exact
+        similarity = np.zeros(is_matched.shape, dtype=np.float64)
+        similarity[:, vec_cols] = best_sim
+        user = np.full(is_matched.shape, -1, dtype=np.int64)
+        user[:, vec_cols] = best_user
+
+        gaps = []
+        for flags, exact_flags, sims, users in zip(
+            is_matched.tolist(), is_exact.tolist(), similarity.tolist(), user.tolist()
+        ):
+            matched = [
+                MatchedSkillDetail(
+                    user_skill=req.skill_name if is_ex else (self._skills.names[u] if u >= 0 else ""),
                     required_skill=req.skill_name,
                     category=req.category,
-                    similarity=round(best_sim, 4),
+                    similarity=1.0 if is_ex else round(sim, 4),
                     frequency=req.frequency,
-                ))
-                matched_required.add(req.skill_name)
-            else:
-                missing.append(req)
-
-        return matched, missing
+                )
+                for req, flag, is_ex, sim, u in zip(required_skills, flags, exact_flags, sims, users)
+                if flag
+            ]
+            missing = [req for req, flag in zip(required_skills, flags) if not flag]
+            gaps.append((matched, missing))
+        return gaps
+
+    def _best_user_skill(self, req_row: int, user_rows: np.ndarray) -> tuple[float, int]:
+        """First user row with the highest positive similarity to ``req_row``, as (similarity, row).
+
+        Returns ``(0.0, -1)`` when no similarity is positive.
+        """
+        best_sim, best_row = 0.0, -1
+        for row in user_rows.tolist():
+            sim = self._skills.pair_similarity(row, req_row)
+            if sim > best_sim:
+                best_sim, best_row = sim, row
+        return best_sim, best_row
 
     @staticmethod
     def _compute_category_breakdown(
@@ -0,0 +1,104 @@
+"""Contiguous, L2-normalized skill embedding matrix with a name -> row index."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ml.src.config import SKILL_EMBEDDINGS_PATH, SKILL_TAXONOMY_CATEGORIZED_PATH
+from ml.src.serving_bundle import ServingBundle
+from ml.src.timeline import timeline
+
+DEFAULT_CATEGORY = "tech_skills"
+RESCORE_MARGIN = 1e-4  # matrix-product similarities this close to a threshold are re-scored per pair
+
+
+@dataclass
+class SkillVectors:
+    """Taxonomy skill embeddings as one ``(n_skills, dim)`` float32 matrix.
+
+    Attributes:
+        names: Skill name per row.
+        matrix: L2-normalized embeddings, one row per skill.
+        index: Skill name -> row.
+        categories: Category per row.
+    """
+
+    names: list[str]
+    matrix: np.ndarray
+    index: dict[str, int]
+    categories: np.ndarray
+
+    @classmethod
+    def from_parquet(
+        cls,
+        embeddings_path: Optional[str] = None,
+        taxonomy_path: Optional[str] = None,
+    ) -> "SkillVectors":
+        """Load the embeddings parquet in a single vectorized read."""
+        tax_path = taxonomy_path or str(SKILL_TAXONOMY_CATEGORIZED_PATH)
+        emb_path = embeddings_path or str(SKILL_EMBEDDINGS_PATH)
+        with timeline.phase("read_parquet", path=tax_path):
+            tax_df = pd.read_parquet(tax_path)
+        with timeline.phase("read_parquet", path=emb_path):
+            emb_df = pd.read_parquet(emb_path)
+
+        with timeline.phase("build_skill_matrix", rows=len(emb_df)):
+            # Embeddings are aligned by position with the taxonomy unless they
+            # carry their own skill column
+            if "skill" in emb_df.columns:
+                names = emb_df["skill"].tolist()
+                emb_df = emb_df.drop(columns=["skill"])
+            else:
+                names = tax_df["skill_name"].tolist()
+            matrix = emb_df.to_numpy(dtype=np.float32, copy=True)
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+            if "category" in tax_df.columns:
+                category_of = dict(zip(tax_df["skill_name"], tax_df["category"].fillna(DEFAULT_CATEGORY)))
+            else:
+                category_of = {}
+            categories = np.array([category_of.get(n, DEFAULT_CATEGORY) for n in names], dtype=object)
+            index = {name: row for row, name in enumerate(names)}
+
+        return cls(names=names, matrix=matrix, index=index, categories=categories)
+
+    @classmethod
+    def from_bundle(cls, bundle: ServingBundle) -> "SkillVectors":
+        """Wrap the memory-mapped matrix of a serving bundle without copying it."""
+        n = bundle.n_skills
+        names = bundle.skill_names[:n].tolist()
+        codes = np.asarray(bundle.skill_category_codes[:n])
+        categories = np.array(bundle.categories, dtype=object)[codes]
+        return cls(
+            names=names,
+            matrix=bundle.skill_vector_matrix,
+            index={name: row for row, name in enumerate(names)},
+            categories=categories,
+        )
+
+    def row(self, name: str) -> int:
+        """Row of ``name``, or -1 if it has no embedding."""
+        return self.index.get(name, -1)
+
+    def rows(self, names: list[str]) -> np.ndarray:
+        """Rows of ``names`` as an int array, -1 where missing."""
+        return np.fromiter((self.index.get(n, -1) for n in names), dtype=np.int64, count=len(names))
+
+    def pair_similarity(self, a: int, b: int) -> float:
+        """Cosine similarity of rows ``a`` and ``b``, computed for the pair alone.
+
+        Matrix products may sum in another order and land on the other side
+        of a threshold; this is the reference value.
+        """
+        u, v = self.matrix[a], self.matrix[b]
+        return float(np.dot(u, v) / (np.linalg.norm(u) * np.linalg.norm(v) + 1e-8))
+
+    def category(self, name: str, default: str = DEFAULT_CATEGORY) -> str:
+        """Category of ``name`` read from its row."""
+        row = self.index.get(name, -1)
+        return self.categories[row] if row >= 0 else default
+
+    def __len__(self) -> int:
+        return len(self.names)
@@ -0,0 +1,42 @@
+"""Content digests of the source files that startup artifacts are keyed on.
+
+Several loaders fingerprint the same parquet files (``job_skill_mapping``
+backs the job-skill counts, the job-title collection and the serving
+bundle). The registry hashes every source once per boot with
+``source_digests`` and hands the result to each loader; a loader called
+without it hashes the files itself.
+"""
+
+import hashlib
+import os
+from collections.abc import Iterable, Mapping
+from typing import Optional
+
+from ml.src.timeline import timeline
+
+
+def file_digest(path) -> str:
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digests(paths: Iterable) -> dict[str, str]:
+    """Digest of each existing file in ``paths``, keyed by ``str(path)``."""
+    digests = {}
+    with timeline.phase("source_digests") as info:
+        for path in paths:
+            if os.path.exists(path):
+                digests[str(path)] = file_digest(path)
+        info["files"] = len(digests)
+    return digests
+
+
+def lookup_digest(path, digests: Optional[Mapping[str, str]] = None) -> str:
+    """Digest of ``path`` from ``digests``, hashing the file if it is not there."""
+    if digests is not None and str(path) in digests:
+        return digests[str(path)]
+    return file_digest(path)
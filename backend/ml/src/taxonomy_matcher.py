@@ -0,0 +1,150 @@
+"""Token-trie matcher for the exact pass of free-text skill extraction.
+
+Equivalent to normalizing every 1..4-word n-gram of a sentence with
+``normalize_skill`` and probing the taxonomy, but compiled once from the
+taxonomy names and synonym keys and run as a single walk over the tokens,
+without building n-gram strings or running a regex per n-gram.
+
+``normalize_skill`` strips ``[\\s\\-\\.\\,]`` from both ends of the joined
+n-gram, so the matcher works on "core spans": an n-gram's core starts at its
+first token that is not pure punctuation (left-stripped) and ends at its last
+such token (right-stripped), with inner tokens kept verbatim.
+"""
+
+from collections.abc import Iterable
+from typing import Optional
+
+from ml.src.config import NOISE_SKILLS
+from ml.src.skill_normalizer import _get_synonyms
+
+_EDGE_CHARS = "-.,"  # stripped from n-gram edges by normalize_skill (besides whitespace)
+
+
+class _Node:
+    __slots__ = ("children", "ends")
+
+    def __init__(self) -> None:
+        self.children: dict[str, "_Node"] = {}
+        self.ends: dict[str, str] = {}  # last pattern token -> skill name
+
+
+class TaxonomyMatcher:
+    """Multi-pattern matcher over lowercased whitespace tokens.
+
+    Args:
+        skill_names: Taxonomy skill names a match must resolve to.
+        synonyms: Synonym mapping applied after normalization (defaults to
+            ``skill_synonyms.json``).
+        noise_skills: Skills never reported.
+        max_tokens: Longest n-gram considered.
+    """
+
+    def __init__(
+        self,
+        skill_names: Iterable[str],
+        synonyms: Optional[dict[str, str]] = None,
+        noise_skills: frozenset = NOISE_SKILLS,
+        max_tokens: int = 4,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self._single: dict[str, str] = {}
+        self._root = _Node()
+
+        names = set(skill_names)
+        syns = synonyms if synonyms is not None else _get_synonyms()
+        for key in names | set(syns):
+            skill = syns.get(key, key)
+            if skill in names and skill not in noise_skills:
+                self._add(key, skill)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def find(self, sentence: str) -> list[tuple[str, str]]:
+        """Find taxonomy skills in ``sentence``.
+
+        Returns ``(skill_name, matched_from)`` pairs in the order the n-gram
+        scan would report them: longest n-gram first, then left to right,
+        each skill once, with ``matched_from`` the first n-gram producing it.
+        """
+        words = sentence.lower().split()
+        m = len(words)
+        if not m:
+            return []
+
+        punct = [not w.strip(_EDGE_CHARS) for w in words]
+        # run_start[j]: first index of the pure-punctuation run ending at j - 1
+        run_start = list(range(m))
+        for j in range(1, m):
+            if punct[j - 1]:
+                run_start[j] = run_start[j - 1]
+        # run_end[k]: last index of the pure-punctuation run starting at k + 1
+        run_end = list(range(m))
+        for k in range(m - 2, -1, -1):
+            if punct[k + 1]:
+                run_end[k] = run_end[k + 1]
+
+        # best[skill] = (-n, i) of the first n-gram window producing it
+        best: dict[str, tuple[int, int]] = {}
+        max_n = self.max_tokens
+        for j in range(m):
+            if punct[j]:
+                continue
+            word = words[j]
+            skill = self._single.get(word.strip(_EDGE_CHARS))
+            if skill is not None:
+                self._record(best, skill, j, j, run_start[j], run_end[j])
+
+            node = self._root.children.get(word.lstrip(_EDGE_CHARS))
+            for k in range(j + 1, min(j + max_n, m)):
+                if node is None:
+                    break
+                word = words[k]
+                if not punct[k]:
+                    skill = node.ends.get(word.rstrip(_EDGE_CHARS))
+                    if skill is not None:
+                        self._record(best, skill, j, k, run_start[j], run_end[k])
+                node = node.children.get(word)
+
+        ordered = sorted(best.items(), key=lambda item: item[1])
+        return [(skill, " ".join(words[i : i - neg_n])) for skill, (neg_n, i) in ordered]
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _add(self, key: str, skill: str) -> None:
+        # Only keys normalize_skill can produce from a lowercased n-gram
+        tokens = key.split()
+        if not tokens or len(tokens) > self.max_tokens or key != " ".join(tokens) or key != key.lower():
+            return
+        if tokens[0] != tokens[0].lstrip(_EDGE_CHARS) or tokens[-1] != tokens[-1].rstrip(_EDGE_CHARS):
+            return
+        if len(tokens) == 1:
+            self._single[key] = skill
+            return
+        node = self._root
+        for token in tokens[:-1]:
+            node = node.children.setdefault(token, _Node())
+        node.ends[tokens[-1]] = skill
+
+    def _record(
+        self,
+        best: dict[str, tuple[int, int]],
+        skill: str,
+        j: int,
+        k: int,
+        lo: int,
+        hi: int,
+    ) -> None:
+        """Record the earliest-scanned window whose core span is ``j..k``.
+
+        Windows may extend over the punctuation runs ``lo..j-1`` and
+        ``k+1..hi``; the scan visits the longest one first, leftmost first.
+        """
+        n = min(self.max_tokens, hi - lo + 1)
+        i = max(lo, k - n + 1)
+        key = (-n, i)
+        if skill not in best or key < best[skill]:
+            best[skill] = key
@@ -0,0 +1,59 @@
+"""Incremental splitting of long documents into extraction-sized chunks.
+
+Text is fed piece by piece (e.g. straight from a request body) and cut at
+sentence delimiters, so ``SkillExtractor.extract_from_text`` sees the same
+sentences in a chunk as it would in the whole document. Only the
+unfinished tail of the text is buffered.
+"""
+
+import re
+
+# Sentence delimiters of SkillExtractor._split_sentences. Newlines are not
+# among them: preprocess_text turns them into spaces before splitting.
+_SENTENCE_END = re.compile(r"[.;•|]")
+_WHITESPACE = re.compile(r"\s")
+
+
+class TextChunker:
+    """Cut a stream of text into chunks of at most ``max_chars`` characters.
+
+    Chunks end at the last sentence delimiter that fits. A run without one
+    is cut at the last whitespace, and a run without whitespace at
+    ``max_chars``.
+
+    Args:
+        max_chars: Chunk size limit.
+    """
+
+    def __init__(self, max_chars: int) -> None:
+        if max_chars < 1:
+            raise ValueError("max_chars must be positive")
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """Add ``text`` and return the chunks it completed."""
+        self._buffer += text
+        chunks = []
+        while len(self._buffer) > self.max_chars:
+            cut = self._cut_point(self._buffer[: self.max_chars])
+            chunk, self._buffer = self._buffer[:cut], self._buffer[cut:]
+            if chunk.strip():
+                chunks.append(chunk)
+        return chunks
+
+    def close(self) -> list[str]:
+        """Return the buffered remainder as the final chunk, if any."""
+        rest, self._buffer = self._buffer, ""
+        return [rest] if rest.strip() else []
+
+    @staticmethod
+    def _cut_point(window: str) -> int:
+        """Index just past the last delimiter (or whitespace) in ``window``."""
+        for pattern in (_SENTENCE_END, _WHITESPACE):
+            last = None
+            for last in pattern.finditer(window):
+                pass
+            if last is not None:
+                return last.end()
+        return len(window)
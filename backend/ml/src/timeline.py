@@ -0,0 +1,102 @@
+"""Startup timeline: wall time, CPU time and peak RSS per loading phase.
+
+Loaders wrap their expensive steps in ``timeline.phase(...)``. Each finished
+phase is kept in memory (served by ``/diagnostics/startup``) and logged as a
+single JSON line so the timeline can also be recovered from container logs.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Iterator
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class PhaseRecord:
+    """Measurements of a single finished phase."""
+
+    name: str
+    start_s: float  # offset from the timeline start
+    wall_s: float
+    cpu_s: float  # CPU time of the thread that ran the phase
+    peak_rss_mb: float  # process peak RSS when the phase ended
+    thread: str
+    attrs: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class StartupTimeline:
+    """Thread-safe collector of ``PhaseRecord`` entries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._records: list[PhaseRecord] = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str, **attrs) -> Iterator[dict]:
+        """Time the enclosed block.
+
+        Yields the ``attrs`` dict so the block can attach results, e.g.
+        ``info["rows"] = len(df)``.
+        """
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield attrs
+        finally:
+            record = PhaseRecord(
+                name=name,
+                start_s=round(start - self._origin, 4),
+                wall_s=round(time.perf_counter() - start, 4),
+                cpu_s=round(time.thread_time() - cpu_start, 4),
+                peak_rss_mb=round(peak_rss_mb(), 1),
+                thread=threading.current_thread().name,
+                attrs={k: _jsonable(v) for k, v in attrs.items()},
+            )
+            with self._lock:
+                self._records.append(record)
+            logger.info("startup_phase %s", json.dumps(record.to_dict()))
+
+    def records(self) -> list[dict]:
+        """All finished phases ordered by start time."""
+        with self._lock:
+            records = sorted(self._records, key=lambda r: r.start_s)
+        return [r.to_dict() for r in records]
+
+    def reset(self) -> None:
+        """Drop all records and restart the clock."""
+        with self._lock:
+            self._records.clear()
+            self._origin = time.perf_counter()
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+timeline = StartupTimeline()
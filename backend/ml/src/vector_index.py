@@ -0,0 +1,98 @@
+"""Vector index interface shared by the ChromaDB and in-process backends.
+
+``query_skills`` / ``query_job_titles`` only need ``query`` with ChromaDB's
+call and result shape, so a ``chromadb.Collection`` is a ``VectorIndex`` as
+is. ``InMemoryVectorIndex`` answers the same queries with an exact search
+over an L2-normalized matrix, which for a few thousand 384-dim vectors takes
+well under a millisecond and needs no ChromaDB server.
+"""
+
+from typing import Optional, Protocol, runtime_checkable
+
+import numpy as np
+
+VECTOR_BACKEND_CHROMA = "chroma"
+VECTOR_BACKEND_MEMORY = "memory"
+VECTOR_BACKENDS = (VECTOR_BACKEND_CHROMA, VECTOR_BACKEND_MEMORY)
+
+
+@runtime_checkable
+class VectorIndex(Protocol):
+    """The subset of ``chromadb.Collection`` the query helpers use."""
+
+    name: str
+
+    def query(
+        self,
+        query_embeddings: list[list[float]],
+        n_results: int = 10,
+        include: Optional[list[str]] = None,
+    ) -> dict: ...
+
+    def count(self) -> int: ...
+
+
+class InMemoryVectorIndex:
+    """Exact cosine search over an in-process embedding matrix.
+
+    Distances follow ChromaDB's cosine space (``1 - cosine similarity``).
+
+    Args:
+        name: Index name (the collection it stands in for).
+        ids: Row ids.
+        embeddings: ``(n, dim)`` vectors; normalized on construction.
+        metadatas: Metadata dict per row.
+        documents: Document string per row.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ids: list[str],
+        embeddings: np.ndarray,
+        metadatas: list[dict],
+        documents: Optional[list[str]] = None,
+    ) -> None:
+        matrix = np.array(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(ids):
+            raise ValueError(f"Expected {len(ids)} embedding rows, got shape {matrix.shape}")
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+        self.name = name
+        self._ids = list(ids)
+        self._matrix = matrix
+        self._metadatas = list(metadatas)
+        self._documents = list(documents) if documents is not None else [None] * len(ids)
+
+    def query(
+        self,
+        query_embeddings: list[list[float]],
+        n_results: int = 10,
+        include: Optional[list[str]] = None,
+    ) -> dict:
+        """Top ``n_results`` rows per query, in ChromaDB's result layout."""
+        include = include or ["metadatas", "documents", "distances"]
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self._matrix.shape[1])
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        k = min(n_results, len(self._ids))
+        sims = queries @ self._matrix.T
+        if k < len(self._ids):
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(len(self._ids)), sims.shape)
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        distances = 1.0 - np.take_along_axis(top_sims, order, axis=1)
+
+        rows = top.tolist()
+        return {
+            "ids": [[self._ids[j] for j in r] for r in rows],
+            "metadatas": [[self._metadatas[j] for j in r] for r in rows] if "metadatas" in include else None,
+            "documents": [[self._documents[j] for j in r] for r in rows] if "documents" in include else None,
+            "distances": distances.tolist() if "distances" in include else None,
+        }
+
+    def count(self) -> int:
+        return len(self._ids)
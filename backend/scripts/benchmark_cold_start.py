@@ -0,0 +1,107 @@
+"""Cold-start benchmark for MLRegistry.initialize.
+
+Runs the full startup against a local ChromaDB client, so no ChromaDB
+container is needed, and prints the per-phase timeline. The cold run starts
+from an empty temporary directory for ChromaDB and every derived artifact
+(embedding store, serving bundle, job-skill counts, course catalog cache,
+skill-course table); the warm run reuses what the cold run wrote. Model
+files (including ONNX exports) are shared with the normal setup. Each
+registry is closed after its run.
+
+Usage (from backend/):
+    python -m scripts.benchmark_cold_start
+    python -m scripts.benchmark_cold_start --warm --json timeline.json
+"""
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import chromadb
+
+from app.config import get_settings
+from app.core.ml_registry import MLRegistry
+from ml.src.embedding_backend import EMBEDDING_BACKENDS
+from ml.src.embedding_store import STORE_MISS_PHASE
+from ml.src.timeline import peak_rss_mb, timeline
+from ml.src.vector_index import VECTOR_BACKENDS
+
+
+def run_once(
+    artifact_dir: Path,
+    model_name: str,
+    workers: int,
+    vector_backend: str,
+    embedding_backend: str,
+) -> dict:
+    """Initialize a fresh registry on ``artifact_dir``, close it, and return its timeline summary."""
+    timeline.reset()
+    registry = MLRegistry()
+    start = time.perf_counter()
+    try:
+        registry.initialize(
+            chroma_host="local",
+            chroma_port=0,
+            model_name=model_name,
+            max_workers=workers,
+            chroma_client=chromadb.PersistentClient(path=str(artifact_dir / "chroma")),
+            vector_backend=vector_backend,
+            embedding_backend=embedding_backend,
+            artifact_dir=artifact_dir,
+        )
+        total_wall_s = time.perf_counter() - start
+    finally:
+        registry.close()
+    return {
+        "total_wall_s": round(total_wall_s, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "components": dict(registry.component_status),
+        "phases": timeline.records(),
+    }
+
+
+def print_report(label: str, report: dict) -> None:
+    print(f"\n=== {label}: {report['total_wall_s']:.2f}s wall, peak RSS {report['peak_rss_mb']:.0f} MiB ===")
+    print(f"{'start':>8} {'wall':>8} {'cpu':>8} {'rss MiB':>8}  phase")
+    for p in report["phases"]:
+        attrs = " ".join(f"{k}={v}" for k, v in p["attrs"].items())
+        print(f"{p['start_s']:8.2f} {p['wall_s']:8.3f} {p['cpu_s']:8.3f} {p['peak_rss_mb']:8.0f}  {p['name']} {attrs}")
+    misses = [p["attrs"]["texts"] for p in report["phases"] if p["name"] == STORE_MISS_PHASE]
+    print(f"Embedding-store misses: {sum(misses)} texts encoded in {len(misses)} model calls")
+    failed = [name for name, status in report["components"].items() if status != "ready"]
+    if failed:
+        print(f"Components not ready: {', '.join(failed)}")
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL_NAME)
+    parser.add_argument("--workers", type=int, default=settings.ML_INIT_WORKERS)
+    parser.add_argument("--vector-backend", default=settings.VECTOR_BACKEND, choices=VECTOR_BACKENDS)
+    parser.add_argument("--embedding-backend", default=settings.EMBEDDING_BACKEND, choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--warm", action="store_true", help="run a second, warm initialization")
+    parser.add_argument("--json", dest="json_path", help="write the timeline(s) to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run_args = (args.model, args.workers, args.vector_backend, args.embedding_backend)
+
+    with tempfile.TemporaryDirectory(prefix="cold_start_") as tmp:
+        artifact_dir = Path(tmp)
+        reports = {"cold": run_once(artifact_dir, *run_args)}
+        print_report("cold", reports["cold"])
+        if args.warm:
+            reports["warm"] = run_once(artifact_dir, *run_args)
+            print_report("warm", reports["warm"])
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
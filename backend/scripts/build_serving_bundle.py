@@ -0,0 +1,39 @@
+"""Compile the parquet sources into a memory-mappable serving bundle.
+
+The backend maps the active bundle at startup instead of rebuilding its
+lookup dicts from parquet, and rebuilds it automatically when the sources
+change. Run this after refreshing the data to do that work offline.
+
+Usage (from backend/):
+    python -m scripts.build_serving_bundle [--output-dir DIR]
+"""
+
+import argparse
+import logging
+import time
+
+from ml.src.serving_bundle import ServingBundle, build_serving_bundle
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", help="bundle root directory (default: ml/data/process/serving_bundle)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    version_dir = build_serving_bundle(output_dir=args.output_dir)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bundle = ServingBundle(version_dir)
+    mapped = time.perf_counter() - start
+
+    manifest = bundle.manifest
+    print(f"Bundle:  {version_dir}")
+    print(f"Skills:  {manifest['n_skills']} x {manifest['dim']}  Titles: {manifest['n_titles']}")
+    print(f"Built in {built:.2f}s, mapped in {mapped * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare an embedding backend against PyTorch on the serving similarity paths.
+
+Skill extraction compares query vectors from the serving backend with the
+precomputed (PyTorch) skill embeddings; job-title search compares two vectors
+from the serving backend. For a sample of skill names and job titles this
+reports, per path, how far the candidate's cosine similarities move from the
+PyTorch ones and how many accept/reject decisions flip at the configured
+threshold. Exits non-zero when the largest shift exceeds ``--tolerance``.
+
+Usage (from backend/):
+    python -m scripts.check_embedding_parity [--backend onnx-int8] [--sample 500]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.config import get_settings
+from ml.src.config import JOB_TITLE_MATCH_THRESHOLD, SKILL_MATCH_THRESHOLD
+from ml.src.embedding_backend import (
+    EMBEDDING_BACKEND_ONNX_INT8,
+    EMBEDDING_BACKEND_TORCH,
+    EMBEDDING_BACKENDS,
+    load_embedding_model,
+)
+from ml.src.job_skill_counts import load_or_build_job_skill_counts
+from ml.src.skill_vectors import SkillVectors
+
+
+def encode(model, texts: list[str]) -> tuple[np.ndarray, float]:
+    """L2-normalized embeddings and the wall time it took."""
+    start = time.perf_counter()
+    vectors = np.asarray(model.encode(texts, batch_size=64), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors, elapsed
+
+
+def compare(label: str, reference: np.ndarray, candidate: np.ndarray, threshold: float) -> float:
+    """Print how ``candidate`` similarities deviate from ``reference``; return the max shift."""
+    delta = np.abs(candidate - reference)
+    flips = np.count_nonzero((reference >= threshold) != (candidate >= threshold))
+    top1 = np.mean(reference.argmax(axis=1) == candidate.argmax(axis=1))
+    print(f"\n{label} (threshold {threshold:.2f}, {reference.size} pairs)")
+    print(f"  |delta cos|  mean {delta.mean():.5f}  p99 {np.quantile(delta, 0.99):.5f}  max {delta.max():.5f}")
+    print(f"  decisions flipped {flips} ({flips / reference.size:.4%})  top-1 agreement {top1:.2%}")
+    return float(delta.max())
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL_NAME)
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND_ONNX_INT8, choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--sample", type=int, default=500, help="skill names and job titles to encode")
+    parser.add_argument("--tolerance", type=float, default=0.03, help="max allowed cosine shift")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    skills = SkillVectors.from_parquet()
+    titles = list(load_or_build_job_skill_counts().title_skills())
+    skill_sample = [skills.names[i] for i in rng.choice(len(skills), min(args.sample, len(skills)), replace=False)]
+    title_sample = [titles[i] for i in rng.choice(len(titles), min(args.sample, len(titles)), replace=False)]
+    queries = skill_sample + title_sample
+
+    reference = load_embedding_model(args.model, EMBEDDING_BACKEND_TORCH)
+    candidate = load_embedding_model(args.model, args.backend)
+    ref_q, ref_s = encode(reference, queries)
+    cand_q, cand_s = encode(candidate, queries)
+    print(f"Encoded {len(queries)} texts: torch {ref_s:.2f}s, {args.backend} {cand_s:.2f}s")
+
+    same_text = np.sum(ref_q * cand_q, axis=1)
+    print(f"Same-text cosine torch vs {args.backend}: min {same_text.min():.5f}  mean {same_text.mean():.5f}")
+
+    n_skill = len(skill_sample)
+    worst = max(
+        # extraction: serving-backend queries vs stored PyTorch skill vectors
+        compare(
+            "Skill matching",
+            ref_q @ skills.matrix.T,
+            cand_q @ skills.matrix.T,
+            SKILL_MATCH_THRESHOLD,
+        ),
+        # title search: both sides encoded by the serving backend
+        compare(
+            "Job-title matching",
+            ref_q[n_skill:] @ ref_q[n_skill:].T,
+            cand_q[n_skill:] @ cand_q[n_skill:].T,
+            JOB_TITLE_MATCH_THRESHOLD,
+        ),
+    )
+
+    ok = worst <= args.tolerance
+    print(f"\n{'PASS' if ok else 'FAIL'}: max cosine shift {worst:.5f} (tolerance {args.tolerance})")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Extract skills from a parquet of job postings into job_skill_mapping rows.
+
+Shards the postings across a process pool (one model and one in-process
+skill index per worker), checkpoints finished shards in the output
+directory and merges the part files at the end. Re-running the same command
+resumes an interrupted run. Feed the result to ``scripts.ingest_job_postings``
+to update the job-skill counts.
+
+Usage (from backend/):
+    python -m scripts.extract_job_skills postings.parquet --output new_mapping.parquet
+        [--text-column job_description] [--mode free_text] [--workers 4]
+"""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+
+from app.config import get_settings
+from ml.src.bulk_extraction import BulkExtractionConfig, BulkExtractionStats, merge_parts, run_bulk_extraction
+from ml.src.embedding_backend import EMBEDDING_BACKENDS
+from ml.src.skill_extractor import MODE_FREE_TEXT, MODE_SKILL_LIST
+
+
+def report(stats: BulkExtractionStats, n_shards: int) -> None:
+    print(
+        f"shard {stats.shards + stats.skipped_shards}/{n_shards}  "
+        f"{stats.postings} postings  {stats.rows} rows  {stats.postings_per_s:.1f} postings/s",
+        flush=True,
+    )
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="parquet of postings")
+    parser.add_argument("--output", required=True, help="merged job_skill_mapping parquet to write")
+    parser.add_argument("--work-dir", help="part files and checkpoint (default: <output>.parts/)")
+    parser.add_argument("--text-column", default="job_description")
+    parser.add_argument("--mode", default=MODE_FREE_TEXT, choices=[MODE_FREE_TEXT, MODE_SKILL_LIST])
+    parser.add_argument("--id-column", default="job_id")
+    parser.add_argument("--title-column", default="job_title")
+    parser.add_argument("--shard-size", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL_NAME)
+    parser.add_argument("--embedding-backend", default=settings.EMBEDDING_BACKEND, choices=EMBEDDING_BACKENDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    work_dir = args.work_dir or str(Path(args.output).with_suffix(".parts"))
+    config = BulkExtractionConfig(
+        input_path=args.input,
+        output_dir=work_dir,
+        text_column=args.text_column,
+        mode=args.mode,
+        id_column=args.id_column,
+        title_column=args.title_column,
+        shard_size=args.shard_size,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        model_name=args.model,
+        embedding_backend=args.embedding_backend,
+    )
+    stats = run_bulk_extraction(config, on_progress=report)
+    rows = merge_parts(stats.parts, args.output)
+
+    print(f"Extracted {stats.postings} postings in {stats.elapsed_s:.1f}s ({stats.postings_per_s:.1f} postings/s)")
+    if stats.skipped_shards:
+        print(f"Resumed {stats.skipped_shards} shards from {work_dir}")
+    print(f"Wrote {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
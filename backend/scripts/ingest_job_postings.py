@@ -0,0 +1,49 @@
+"""Append newly scraped job postings and update the job-skill counts.
+
+Only the new postings are counted: existing titles keep their counters, so a
+weekly scrape does not re-aggregate the whole ``job_skill_mapping.parquet``.
+Postings whose ``job_id`` was already ingested are skipped.
+
+Usage (from backend/):
+    python -m scripts.ingest_job_postings new_postings.parquet
+    python -m scripts.ingest_job_postings --rebuild
+"""
+
+import argparse
+import logging
+import time
+
+import pandas as pd
+
+from ml.src.job_skill_counts import (
+    JobSkillCounts,
+    ingest_job_postings,
+    load_or_build_job_skill_counts,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("postings", nargs="?", help="parquet with job_skill_mapping columns")
+    parser.add_argument("--rebuild", action="store_true", help="recount the full job_skill_mapping")
+    args = parser.parse_args()
+    if not args.postings and not args.rebuild:
+        parser.error("pass a postings parquet or --rebuild")
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    if args.rebuild:
+        counts = JobSkillCounts.load()
+        if counts is not None:
+            counts.source_digest = None  # force a recount
+            counts.save()
+        counts = load_or_build_job_skill_counts()
+        print(f"Recounted {len(counts.job_ids)} jobs, {len(counts.title_jobs)} titles")
+    if args.postings:
+        added = ingest_job_postings(pd.read_parquet(args.postings))
+        print(f"Ingested {added} new jobs")
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
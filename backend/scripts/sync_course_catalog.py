@@ -0,0 +1,105 @@
+"""Install a new course catalog snapshot and apply only what changed.
+
+The given CSVs replace the raw Coursera/Udemy files. Courses are then diffed
+against the course collection by id and content hash: only new or edited
+courses are embedded and upserted, removed ones are deleted, and the
+skill-course table is updated for the changed courses only.
+
+With ``--api`` the running backend applies the snapshot while it keeps
+serving roadmaps; its ``ADMIN_TOKEN`` must be set and is sent as the
+``X-Admin-Token`` header (``--admin-token``, default from the settings).
+Without it the sync runs in this process against the
+configured ChromaDB, so the next boot finds everything up to date (with
+``VECTOR_BACKEND=memory`` only the catalog cache and skill-course table
+carry over).
+
+Usage (from backend/):
+    python -m scripts.sync_course_catalog --udemy new_udemy.csv
+    python -m scripts.sync_course_catalog --coursera courses_en.csv --api http://localhost:8000
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+import urllib.request
+from pathlib import Path
+
+from app.config import get_settings
+from app.services.learning_roadmap_service import COURSERA_PATH, UDEMY_PATH, LearningRoadmapService
+from ml.src.chromadb_manager import get_chroma_client
+from ml.src.embedding_backend import embedding_model_id, load_embedding_model
+from ml.src.embedding_store import EmbeddingStore
+
+API_V1_PREFIX = "/api/v1"
+POLL_INTERVAL_S = 1.0
+
+
+def install_snapshot(source: str, target: Path) -> None:
+    """Copy ``source`` over ``target`` atomically."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+
+
+def sync_via_api(base_url: str, admin_token: str) -> dict:
+    """Start a sync on the running backend and wait for its result."""
+    url = f"{base_url.rstrip('/')}{API_V1_PREFIX}/roadmap/catalog/sync"
+    headers = {"X-Admin-Token": admin_token}
+    with urllib.request.urlopen(urllib.request.Request(url, method="POST", headers=headers)) as resp:
+        job = json.load(resp)["data"]
+    while job["status"] not in ("completed", "failed"):
+        time.sleep(POLL_INTERVAL_S)
+        with urllib.request.urlopen(urllib.request.Request(f"{url}/{job['job_id']}", headers=headers)) as resp:
+            job = json.load(resp)["data"]
+    if job["status"] == "failed":
+        raise SystemExit(f"Sync failed: {job['error']}")
+    return job["result"]
+
+
+def sync_locally() -> dict:
+    """Run the sync in this process against the configured ChromaDB."""
+    settings = get_settings()
+    model_id = embedding_model_id(settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_BACKEND)
+    service = LearningRoadmapService(
+        chroma_client=get_chroma_client(host=settings.CHROMA_HOST, port=settings.CHROMA_PORT),
+        model=load_embedding_model(settings.EMBEDDING_MODEL_NAME, settings.EMBEDDING_BACKEND),
+        embedding_store=EmbeddingStore(model_id),
+        model_id=model_id,
+        rerank_candidates=settings.ROADMAP_RERANK_CANDIDATES,
+    )
+    sync = service.sync_catalog()
+    return {
+        "courses": sync.courses,
+        "embedded": sync.embedded,
+        "removed": sync.removed,
+        "duration_s": sync.duration_s,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coursera", help="new Coursera CSV (courses_en.csv columns)")
+    parser.add_argument("--udemy", help="new Udemy CSV (udemy_online_education_courses_dataset.csv columns)")
+    parser.add_argument("--api", help="base URL of a running backend to sync, e.g. http://localhost:8000")
+    parser.add_argument("--admin-token", default=get_settings().ADMIN_TOKEN, help="the backend's ADMIN_TOKEN")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.coursera:
+        install_snapshot(args.coursera, COURSERA_PATH)
+    if args.udemy:
+        install_snapshot(args.udemy, UDEMY_PATH)
+
+    result = sync_via_api(args.api, args.admin_token) if args.api else sync_locally()
+    print(
+        f"{result['courses']} courses: {result['embedded']} embedded, "
+        f"{result['removed']} removed in {result['duration_s']:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()